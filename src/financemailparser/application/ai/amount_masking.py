@@ -26,6 +26,26 @@ _TOKEN_RE = re.compile(r"__AMT_[A-Za-z0-9]+_\d{6}__")
 _EXPONENT_ERROR_RE = re.compile(r"^[eE][+-]?\d+$")
 
 
+def _find_amount(line: str, number_str: str, currency_str: str, start: int) -> int:
+    """
+    查找 `number_str` + 空白 + `currency_str` 在 line 中（从 start 起）首次出现的位置，
+    未找到返回 -1。
+
+    等价于 `re.search(re.escape(number) + r"\\s+" + re.escape(currency))`，但不为每个金额
+    编译一次正则（金额种类多时会超出 re 模块的编译缓存，成为脱敏的主要开销）。
+    """
+    pos = line.find(number_str, start)
+    while pos >= 0:
+        end = pos + len(number_str)
+        cursor = end
+        while cursor < len(line) and line[cursor].isspace():
+            cursor += 1
+        if cursor > end and line.startswith(currency_str, cursor):
+            return pos
+        pos = line.find(number_str, pos + 1)
+    return -1
+
+
 def generate_run_id(length: int = 10) -> str:
     """
     生成短 run_id，用于同一次脱敏会话的 token 前缀。
@@ -135,17 +155,13 @@ class AmountMasker:
             cursor = 0
             buf: list[str] = []
             for number_str, currency_str in ops:
-                pattern = re.compile(
-                    re.escape(number_str) + r"(?P<space>\s+)" + re.escape(currency_str)
-                )
-                match = pattern.search(line, pos=cursor)
-                if match is None:
+                start = _find_amount(line, number_str, currency_str, cursor)
+                if start < 0:
                     continue
 
                 token = self._next_token()
                 self.mapping[token] = number_str
 
-                start = match.start()
                 buf.append(line[cursor:start])
                 buf.append(token)
                 cursor = start + len(number_str)
@@ -158,19 +174,6 @@ class AmountMasker:
     def stats(self) -> MaskingStats:
         return MaskingStats(run_id=self.run_id, tokens_total=len(self.mapping))
 
-    def unmask_text(self, text: str) -> str:
-        """
-        恢复文本中的脱敏金额（便捷方法）。
-
-        Args:
-            text: 包含脱敏 token 的文本
-
-        Returns:
-            恢复后的文本（所有 token 替换为原始金额）
-        """
-        restored, _report = restore_beancount_amounts(text, self.mapping)
-        return restored
-
 
 def restore_beancount_amounts(text: str, mapping: Dict[str, str]) -> Tuple[str, int]:
     """
@@ -9,19 +9,30 @@ Goal:
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Literal, Optional
+import math
+from dataclasses import dataclass, replace
+from functools import cache, lru_cache
+from typing import Any, Callable, Literal, Optional
 
 from financemailparser.infrastructure.ai.config import AIConfig, AIConfigManager
-from financemailparser.infrastructure.ai.providers import AI_PROVIDER_CHOICES
+from financemailparser.infrastructure.ai.providers import (
+    AI_PROVIDER_CHOICES,
+    strip_litellm_model_prefix,
+)
 from financemailparser.application.common.facade_common import (
+    MISSING_MASTER_PASSWORD_READ_MESSAGE,
+    MISSING_MASTER_PASSWORD_SAVE_MESSAGE,
     UiActionResult,
     map_secret_load_error_to_ui_state,
     mask_secret,
 )
-from financemailparser.infrastructure.config.config_manager import get_config_manager
+from financemailparser.infrastructure.config.config_manager import (
+    ConfigManager,
+    get_config_manager,
+)
 from financemailparser.infrastructure.config.secrets import (
     MASTER_PASSWORD_ENV,
+    SecretError,
     master_password_is_set,
 )
 
@@ -36,7 +47,52 @@ AiConfigUiState = Literal[
 ]
 
 
-@dataclass(frozen=True)
+def _str_or_default(value: Any, default: str = "") -> str:
+    """Strip a raw config.yaml value; None / blank values fall back to `default`."""
+    if isinstance(value, str):
+        return value.strip() or default
+    if value is None:
+        return default
+    return str(value).strip() or default
+
+
+def _int_or_default(value: Any, default: int) -> int:
+    """
+    Coerce a raw config.yaml value to int without raising.
+
+    Empty / zero / non-numeric values fall back to `default` (the snapshot runs on
+    every Streamlit rerun, so the common path avoids exception handling).
+    """
+    if not value or isinstance(value, bool):
+        return default
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value) if math.isfinite(value) else default
+    if isinstance(value, str):
+        text = value.strip()
+        if text.removeprefix("-").isdecimal():
+            return int(text) or default
+    return default
+
+
+@lru_cache(maxsize=1)
+def _ai_config_manager_for(config_manager: ConfigManager) -> AIConfigManager:
+    return AIConfigManager(config_manager)
+
+
+def _ai_config_manager() -> AIConfigManager:
+    """
+    Shared AIConfigManager bound to the global ConfigManager.
+
+    Keyed by the ConfigManager instance, so `get_config_manager.cache_clear()`
+    (e.g. in tests) also yields a fresh AIConfigManager. Decrypted API keys and
+    parsed config.yaml are cached below this layer and invalidated on save/delete.
+    """
+    return _ai_config_manager_for(get_config_manager())
+
+
+@dataclass(frozen=True, slots=True)
 class AiConfigUiSnapshot:
     state: AiConfigUiState
     master_password_env: str
@@ -49,6 +105,9 @@ class AiConfigUiSnapshot:
     timeout_default: int
     max_retries_default: int
     retry_interval_default: int
+    rpm_default: int
+    tpm_default: int
+    max_output_tokens_default: int
 
     # Decrypted fields (only when state == "ok").
     provider: Optional[str] = None
@@ -67,80 +126,66 @@ class AiConfigUiSnapshot:
 
 
 def get_ai_config_ui_snapshot() -> AiConfigUiSnapshot:
-    raw_ai: dict[str, Any] = {}
-    try:
-        raw_ai = get_config_manager().get_ai_config()
-    except Exception:
-        raw_ai = {}
-
-    provider_default = str(raw_ai.get("provider", "openai") or "openai").strip()
-    model_default = str(raw_ai.get("model", "") or "").strip()
-    base_url_default = str(raw_ai.get("base_url", "") or "").strip()
-
-    timeout_default = AIConfigManager.DEFAULT_TIMEOUT
-    max_retries_default = AIConfigManager.DEFAULT_MAX_RETRIES
-    retry_interval_default = AIConfigManager.DEFAULT_RETRY_INTERVAL
-    try:
-        timeout_default = int(raw_ai.get("timeout", timeout_default) or timeout_default)
-        max_retries_default = int(
-            raw_ai.get("max_retries", max_retries_default) or max_retries_default
-        )
-        retry_interval_default = int(
-            raw_ai.get("retry_interval", retry_interval_default)
-            or retry_interval_default
-        )
-    except Exception:
-        pass
-
-    mgr = AIConfigManager()
+    # get_ai_config() never raises: missing/unreadable config.yaml yields {}.
+    raw_ai: dict[str, Any] = get_config_manager().get_ai_config()
+
+    provider_default = _str_or_default(raw_ai.get("provider"), "openai")
+    model_default = _str_or_default(raw_ai.get("model"))
+    base_url_default = _str_or_default(raw_ai.get("base_url"))
+
+    # 与 AIConfig 加载时一致：旧配置里超限的值按上限展示（UI 输入框有相同的上限）。
+    timeout_default = min(
+        _int_or_default(raw_ai.get("timeout"), AIConfigManager.DEFAULT_TIMEOUT),
+        AIConfig.MAX_TIMEOUT,
+    )
+    max_retries_default = min(
+        _int_or_default(raw_ai.get("max_retries"), AIConfigManager.DEFAULT_MAX_RETRIES),
+        AIConfig.MAX_MAX_RETRIES,
+    )
+    retry_interval_default = _int_or_default(
+        raw_ai.get("retry_interval"), AIConfigManager.DEFAULT_RETRY_INTERVAL
+    )
+    rpm_default = _int_or_default(raw_ai.get("rpm"), AIConfigManager.DEFAULT_RPM)
+    tpm_default = _int_or_default(raw_ai.get("tpm"), AIConfigManager.DEFAULT_TPM)
+    max_output_tokens_default = _int_or_default(
+        raw_ai.get("max_output_tokens"), AIConfigManager.DEFAULT_MAX_OUTPUT_TOKENS
+    )
+
+    mgr = _ai_config_manager()
     has_master = bool(master_password_is_set())
 
+    # Every state shares the non-secret defaults; branches only add their own fields.
+    base = AiConfigUiSnapshot(
+        state="not_present",
+        master_password_env=MASTER_PASSWORD_ENV,
+        master_password_is_set=has_master,
+        provider_default=provider_default,
+        model_default=model_default,
+        base_url_default=base_url_default,
+        timeout_default=timeout_default,
+        max_retries_default=max_retries_default,
+        retry_interval_default=retry_interval_default,
+        rpm_default=rpm_default,
+        tpm_default=tpm_default,
+        max_output_tokens_default=max_output_tokens_default,
+    )
     if not mgr.config_present():
-        return AiConfigUiSnapshot(
-            state="not_present",
-            master_password_env=MASTER_PASSWORD_ENV,
-            master_password_is_set=has_master,
-            provider_default=provider_default or "openai",
-            model_default=model_default,
-            base_url_default=base_url_default,
-            timeout_default=timeout_default,
-            max_retries_default=max_retries_default,
-            retry_interval_default=retry_interval_default,
-        )
+        return base
 
     try:
+        # AIConfig 已在构造时规整为去空白的 str，无需再转换。
         decrypted = mgr.load_config_strict()
-        provider = str(decrypted.provider or "").strip()
-        model = str(decrypted.model or "").strip()
-        api_key = str(decrypted.api_key or "")
-        return AiConfigUiSnapshot(
+        return replace(
+            base,
             state="ok",
-            master_password_env=MASTER_PASSWORD_ENV,
-            master_password_is_set=has_master,
-            provider_default=provider_default or provider or "openai",
-            model_default=model_default or model,
-            base_url_default=base_url_default,
-            timeout_default=timeout_default,
-            max_retries_default=max_retries_default,
-            retry_interval_default=retry_interval_default,
-            provider=provider,
-            model=model,
-            api_key_masked=mask_secret(api_key, head=4, tail=4),
+            model_default=model_default or decrypted.model,
+            provider=decrypted.provider,
+            model=decrypted.model,
+            api_key_masked=mask_secret(decrypted.api_key, head=4, tail=4),
         )
     except Exception as e:
         state, error_message = map_secret_load_error_to_ui_state(e)
-        return AiConfigUiSnapshot(
-            state=state,
-            master_password_env=MASTER_PASSWORD_ENV,
-            master_password_is_set=has_master,
-            provider_default=provider_default or "openai",
-            model_default=model_default,
-            base_url_default=base_url_default,
-            timeout_default=timeout_default,
-            max_retries_default=max_retries_default,
-            retry_interval_default=retry_interval_default,
-            error_message=error_message,
-        )
+        return replace(base, state=state, error_message=error_message)
 
 
 def save_ai_config_from_ui(
@@ -153,25 +198,37 @@ def save_ai_config_from_ui(
     timeout: int,
     max_retries: int,
     retry_interval: int,
+    rpm: int = AIConfigManager.DEFAULT_RPM,
+    tpm: int = AIConfigManager.DEFAULT_TPM,
+    max_output_tokens: int = AIConfigManager.DEFAULT_MAX_OUTPUT_TOKENS,
 ) -> UiActionResult:
     if not master_password_is_set():
+        return UiActionResult(ok=False, message=MISSING_MASTER_PASSWORD_SAVE_MESSAGE)
+
+    # 上限只在 UI 输入时校验；AIConfig 对已保存的超限值按上限截断，不会拒绝加载。
+    if int(timeout) > AIConfig.MAX_TIMEOUT:
+        return UiActionResult(
+            ok=False, message=f"❌ 输入错误：超时时间不能大于 {AIConfig.MAX_TIMEOUT} 秒"
+        )
+    if int(max_retries) > AIConfig.MAX_MAX_RETRIES:
         return UiActionResult(
             ok=False,
-            message=f"❌ 未设置环境变量 {MASTER_PASSWORD_ENV}，无法保存加密配置。",
+            message=f"❌ 输入错误：最大重试次数不能大于 {AIConfig.MAX_MAX_RETRIES}",
         )
 
+    mgr = _ai_config_manager()
     effective_api_key = str(api_key_input or "")
+    # 仅当输入框仍是脱敏占位符（用户未改动 Key）时才需要解密已保存的 Key。
     if api_key_masked_placeholder and api_key_input == api_key_masked_placeholder:
         try:
-            decrypted = AIConfigManager().load_config_strict()
-            effective_api_key = str(decrypted.api_key or "")
-        except Exception:
+            effective_api_key = mgr.load_config_strict().api_key
+        except (SecretError, ValueError):
             return UiActionResult(
                 ok=False, message="❌ 无法读取已保存的 API Key，请重新输入。"
             )
 
     try:
-        AIConfigManager().save_config(
+        mgr.save_config(
             AIConfig(
                 provider=provider,
                 model=model,
@@ -180,6 +237,9 @@ def save_ai_config_from_ui(
                 timeout=int(timeout),
                 max_retries=int(max_retries),
                 retry_interval=int(retry_interval),
+                rpm=int(rpm),
+                tpm=int(tpm),
+                max_output_tokens=int(max_output_tokens),
             )
         )
         return UiActionResult(ok=True, message="✅ 配置保存成功！")
@@ -199,23 +259,20 @@ def test_ai_config_from_ui(
     timeout: int,
 ) -> UiActionResult:
     if not master_password_is_set():
-        return UiActionResult(
-            ok=False,
-            message=f"❌ 未设置环境变量 {MASTER_PASSWORD_ENV}，无法读取加密配置。",
-        )
+        return UiActionResult(ok=False, message=MISSING_MASTER_PASSWORD_READ_MESSAGE)
 
+    mgr = _ai_config_manager()
     effective_api_key = str(api_key_input or "")
     if api_key_masked_placeholder and api_key_input == api_key_masked_placeholder:
         try:
-            decrypted = AIConfigManager().load_config_strict()
-            effective_api_key = str(decrypted.api_key or "")
-        except Exception:
+            effective_api_key = mgr.load_config_strict().api_key
+        except (SecretError, ValueError):
             return UiActionResult(
                 ok=False, message="❌ 无法读取已保存的 API Key，请重新输入。"
             )
 
     try:
-        ok, msg = AIConfigManager().test_connection(
+        ok, msg = mgr.test_connection(
             AIConfig(
                 provider=provider,
                 model=model,
@@ -231,7 +288,7 @@ def test_ai_config_from_ui(
 
 def delete_ai_config_from_ui() -> UiActionResult:
     try:
-        ok = AIConfigManager().delete_config()
+        ok = _ai_config_manager().delete_config()
         return UiActionResult(
             ok=bool(ok), message="✅ 配置已删除" if ok else "❌ 删除失败"
         )
@@ -239,6 +296,19 @@ def delete_ai_config_from_ui() -> UiActionResult:
         return UiActionResult(ok=False, message=f"❌ 删除失败：{str(e)}")
 
 
+@cache
+def _litellm_token_counter() -> Callable[..., int]:
+    # litellm 导入很慢：延迟到第一次预估时导入，之后复用同一个函数引用。
+    import litellm
+
+    return litellm.token_counter
+
+
+@lru_cache(maxsize=32)
+def _token_count_model(provider: str, model: str) -> Optional[str]:
+    return strip_litellm_model_prefix(provider, model)
+
+
 def estimate_prompt_tokens_from_ui(prompt: str) -> Optional[int]:
     """
     Best-effort token estimation for UI preview.
@@ -247,22 +317,22 @@ def estimate_prompt_tokens_from_ui(prompt: str) -> Optional[int]:
     - Requires decryptable AI config (provider/model) to select a token counter model.
     - Returns None on any failure; caller should treat it as "unknown".
     """
-    try:
-        import litellm
-        from financemailparser.infrastructure.ai.providers import (
-            strip_litellm_model_prefix,
-        )
+    mgr = _ai_config_manager()
+    # 未配置时直接返回：load_config 会把“未找到 AI 配置”当作错误记日志，每次重绘都刷一条。
+    if not mgr.config_present():
+        return None
 
-        cfg = AIConfigManager().load_config()
+    try:
+        cfg = mgr.load_config()
         if not cfg:
             return None
 
-        token_count_model = strip_litellm_model_prefix(cfg.provider, cfg.model)
+        token_count_model = _token_count_model(cfg.provider, cfg.model)
         if not token_count_model:
             return None
 
         return int(
-            litellm.token_counter(
+            _litellm_token_counter()(
                 model=token_count_model,
                 messages=[{"role": "user", "content": str(prompt or "")}],
             )
@@ -2,15 +2,23 @@ from __future__ import annotations
 
 import hashlib
 import json
+import os
 import re
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from pathlib import Path
+from types import ModuleType
 from typing import Any, Callable, Mapping, Optional, TypedDict, cast
 
 from financemailparser.shared.constants import MASK_MAP_DIR
 from financemailparser.infrastructure.ai.config import AIConfigManager
 from financemailparser.infrastructure.ai.service import AIService, CallStats
-from financemailparser.application.ai.amount_masking import AmountMasker, MaskingStats
+from financemailparser.application.ai.amount_masking import (
+    AmountMasker,
+    MaskingStats,
+    restore_beancount_amounts,
+)
 from financemailparser.infrastructure.beancount.validator import (
     AccountFillingReport,
     BeancountReconciler,
@@ -36,6 +44,12 @@ from financemailparser.infrastructure.beancount.file_manager import (
     scan_beancount_files as _scan_beancount_files,
 )
 
+_orjson: Optional[ModuleType]
+try:  # 可选加速：大映射表直接序列化为 UTF-8 bytes
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    _orjson = None
+
 
 class AmountMaskingSessionState(TypedDict):
     run_id: str
@@ -44,13 +58,13 @@ class AmountMaskingSessionState(TypedDict):
     saved_path: Optional[str]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MaskMapPersistResult:
     saved_path: Optional[str]
     error_message: Optional[str] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AmountMaskingResult:
     masked_latest_content: str
     masked_reference_files: list[tuple[str, str]]
@@ -58,7 +72,7 @@ class AmountMaskingResult:
     mapping: dict[str, str]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PromptPreparationResult:
     prompt_masked: str
     prompt_real: str
@@ -294,12 +308,21 @@ def compute_ai_process_run_id(
     latest_fingerprint: str,
     reference_fingerprints: list[str],
 ) -> str:
-    signature_payload = {
-        "latest": {"name": str(latest_name), "fingerprint": str(latest_fingerprint)},
-        "refs": sorted(reference_fingerprints or []),
-    }
-    signature = json.dumps(signature_payload, sort_keys=True, ensure_ascii=False)
-    return hashlib.sha1(signature.encode("utf-8")).hexdigest()[:10]
+    """
+    Deterministic 10-hex-char id for one (latest file, reference set) combination.
+
+    Fields are fed to BLAKE2b as NUL/SOH-separated bytes (reference order ignored),
+    avoiding an intermediate JSON document.
+    """
+    h = hashlib.blake2b(digest_size=5)
+    h.update(str(latest_name).encode("utf-8"))
+    h.update(b"\x00")
+    h.update(str(latest_fingerprint).encode("utf-8"))
+    h.update(b"\x00")
+    for fingerprint in sorted(reference_fingerprints or []):
+        h.update(fingerprint.encode("utf-8"))
+        h.update(b"\x01")
+    return h.hexdigest()
 
 
 def mask_amounts_for_ai_process(
@@ -311,17 +334,21 @@ def mask_amounts_for_ai_process(
     masker = AmountMasker(run_id=run_id)
     masked_latest_content = masker.mask_text(latest_content) or ""
 
-    masked_reference_files: list[tuple[str, str]] = []
-    for filename, content in reference_files or []:
-        masked_reference_files.append((filename, masker.mask_text(content) or ""))
+    masked_reference_files = (
+        [
+            (filename, masker.mask_text(content) or "")
+            for filename, content in reference_files
+        ]
+        if reference_files
+        else []
+    )
 
-    stats = masker.stats()
-    mapping = dict(masker.mapping)
+    # masker 只在本函数内使用，直接交出其 mapping，无需再拷贝一份。
     return AmountMaskingResult(
         masked_latest_content=masked_latest_content,
         masked_reference_files=masked_reference_files,
-        stats=stats,
-        mapping=mapping,
+        stats=masker.stats(),
+        mapping=masker.mapping,
     )
 
 
@@ -338,14 +365,61 @@ def persist_mask_map_json(
         mask_map_dir.mkdir(parents=True, exist_ok=True)
         path = mask_map_dir / f"{run_id}.json"
         payload = {"run_id": run_id, "mapping": mapping}
-        path.write_text(
-            json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8"
-        )
+        if _orjson is not None:
+            data = _orjson.dumps(payload, option=_orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+        # 先写临时文件再原子替换，避免中断时留下半截映射文件（无法恢复金额）。
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
         return MaskMapPersistResult(saved_path=str(path), error_message=None)
     except Exception as e:
         return MaskMapPersistResult(saved_path=None, error_message=str(e))
 
 
+# Streamlit 每次交互都会重跑页面；输入不变时直接复用上次的 Prompt 构建结果。
+_PROMPT_CACHE_SIZE = 8
+_prompt_cache: "OrderedDict[tuple[Any, ...], PromptPreparationResult]" = OrderedDict()
+_prompt_cache_lock = threading.Lock()
+
+
+def _copy_prompt_preparation(
+    result: PromptPreparationResult,
+) -> PromptPreparationResult:
+    # amount_masking 会被放入 session_state，返回副本避免调用方修改缓存内容。
+    masking = result.amount_masking
+    return replace(
+        result, amount_masking={**masking, "mapping": dict(masking["mapping"])}
+    )
+
+
+def _cached_prompt_preparation(
+    key: tuple[Any, ...],
+) -> Optional[PromptPreparationResult]:
+    with _prompt_cache_lock:
+        result = _prompt_cache.get(key)
+        if result is None:
+            return None
+        saved_path = result.amount_masking["saved_path"]
+        if saved_path is not None and not Path(saved_path).is_file():
+            # 映射文件已被删除：重新构建，以便重新落盘。
+            del _prompt_cache[key]
+            return None
+        _prompt_cache.move_to_end(key)
+        return _copy_prompt_preparation(result)
+
+
+def _remember_prompt_preparation(
+    key: tuple[Any, ...], result: PromptPreparationResult
+) -> None:
+    with _prompt_cache_lock:
+        _prompt_cache[key] = result
+        _prompt_cache.move_to_end(key)
+        while len(_prompt_cache) > _PROMPT_CACHE_SIZE:
+            _prompt_cache.popitem(last=False)
+
+
 def prepare_ai_process_prompts(
     *,
     latest_name: str,
@@ -360,6 +434,27 @@ def prepare_ai_process_prompts(
     strip_export_comments: bool = True,
     mask_map_dir: Path = MASK_MAP_DIR,
 ) -> PromptPreparationResult:
+    """
+    Mask amounts and build the masked/real prompts for the AI process page.
+
+    Results are cached (LRU) by file fingerprints and options, so Streamlit reruns
+    with unchanged inputs skip masking and prompt building.
+    """
+    cache_key = (
+        str(latest_name),
+        str(latest_fingerprint),
+        tuple(reference_fingerprints or ()),
+        int(examples_per_transaction),
+        account_definition_content or "",
+        extra_prompt or "",
+        bool(persist_map),
+        bool(strip_export_comments),
+        str(mask_map_dir),
+    )
+    cached = _cached_prompt_preparation(cache_key)
+    if cached is not None:
+        return cached
+
     run_id = compute_ai_process_run_id(
         latest_name=latest_name,
         latest_fingerprint=latest_fingerprint,
@@ -371,14 +466,16 @@ def prepare_ai_process_prompts(
         if strip_export_comments
         else (latest_content or "")
     )
-    reference_files_for_ai = (
-        [
+    reference_files_for_ai: list[tuple[str, str]]
+    if not reference_files:
+        reference_files_for_ai = []
+    elif strip_export_comments:
+        reference_files_for_ai = [
             (name, strip_beancount_export_comments(content or ""))
-            for name, content in (reference_files or [])
+            for name, content in reference_files
         ]
-        if strip_export_comments
-        else (reference_files or [])
-    )
+    else:
+        reference_files_for_ai = reference_files
 
     masking = mask_amounts_for_ai_process(
         run_id=run_id,
@@ -386,20 +483,20 @@ def prepare_ai_process_prompts(
         reference_files=reference_files_for_ai,
     )
 
-    persist_result = (
-        persist_mask_map_json(
+    has_masked_amounts = masking.stats.tokens_total > 0
+    if persist_map and has_masked_amounts:
+        persist_result = persist_mask_map_json(
             run_id=masking.stats.run_id,
             mapping=masking.mapping,
             mask_map_dir=mask_map_dir,
         )
-        if persist_map and masking.stats.tokens_total > 0
-        else MaskMapPersistResult(saved_path=None, error_message=None)
-    )
+    else:
+        persist_result = MaskMapPersistResult(saved_path=None, error_message=None)
 
     amount_masking: AmountMaskingSessionState = {
         "run_id": masking.stats.run_id,
         "tokens_total": masking.stats.tokens_total,
-        "mapping": dict(masking.mapping),
+        "mapping": masking.mapping,
         "saved_path": persist_result.saved_path,
     }
     mask_map_save_error = persist_result.error_message
@@ -413,16 +510,15 @@ def prepare_ai_process_prompts(
         extra_prompt=extra_prompt.strip() if extra_prompt else None,
     )
 
-    prompt_real, _ = build_smart_ai_prompt(
-        latest_file_name=str(latest_name),
-        latest_file_content=latest_content_for_ai,
-        reference_files=reference_files_for_ai,
-        examples_per_transaction=examples_per_transaction,
-        account_definition_text=account_definition_content,
-        extra_prompt=extra_prompt.strip() if extra_prompt else None,
-    )
+    # 脱敏是可逆的 token 替换：直接恢复脱敏 Prompt 得到真实版本，
+    # 无需对原文再构建一次 Prompt（解析 + TF-IDF 匹配 + 拼接）。
+    # 没有任何金额被脱敏时两者完全相同，直接复用。
+    if has_masked_amounts:
+        prompt_real, _ = restore_beancount_amounts(prompt_masked, masking.mapping)
+    else:
+        prompt_real = prompt_masked
 
-    return PromptPreparationResult(
+    result = PromptPreparationResult(
         prompt_masked=prompt_masked,
         prompt_real=prompt_real,
         prompt_stats_v2=prompt_stats_v2,
@@ -430,6 +526,12 @@ def prepare_ai_process_prompts(
         masked_latest_content=masking.masked_latest_content,
         mask_map_save_error=mask_map_save_error,
     )
+    if result.mask_map_save_error:
+        # 落盘失败的结果不缓存，下次调用会重试写入映射文件。
+        return result
+    # 缓存持有本次结果，调用方拿到副本（整个流程只拷贝一次 mapping）。
+    _remember_prompt_preparation(cache_key, result)
+    return _copy_prompt_preparation(result)
 
 
 def call_ai_completion(
@@ -467,8 +569,10 @@ def _coerce_amount_masking_state(info: Mapping[str, Any]) -> AmountMaskingSessio
         raise ValueError("未找到脱敏 run_id")
     if not isinstance(tokens_total, int):
         raise ValueError("脱敏统计信息格式错误（tokens_total）")
-    if not isinstance(mapping, dict) or not all(
-        isinstance(k, str) and isinstance(v, str) for k, v in mapping.items()
+    # mapping 只来自本模块写入的 session_state（AmountMasker 产出的 str -> str），
+    # 因此只抽查首个条目的类型，不逐条扫描（映射可能有上万条）。
+    if not isinstance(mapping, dict) or (
+        mapping and not all(isinstance(x, str) for x in next(iter(mapping.items())))
     ):
         raise ValueError("未找到脱敏映射，无法恢复金额")
     if saved_path is not None and not isinstance(saved_path, str):
@@ -500,9 +604,9 @@ def restore_amounts_and_reconcile_accounts(
     """
     info = _coerce_amount_masking_state(amount_masking)
 
-    restore_masker = AmountMasker(run_id=info["run_id"])
-    restore_masker.mapping = info["mapping"]
-    restored_text = restore_masker.unmask_text(masked_ai_response or "")
+    restored_text, _ = restore_beancount_amounts(
+        masked_ai_response or "", info["mapping"]
+    )
     if strip_export_comments:
         restored_text = strip_beancount_export_comments(restored_text)
 
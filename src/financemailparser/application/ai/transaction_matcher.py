@@ -12,10 +12,6 @@ from __future__ import annotations
 from typing import List
 from dataclasses import dataclass
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
-
 from financemailparser.domain.beancount_constants import BEANCOUNT_TODO_TOKEN
 from financemailparser.infrastructure.beancount.validator import BeancountTransaction
 
@@ -39,6 +35,10 @@ class TransactionMatcher:
         Args:
             top_k: 为每个目标交易返回的最相似交易数量
         """
+        # sklearn 导入约 1 秒，延迟到真正构建 Prompt 时再加载，
+        # 避免仅导入 AI 页面/模块时付出该成本。
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
         self.top_k = top_k
         self.vectorizer = TfidfVectorizer(
             lowercase=True,
@@ -64,6 +64,9 @@ class TransactionMatcher:
         if not target_transactions or not historical_transactions:
             return []
 
+        import numpy as np
+        from sklearn.metrics.pairwise import cosine_similarity
+
         # 提取交易描述
         target_descriptions = [txn.description for txn in target_transactions]
         historical_descriptions = [txn.description for txn in historical_transactions]
@@ -3,6 +3,8 @@ from __future__ import annotations
 import logging
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
 from typing import TYPE_CHECKING, Callable, Optional
 
@@ -33,7 +35,7 @@ from financemailparser.infrastructure.repositories.local_bills import (
 from financemailparser.domain.services.bank_alias import (
     build_bank_alias_keywords,
     build_bank_display_names,
-    find_bank_code_by_alias,
+    compile_bank_alias_matcher,
 )
 
 logger = logging.getLogger(__name__)
@@ -50,16 +52,56 @@ class CreditCardBillSummary:
     size: int
 
 
+# (规则 dict, 别名匹配函数, 显示名表)；按规则 dict 的身份缓存，见 _load_bank_alias_tables。
+_bank_alias_tables: Optional[
+    tuple[object, Callable[[str], Optional[str]], dict[str, str]]
+] = None
+
+
+def _load_bank_alias_tables() -> tuple[Callable[[str], Optional[str]], dict[str, str]]:
+    """
+    返回 (别名匹配函数, 银行显示名表)，每份已加载的业务规则只构建一次。
+
+    `get_business_rules()` 本身是 lru_cache，规则 dict 在进程内不变；
+    调用 `get_business_rules.cache_clear()` 重新加载后会得到新的 dict，这里随之重建。
+
+    Raises:
+        BusinessRulesError: 业务规则加载/校验失败
+    """
+    global _bank_alias_tables
+    rules = get_bank_alias_keywords()
+    cached = _bank_alias_tables
+    if cached is not None and cached[0] is rules:
+        return cached[1], cached[2]
+
+    match_bank_code = compile_bank_alias_matcher(build_bank_alias_keywords(rules))
+    bank_display_names = build_bank_display_names(rules)
+    _bank_alias_tables = (rules, match_bank_code, bank_display_names)
+    return match_bank_code, bank_display_names
+
+
+@lru_cache(maxsize=4096)
+def _parse_folder_date(date_str: str) -> datetime:
+    """
+    解析账单目录名前缀（DATE_FMT_COMPACT，即 YYYYMMDD）。
+
+    等价于 `datetime.strptime(date_str, DATE_FMT_COMPACT)`，但直接按位切片构造，
+    并按前缀缓存：每次刷新账单列表都会重复解析同一批目录名。
+    """
+    if len(date_str) != 8 or not (date_str.isascii() and date_str.isdigit()):
+        raise ValueError(
+            f"time data {date_str!r} does not match format {DATE_FMT_COMPACT!r}"
+        )
+    return datetime(int(date_str[:4]), int(date_str[4:6]), int(date_str[6:8]))
+
+
 def _get_bank_name_from_subject(
     subject: str,
     *,
-    bank_alias_keywords: dict[str, list[str]],
+    match_bank_code: Callable[[str], Optional[str]],
     bank_display_names: dict[str, str],
 ) -> str:
-    bank_code = find_bank_code_by_alias(
-        subject,
-        bank_alias_keywords=bank_alias_keywords,
-    )
+    bank_code = match_bank_code(subject)
     if not bank_code:
         return "其他银行"
     return bank_display_names.get(bank_code, bank_code)
@@ -77,16 +119,14 @@ def scan_credit_card_bills(
     """
     bills: list[CreditCardBillSummary] = []
     try:
-        bank_alias_rules = get_bank_alias_keywords()
-        bank_alias_keywords = build_bank_alias_keywords(bank_alias_rules)
-        bank_display_names = build_bank_display_names(bank_alias_rules)
+        match_bank_code, bank_display_names = _load_bank_alias_tables()
     except Exception as e:
         msg = f"读取银行别名规则失败，将显示为其他银行：{str(e)}"
         if on_warning:
             on_warning(msg)
         else:
             logger.warning(msg)
-        bank_alias_keywords = {}
+        match_bank_code = compile_bank_alias_matcher(None)
         bank_display_names = {}
 
     folders = scan_credit_card_bill_folders(emails_dir=emails_dir)
@@ -103,7 +143,7 @@ def scan_credit_card_bills(
 
         try:
             date_str = folder.name[:8]
-            date = datetime.strptime(date_str, DATE_FMT_COMPACT)
+            date = _parse_folder_date(date_str)
         except Exception as e:
             msg = f"解析账单目录日期失败：{folder.name}（{str(e)}）"
             if on_warning:
@@ -115,7 +155,7 @@ def scan_credit_card_bills(
         subject = str(metadata.get("subject", "") or "")
         bank = _get_bank_name_from_subject(
             subject,
-            bank_alias_keywords=bank_alias_keywords,
+            match_bank_code=match_bank_code,
             bank_display_names=bank_display_names,
         )
 
@@ -131,7 +171,7 @@ def scan_credit_card_bills(
             )
         )
 
-    bills.sort(key=lambda item: item.date, reverse=True)
+    bills.sort(key=attrgetter("date"), reverse=True)
     return bills
 
 
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import logging
+import re
+import time
 from datetime import datetime
 from typing import Callable, Dict, Optional
 
@@ -11,7 +13,9 @@ from financemailparser.infrastructure.config.business_rules import (
 from financemailparser.infrastructure.data_source.qq_email.config import (
     QQEmailConfigManager,
 )
-from financemailparser.infrastructure.data_source.qq_email.parser import QQEmailParser
+from financemailparser.infrastructure.data_source.qq_email.session_pool import (
+    checkout_parser,
+)
 from financemailparser.infrastructure.data_source.qq_email.processor import (
     save_email_content,
 )
@@ -22,19 +26,26 @@ from financemailparser.shared.logger import set_global_log_level
 
 logger = logging.getLogger(__name__)
 
+# 目录名只保留字母数字（含中文）、空格、- 和 _（\w 等价于 str.isalnum() 或 "_"）
+_UNSAFE_SUBJECT_CHARS_RE = re.compile(r"[^\w \-]")
+
+_PROGRESS_MIN_INTERVAL_SECONDS = 0.1
+
+
+def _normalize_subject_keywords(keywords: list[str]) -> tuple[str, ...]:
+    """Strip + lowercase keywords once, dropping empties."""
+    normalized = (str(keyword or "").strip().lower() for keyword in keywords or [])
+    return tuple(kw for kw in normalized if kw)
 
-def _subject_contains_any_keyword(subject: str, keywords: list[str]) -> bool:
+
+def _subject_contains_any_keyword(subject: str, keywords: tuple[str, ...]) -> bool:
     """
-    Case-insensitive substring match.
+    Case-insensitive substring match against pre-normalized keywords.
 
     Kept in app layer to avoid coupling data_source to business rules.
     """
     subject_norm = str(subject or "").lower()
-    for keyword in keywords or []:
-        kw = str(keyword or "").strip().lower()
-        if kw and kw in subject_norm:
-            return True
-    return False
+    return any(kw in subject_norm for kw in keywords)
 
 
 def download_credit_card_emails(
@@ -69,72 +80,76 @@ def download_credit_card_emails(
         logger.error("未配置邮箱信息，请先配置邮箱")
         raise ValueError("未配置邮箱信息")
 
-    parser = QQEmailParser(email, password)
-
     if progress_callback:
         progress_callback(0, 100, "正在连接邮箱...")
 
-    if not parser.login():
-        logger.error("登录失败")
-        raise ConnectionError("登录失败")
-
-    if progress_callback:
-        progress_callback(10, 100, "连接成功")
-
-    try:
-        subject_keywords = get_email_subject_keywords()
-        credit_card_keywords = subject_keywords.get("credit_card", []) or []
-
-        email_dir = create_storage_structure()
-
+    with checkout_parser(email, password) as parser:
         if progress_callback:
-            progress_callback(15, 100, "正在搜索邮件...")
+            progress_callback(10, 100, "连接成功")
 
-        email_list = parser.get_email_list(start_date, end_date)
-        logger.info("找到 %s 封邮件", len(email_list))
+        try:
+            subject_keywords = get_email_subject_keywords()
+            credit_card_keywords = _normalize_subject_keywords(
+                subject_keywords.get("credit_card", []) or []
+            )
 
-        if progress_callback:
-            progress_callback(20, 100, f"找到 {len(email_list)} 封邮件")
+            email_dir = create_storage_structure()
 
-        saved_count = 0
-        total_emails = len(email_list)
-        if total_emails == 0:
             if progress_callback:
-                progress_callback(100, 100, "未找到信用卡账单")
-            logger.info("未找到信用卡账单")
-            return {"credit_card": 0}
+                progress_callback(15, 100, "正在搜索邮件...")
+
+            email_list = parser.get_email_list(start_date, end_date)
+            logger.info("找到 %s 封邮件", len(email_list))
 
-        for idx, email_data in enumerate(email_list):
-            progress = 20 + int((idx + 1) / total_emails * 80)
             if progress_callback:
-                progress_callback(
-                    progress,
-                    100,
-                    f"正在处理邮件 {idx + 1}/{total_emails}: {email_data['subject'][:30]}...",
-                )
-
-            if _subject_contains_any_keyword(
-                email_data.get("subject", ""), credit_card_keywords
-            ):
-                date_str = email_data["date"].strftime(DATE_FMT_COMPACT)
-                safe_subject = "".join(
-                    c
-                    for c in email_data["subject"]
-                    if c.isalnum() or c in (" ", "-", "_")
-                )[:50]
-                email_folder = email_dir / f"{date_str}_{safe_subject}"
-                save_email_content(email_folder, email_data, email_data["raw_message"])
-                saved_count += 1
-                logger.info("已保存信用卡账单: %s", email_data["subject"])
+                progress_callback(20, 100, f"找到 {len(email_list)} 封邮件")
+
+            saved_count = 0
+            total_emails = len(email_list)
+            if total_emails == 0:
+                if progress_callback:
+                    progress_callback(100, 100, "未找到信用卡账单")
+                logger.info("未找到信用卡账单")
+                return {"credit_card": 0}
+
+            last_progress = -1
+            last_reported_at = 0.0
+            for idx, email_data in enumerate(email_list):
+                progress = 20 + int((idx + 1) / total_emails * 80)
+                now = time.monotonic()
+                # 进度值未变化时按时间节流，避免大邮箱下每封邮件都刷新一次 UI。
+                if progress_callback and (
+                    progress != last_progress
+                    or now - last_reported_at >= _PROGRESS_MIN_INTERVAL_SECONDS
+                ):
+                    last_progress = progress
+                    last_reported_at = now
+                    progress_callback(
+                        progress,
+                        100,
+                        f"正在处理邮件 {idx + 1}/{total_emails}: {email_data['subject'][:30]}...",
+                    )
+
+                if _subject_contains_any_keyword(
+                    email_data.get("subject", ""), credit_card_keywords
+                ):
+                    date_str = email_data["date"].strftime(DATE_FMT_COMPACT)
+                    safe_subject = _UNSAFE_SUBJECT_CHARS_RE.sub(
+                        "", email_data["subject"]
+                    )[:50]
+                    email_folder = email_dir / f"{date_str}_{safe_subject}"
+                    save_email_content(
+                        email_folder, email_data, email_data["raw_message"]
+                    )
+                    saved_count += 1
+                    logger.info("已保存信用卡账单: %s", email_data["subject"])
 
-        if progress_callback:
-            progress_callback(100, 100, f"下载完成！共 {saved_count} 封信用卡账单")
+            if progress_callback:
+                progress_callback(100, 100, f"下载完成！共 {saved_count} 封信用卡账单")
 
-        logger.info("下载完成，共保存 %s 封信用卡账单", saved_count)
-        return {"credit_card": saved_count}
+            logger.info("下载完成，共保存 %s 封信用卡账单", saved_count)
+            return {"credit_card": saved_count}
 
-    except Exception as e:
-        logger.error("下载信用卡账单时出错: %s", str(e), exc_info=True)
-        raise
-    finally:
-        parser.close()
+        except Exception as e:
+            logger.error("下载信用卡账单时出错: %s", str(e), exc_info=True)
+            raise
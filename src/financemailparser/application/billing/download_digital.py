@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 from financemailparser.domain.models.digital_bill_status import (
     DIGITAL_BILL_STATUS_DOWNLOADED,
@@ -21,11 +22,15 @@ from financemailparser.infrastructure.data_source.qq_email.config import (
     QQEmailConfigManager,
 )
 from financemailparser.infrastructure.data_source.qq_email.parser import QQEmailParser
+from financemailparser.infrastructure.data_source.qq_email.session_pool import (
+    checkout_parser,
+)
 from financemailparser.infrastructure.data_source.qq_email.utils import (
     create_storage_structure,
 )
 from financemailparser.infrastructure.repositories.file_scan import (
     find_file_by_suffixes,
+    find_latest_file_by_suffixes,
 )
 from financemailparser.shared.logger import set_global_log_level
 
@@ -51,15 +56,6 @@ def download_digital_payment_emails(
         if progress_callback:
             progress_callback(progress, 100, message)
 
-    def find_latest_zip_file(directory: Path) -> Optional[Path]:
-        zip_files = list(directory.rglob("*.zip"))
-        if not zip_files:
-            return None
-        try:
-            return max(zip_files, key=lambda p: p.stat().st_mtime)
-        except Exception:
-            return zip_files[-1]
-
     def extract_existing_zip(
         parser: QQEmailParser,
         zip_path: Path,
@@ -121,14 +117,14 @@ def download_digital_payment_emails(
         result["alipay_status"] != DIGITAL_BILL_STATUS_SKIPPED_EXISTING_CSV
         and alipay_dir.exists()
     ):
-        alipay_zip_path = find_latest_zip_file(alipay_dir)
+        alipay_zip_path = find_latest_file_by_suffixes(alipay_dir, [".zip"])
 
     wechat_zip_path = None
     if (
         result["wechat_status"] != DIGITAL_BILL_STATUS_SKIPPED_EXISTING_CSV
         and wechat_dir.exists()
     ):
-        wechat_zip_path = find_latest_zip_file(wechat_dir)
+        wechat_zip_path = find_latest_file_by_suffixes(wechat_dir, [".zip"])
 
     if (
         result["alipay_status"] == DIGITAL_BILL_STATUS_SKIPPED_EXISTING_CSV
@@ -143,67 +139,58 @@ def download_digital_payment_emails(
         logger.error("未配置邮箱信息，请先配置邮箱")
         raise ValueError("未配置邮箱信息")
 
-    parser = QQEmailParser(email, password)
     report(10, "正在连接邮箱...")
-    if not parser.login():
-        logger.error("登录失败")
-        raise ConnectionError("登录失败")
-    report(20, "连接成功，开始处理支付宝/微信账单...")
+    with checkout_parser(email, password) as parser:
+        report(20, "连接成功，开始处理支付宝/微信账单...")
 
-    try:
-        if (
-            result["alipay_status"] != DIGITAL_BILL_STATUS_SKIPPED_EXISTING_CSV
-            and alipay_zip_path
+        existing_zip_jobs: List[Tuple[str, str, Path, Path, str]] = []
+        for bill_type, label, zip_path, bill_dir, zip_pwd in (
+            ("alipay", "支付宝", alipay_zip_path, alipay_dir, alipay_pwd),
+            ("wechat", "微信", wechat_zip_path, wechat_dir, wechat_pwd),
         ):
-            if not alipay_pwd:
+            if (
+                result[f"{bill_type}_status"]
+                == DIGITAL_BILL_STATUS_SKIPPED_EXISTING_CSV
+                or not zip_path
+            ):
+                continue
+            if not zip_pwd:
                 logger.warning(
-                    "检测到本地已有支付宝ZIP，但缺少解压密码，已跳过解压：%s",
-                    str(alipay_zip_path),
+                    "检测到本地已有%sZIP，但缺少解压密码，已跳过解压：%s",
+                    label,
+                    str(zip_path),
                 )
-                result["alipay_status"] = DIGITAL_BILL_STATUS_MISSING_PASSWORD
-            else:
-                report(30, "检测到本地已有支付宝ZIP，尝试解压...")
-                extracted_csv = extract_existing_zip(
-                    parser,
-                    alipay_zip_path,
-                    alipay_dir,
-                    alipay_pwd,
-                    bill_type="alipay",
-                )
-                if extracted_csv:
-                    result["alipay_status"] = DIGITAL_BILL_STATUS_EXTRACTED_EXISTING_ZIP
-                    result["alipay_csv"] = str(extracted_csv)
-                else:
-                    result["alipay_status"] = (
-                        DIGITAL_BILL_STATUS_FAILED_EXTRACT_EXISTING_ZIP
-                    )
+                result[f"{bill_type}_status"] = DIGITAL_BILL_STATUS_MISSING_PASSWORD
+                continue
+            existing_zip_jobs.append((bill_type, label, zip_path, bill_dir, zip_pwd))
 
-        if (
-            result["wechat_status"] != DIGITAL_BILL_STATUS_SKIPPED_EXISTING_CSV
-            and wechat_zip_path
-        ):
-            if not wechat_pwd:
-                logger.warning(
-                    "检测到本地已有微信ZIP，但缺少解压密码，已跳过解压：%s",
-                    str(wechat_zip_path),
-                )
-                result["wechat_status"] = DIGITAL_BILL_STATUS_MISSING_PASSWORD
-            else:
-                report(60, "检测到本地已有微信ZIP，尝试解压...")
-                extracted_csv = extract_existing_zip(
-                    parser,
-                    wechat_zip_path,
-                    wechat_dir,
-                    wechat_pwd,
-                    bill_type="wechat",
-                )
-                if extracted_csv:
-                    result["wechat_status"] = DIGITAL_BILL_STATUS_EXTRACTED_EXISTING_ZIP
-                    result["wechat_csv"] = str(extracted_csv)
-                else:
-                    result["wechat_status"] = (
-                        DIGITAL_BILL_STATUS_FAILED_EXTRACT_EXISTING_ZIP
-                    )
+        if existing_zip_jobs:
+            labels = "/".join(job[1] for job in existing_zip_jobs)
+            report(30, f"检测到本地已有{labels}ZIP，尝试解压...")
+            # 两个 ZIP 互不相关，并行解压（磁盘 I/O 与 zlib 解压会释放 GIL）。
+            with ThreadPoolExecutor(max_workers=len(existing_zip_jobs)) as pool:
+                futures = {
+                    pool.submit(
+                        extract_existing_zip,
+                        parser,
+                        zip_path,
+                        bill_dir,
+                        zip_pwd,
+                        bill_type=bill_type,
+                    ): bill_type
+                    for bill_type, _label, zip_path, bill_dir, zip_pwd in existing_zip_jobs
+                }
+                for future, bill_type in futures.items():
+                    extracted_file = future.result()
+                    if extracted_file:
+                        result[f"{bill_type}_status"] = (
+                            DIGITAL_BILL_STATUS_EXTRACTED_EXISTING_ZIP
+                        )
+                        result[f"{bill_type}_csv"] = str(extracted_file)
+                    else:
+                        result[f"{bill_type}_status"] = (
+                            DIGITAL_BILL_STATUS_FAILED_EXTRACT_EXISTING_ZIP
+                        )
 
         if (
             result["alipay_status"]
@@ -292,5 +279,3 @@ def download_digital_payment_emails(
 
         report(100, "支付宝/微信账单处理完成。")
         return result
-    finally:
-        parser.close()
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import logging
 import re
+from collections import deque
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Tuple
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 from financemailparser.application.settings.user_rules_facade import (
     get_expenses_account_rules_ui_snapshot,
@@ -11,8 +13,8 @@ from financemailparser.application.settings.user_rules_facade import (
 )
 from financemailparser.infrastructure.config.user_rules import (
     AmountRange,
-    match_expenses_account,
-    match_skip_keyword,
+    compile_expenses_account_matcher,
+    compile_skip_keyword_matcher,
 )
 from financemailparser.domain.models.txn import DigitalPaymentTransaction, Transaction
 from financemailparser.domain.services.date_filter import parse_date_safe
@@ -134,6 +136,23 @@ class CCDigitalMatch:
     dp_description: str
     final_description: str
     final_from: str  # "cc" or "dp"
+    # Positions of the pair in the input lists passed to find_cc_digital_matches.
+    cc_index: int
+    dp_index: int
+
+
+def _match_key(
+    txn: Transaction, dt: Optional[datetime], source: Any
+) -> Tuple[Any, int, Any]:
+    """
+    (day, amount in cents, card) key used to pair cc and digital-payment txns.
+
+    Parsed dates become day ordinals (unparsable ones keep the raw string) and
+    amounts become integer cents: cheaper to build and hash than strftime
+    strings and floats, and immune to float noise such as 14.5 vs 14.499999.
+    """
+    date_key = dt.toordinal() if dt else str(getattr(txn, "date", "") or "")
+    return date_key, round(txn.amount * 100), source
 
 
 def find_cc_digital_matches(
@@ -148,37 +167,34 @@ def find_cc_digital_matches(
     - amount
     - card_source (from dp_txn) equals cc_txn.source
     """
-    dp_txns_index: Dict[Tuple[Any, Any, Any], List[DigitalPaymentTransaction]] = {}
-    for dp_txn in digital_payment_transactions:
+    # key -> indices into dp_candidates (in input order); dates are parsed once here.
+    dp_candidates: List[Tuple[DigitalPaymentTransaction, Optional[datetime], int]] = []
+    dp_txns_index: Dict[Tuple[Any, int, Any], Deque[int]] = {}
+    for dp_pos, dp_txn in enumerate(digital_payment_transactions):
         if isinstance(dp_txn, DigitalPaymentTransaction) and dp_txn.card_source:
             dp_dt = parse_date_safe(getattr(dp_txn, "date", ""))
-            dp_date_key = (
-                dp_dt.strftime("%Y-%m-%d")
-                if dp_dt
-                else str(getattr(dp_txn, "date", "") or "")
-            )
-            key = (dp_date_key, dp_txn.amount, dp_txn.card_source)
-            dp_txns_index.setdefault(key, []).append(dp_txn)
+            key = _match_key(dp_txn, dp_dt, dp_txn.card_source)
+            dp_txns_index.setdefault(key, deque()).append(len(dp_candidates))
+            dp_candidates.append((dp_txn, dp_dt, dp_pos))
 
     matches: List[CCDigitalMatch] = []
-    matched_dp_txns = set()
+    matched_dp = bytearray(len(dp_candidates))
 
-    for cc_txn in credit_card_transactions:
+    for cc_pos, cc_txn in enumerate(credit_card_transactions):
         cc_dt = parse_date_safe(getattr(cc_txn, "date", ""))
-        cc_date_key = (
-            cc_dt.strftime("%Y-%m-%d")
-            if cc_dt
-            else str(getattr(cc_txn, "date", "") or "")
-        )
-        key = (cc_date_key, cc_txn.amount, cc_txn.source)
-        if key not in dp_txns_index:
+        bucket = dp_txns_index.get(_match_key(cc_txn, cc_dt, cc_txn.source))
+        if not bucket:
             continue
+        # Matched candidates are dropped from the bucket head, so repeated
+        # (date, amount, card) keys don't rescan already-consumed entries.
+        while bucket and matched_dp[bucket[0]]:
+            bucket.popleft()
 
-        for dp_txn in dp_txns_index[key]:
-            if dp_txn in matched_dp_txns:
+        for dp_idx in bucket:
+            if matched_dp[dp_idx]:
                 continue
 
-            dp_dt = parse_date_safe(getattr(dp_txn, "date", ""))
+            dp_txn, dp_dt, dp_pos = dp_candidates[dp_idx]
             # Explicit same-day requirement (conservative):
             # - if both dates parseable: must be same calendar day
             # - otherwise: require raw date string equality
@@ -233,9 +249,11 @@ def find_cc_digital_matches(
                     dp_description=dp_desc,
                     final_description=final_desc,
                     final_from=final_from,
+                    cc_index=cc_pos,
+                    dp_index=dp_pos,
                 )
             )
-            matched_dp_txns.add(dp_txn)
+            matched_dp[dp_idx] = 1
             break
 
     return matches
@@ -265,8 +283,10 @@ def load_transaction_filters_safe() -> Tuple[List[str], List[AmountRange]]:
 
 
 def make_should_skip_transaction(skip_keywords: List[str]) -> Callable[[str], bool]:
+    match_skip_keyword = compile_skip_keyword_matcher(skip_keywords)
+
     def should_skip_transaction(description: str) -> bool:
-        return match_skip_keyword(str(description or ""), skip_keywords) is not None
+        return match_skip_keyword(description) is not None
 
     return should_skip_transaction
 
@@ -288,7 +308,9 @@ def merge_transaction_descriptions(
     matches = find_cc_digital_matches(
         credit_card_transactions, digital_payment_transactions
     )
-    to_remove: set[Transaction] = set()
+    # Removal is tracked by input position, so Transaction never has to be hashed.
+    cc_removed = bytearray(len(credit_card_transactions))
+    dp_removed = bytearray(len(digital_payment_transactions))
     matched_count = len(matches)
 
     for m in matches:
@@ -318,20 +340,21 @@ def merge_transaction_descriptions(
 
         if m.final_from == "cc":
             cc_txn.description = m.final_description
-            to_remove.add(dp_txn)
+            dp_removed[m.dp_index] = 1
         else:
             # Keep dp txn (more detailed), remove cc txn.
-            to_remove.add(cc_txn)
+            cc_removed[m.cc_index] = 1
 
     all_transactions = [
-        t
-        for t in (list(credit_card_transactions) + list(digital_payment_transactions))
-        if t not in to_remove
+        t for i, t in enumerate(credit_card_transactions) if not cc_removed[i]
     ]
+    all_transactions.extend(
+        t for i, t in enumerate(digital_payment_transactions) if not dp_removed[i]
+    )
 
     logger.info("\n合并完成:")
     logger.info("  - 成功匹配并合并: %s 条交易", matched_count)
-    logger.info("  - 已移除的重复交易: %s 条", len(to_remove))
+    logger.info("  - 已移除的重复交易: %s 条", matched_count)
     logger.info("  - 最终交易总数: %s 条", len(all_transactions))
 
     return all_transactions
@@ -354,12 +377,22 @@ def filter_transactions_by_rules(
     filtered_transactions: List[Transaction] = []
     keyword_skipped: List[KeywordSkipItem] = []
     amount_skipped: List[AmountSkipItem] = []
+    match_skip_keyword = compile_skip_keyword_matcher(skip_keywords)
+
+    # Ranges are validated/converted once instead of per transaction.
+    parsed_ranges: List[Tuple[float, float]] = []
+    for r in amount_ranges or []:
+        try:
+            parsed_ranges.append((float(r["gte"]), float(r["lte"])))
+        except Exception:
+            continue
 
     for txn in transactions:
-        desc = str(getattr(txn, "description", "") or "")
-        amt = float(getattr(txn, "amount", 0.0) or 0.0)
+        # Transaction.__init__ already normalizes description to str and amount to float.
+        desc = txn.description or ""
+        amt = txn.amount or 0.0
 
-        matched_keyword = match_skip_keyword(desc, skip_keywords)
+        matched_keyword = match_skip_keyword(desc)
         if matched_keyword is not None:
             skipped_by_keyword += 1
             keyword_skipped.append(
@@ -377,12 +410,7 @@ def filter_transactions_by_rules(
             continue
 
         matched_range: tuple[float, float] | None = None
-        for r in amount_ranges or []:
-            try:
-                gte = float(r["gte"])
-                lte = float(r["lte"])
-            except Exception:
-                continue
+        for gte, lte in parsed_ranges:
             if gte <= amt <= lte:
                 matched_range = (gte, lte)
                 break
@@ -436,19 +464,15 @@ def apply_expenses_account_rules(
     matched_accounts = 0
     if not expenses_rules:
         return 0
+    match_expenses_account = compile_expenses_account_matcher(expenses_rules)
 
+    # Transaction.__init__ already normalizes amount to float and description to str.
     for txn in transactions:
-        try:
-            amount = float(getattr(txn, "amount", 0.0) or 0.0)
-            if amount < 0:
-                continue
-
-            desc = str(getattr(txn, "description", "") or "")
-            matched = match_expenses_account(desc, expenses_rules)
-            if matched:
-                setattr(txn, "beancount_expenses_account", matched)
-                matched_accounts += 1
-        except Exception:
+        if txn.amount < 0:
             continue
+        matched = match_expenses_account(txn.description)
+        if matched:
+            txn.beancount_expenses_account = matched
+            matched_accounts += 1
 
     return matched_accounts
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import List, Tuple
 
 
@@ -17,16 +18,22 @@ def _get_month_end(year: int, month: int) -> datetime:
     return datetime(year, month + 1, 1) - timedelta(days=1)
 
 
-def get_quick_select_options() -> List[str]:
-    today = datetime.now()
+@lru_cache(maxsize=2)
+def _quick_select_options_for(year: int, month: int) -> Tuple[str, ...]:
     options = ["本月", "上月", "最近三个月", "最近半年"]
 
     # Add month options from 2 months ago to 6 months ago (inclusive).
     for offset in range(2, 7):
-        year, month = _shift_months(today.year, today.month, offset)
-        options.append(f"{year}年{month:02d}月")
+        shifted_year, shifted_month = _shift_months(year, month, offset)
+        options.append(f"{shifted_year}年{shifted_month:02d}月")
+
+    return tuple(options)
 
-    return options
+
+def get_quick_select_options() -> List[str]:
+    # 每次页面渲染都会调用；选项只随当前年月变化，按 (年, 月) 缓存，返回新 list 供调用方修改。
+    today = datetime.now()
+    return list(_quick_select_options_for(today.year, today.month))
 
 
 def calculate_date_range_for_quick_select(option: str) -> Tuple[datetime, datetime]:
@@ -4,13 +4,23 @@ from dataclasses import dataclass
 from typing import Literal
 
 from financemailparser.infrastructure.config.secrets import (
+    MASTER_PASSWORD_ENV,
     MasterPasswordNotSetError,
     PlaintextSecretFoundError,
     SecretDecryptionError,
 )
 
 
-@dataclass(frozen=True)
+# Shared by the email/AI save and test actions when the master password is unset.
+MISSING_MASTER_PASSWORD_SAVE_MESSAGE = (
+    f"❌ 未设置环境变量 {MASTER_PASSWORD_ENV}，无法保存加密配置。"
+)
+MISSING_MASTER_PASSWORD_READ_MESSAGE = (
+    f"❌ 未设置环境变量 {MASTER_PASSWORD_ENV}，无法读取加密配置。"
+)
+
+
+@dataclass(frozen=True, slots=True)
 class UiActionResult:
     ok: bool
     message: str
@@ -46,9 +56,9 @@ def mask_secret(value: str, *, head: int, tail: int) -> str:
     if not value:
         return ""
 
-    raw = str(value)
-    if len(raw) <= head + tail:
-        return "*" * len(raw)
-    prefix = raw[:head] if head > 0 else ""
-    suffix = raw[-tail:] if tail > 0 else ""
-    return f"{prefix}***{suffix}"
+    # Callers pass decrypted str values; no str() coercion needed.
+    n = len(value)
+    if n <= head + tail:
+        return "*" * n
+    # value[-0:] would be the whole string, so tail=0 needs its own branch.
+    return value[:head] + "***" + (value[-tail:] if tail > 0 else "")
@@ -9,7 +9,8 @@ Goal:
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from typing import Literal, Optional
 
 from financemailparser.application.settings.email_service import (
@@ -17,13 +18,19 @@ from financemailparser.application.settings.email_service import (
     EmailProviderSpec,
 )
 from financemailparser.application.common.facade_common import (
+    MISSING_MASTER_PASSWORD_READ_MESSAGE,
+    MISSING_MASTER_PASSWORD_SAVE_MESSAGE,
     UiActionResult,
     map_secret_load_error_to_ui_state,
     mask_secret,
 )
-from financemailparser.infrastructure.config.config_manager import get_config_manager
+from financemailparser.infrastructure.config.config_manager import (
+    ConfigManager,
+    get_config_manager,
+)
 from financemailparser.infrastructure.config.secrets import (
     MASTER_PASSWORD_ENV,
+    SecretError,
     master_password_is_set,
 )
 
@@ -38,7 +45,7 @@ EmailConfigUiState = Literal[
 ]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EmailConfigUiSnapshot:
     state: EmailConfigUiState
     master_password_env: str
@@ -76,41 +83,55 @@ class EmailConfigUiSnapshot:
         return value or None
 
 
+@lru_cache(maxsize=1)
+def _email_config_service_for(_config_manager: ConfigManager) -> EmailConfigService:
+    return EmailConfigService()
+
+
+def _email_config_service() -> EmailConfigService:
+    """
+    Shared EmailConfigService for the facade's UI entry points.
+
+    Keyed by the global ConfigManager like `config_facade._ai_config_manager`, so
+    `get_config_manager.cache_clear()` also yields a fresh service (and adapters).
+    """
+    return _email_config_service_for(get_config_manager())
+
+
 def get_email_provider_spec(*, provider_key: str = "qq") -> EmailProviderSpec:
-    return EmailConfigService().get_provider_spec(provider_key)
+    return _email_config_service().get_provider_spec(provider_key)
 
 
 def get_email_config_ui_snapshot(*, provider_key: str = "qq") -> EmailConfigUiSnapshot:
     provider_key = str(provider_key or "").strip() or "qq"
-    svc = EmailConfigService()
+    svc = _email_config_service()
     spec = svc.get_provider_spec(provider_key)
 
-    raw_values: dict[str, str] = {}
-    try:
-        raw_email_cfg = get_config_manager().get_email_config(provider_key=provider_key)
-        for field in spec.fields:
-            if field.secret:
-                continue
-            raw_values[field.key] = str(raw_email_cfg.get(field.key, "") or "").strip()
-    except Exception:
-        raw_values = {}
+    # get_email_config 在文件缺失/解析失败时返回 {}（不抛异常），无需再包 try。
+    raw_email_cfg = get_config_manager().get_email_config(provider_key=provider_key)
+    raw_values: dict[str, str] = {
+        field.key: str(raw_email_cfg.get(field.key, "") or "").strip()
+        for field in spec.fields
+        if not field.secret
+    }
     has_master = bool(master_password_is_set())
 
+    base = EmailConfigUiSnapshot(
+        state="not_present",
+        master_password_env=MASTER_PASSWORD_ENV,
+        master_password_is_set=has_master,
+        provider_key=provider_key,
+        raw_values=raw_values,
+    )
     if not svc.config_present(provider_key=provider_key):
-        return EmailConfigUiSnapshot(
-            state="not_present",
-            master_password_env=MASTER_PASSWORD_ENV,
-            master_password_is_set=has_master,
-            provider_key=provider_key,
-            raw_values=raw_values,
-        )
+        return base
 
     try:
         decrypted = svc.load_config_strict(provider_key=provider_key)
         ok_public_values: dict[str, str] = {}
         secret_masked: dict[str, str] = {}
         for field in spec.fields:
-            raw_val = str(decrypted.get(field.key, "") or "")
+            raw_val = decrypted.get(field.key, "")
             if field.secret:
                 secret_masked[field.key] = mask_secret(
                     raw_val, head=field.mask_head, tail=field.mask_tail
@@ -118,25 +139,22 @@ def get_email_config_ui_snapshot(*, provider_key: str = "qq") -> EmailConfigUiSn
             else:
                 ok_public_values[field.key] = raw_val.strip()
 
-        return EmailConfigUiSnapshot(
+        return replace(
+            base,
             state="ok",
-            master_password_env=MASTER_PASSWORD_ENV,
-            master_password_is_set=has_master,
-            provider_key=provider_key,
-            raw_values=raw_values,
             ok_public_values=ok_public_values,
             secret_masked=secret_masked,
         )
     except Exception as e:
         state, error_message = map_secret_load_error_to_ui_state(e)
-        return EmailConfigUiSnapshot(
-            state=state,
-            master_password_env=MASTER_PASSWORD_ENV,
-            master_password_is_set=has_master,
-            provider_key=provider_key,
-            raw_values=raw_values,
-            error_message=error_message,
-        )
+        return replace(base, state=state, error_message=error_message)
+
+
+def _str_values(values: Optional[dict[str, str]]) -> dict[str, str]:
+    """Coerce UI form values to str once (None/empty -> ""), keeping keys."""
+    return {
+        k: v if isinstance(v, str) else str(v or "") for k, v in (values or {}).items()
+    }
 
 
 def _build_effective_email_config_values(
@@ -145,11 +163,11 @@ def _build_effective_email_config_values(
     values: dict[str, str],
     masked_placeholders: dict[str, str],
 ) -> dict[str, str] | UiActionResult:
-    svc = EmailConfigService()
+    svc = _email_config_service()
     spec = svc.get_provider_spec(provider_key)
 
-    raw_values: dict[str, str] = {k: str(v or "") for k, v in (values or {}).items()}
-    placeholders = {k: str(v or "") for k, v in (masked_placeholders or {}).items()}
+    raw_values = _str_values(values)
+    placeholders = _str_values(masked_placeholders)
 
     needs_decrypt = False
     for field in spec.fields:
@@ -164,25 +182,23 @@ def _build_effective_email_config_values(
     if needs_decrypt:
         try:
             decrypted_existing = svc.load_config_strict(provider_key=provider_key)
-        except Exception:
+        except (SecretError, ValueError):
             return UiActionResult(
                 ok=False, message="❌ 无法读取已保存的密钥字段，请重新输入。"
             )
 
+    # All values below are already str: form values via _str_values, decrypted ones
+    # from load_config_strict.
     effective: dict[str, str] = {}
+    missing_labels: list[str] = []
     for field in spec.fields:
-        incoming = str(raw_values.get(field.key, "") or "")
+        incoming = raw_values.get(field.key, "")
         if field.secret:
             placeholder = placeholders.get(field.key, "")
             if placeholder and incoming == placeholder:
-                incoming = str(decrypted_existing.get(field.key, "") or "")
+                incoming = decrypted_existing.get(field.key, "")
         effective[field.key] = incoming
-
-    missing_labels: list[str] = []
-    for field in spec.fields:
-        if not field.required:
-            continue
-        if not str(effective.get(field.key, "") or "").strip():
+        if field.required and not incoming.strip():
             missing_labels.append(field.label)
     if missing_labels:
         return UiActionResult(
@@ -199,10 +215,7 @@ def save_email_config_from_ui(
     masked_placeholders: dict[str, str],
 ) -> UiActionResult:
     if not master_password_is_set():
-        return UiActionResult(
-            ok=False,
-            message=f"❌ 未设置环境变量 {MASTER_PASSWORD_ENV}，无法保存加密配置。",
-        )
+        return UiActionResult(ok=False, message=MISSING_MASTER_PASSWORD_SAVE_MESSAGE)
 
     provider_key = str(provider_key or "").strip() or "qq"
     effective = _build_effective_email_config_values(
@@ -214,7 +227,7 @@ def save_email_config_from_ui(
         return effective
 
     try:
-        EmailConfigService().save_config(provider_key=provider_key, values=effective)
+        _email_config_service().save_config(provider_key=provider_key, values=effective)
         return UiActionResult(ok=True, message="✅ 配置保存成功！")
     except ValueError as e:
         return UiActionResult(ok=False, message=f"❌ 输入错误：{str(e)}")
@@ -229,10 +242,7 @@ def test_email_config_from_ui(
     masked_placeholders: dict[str, str],
 ) -> UiActionResult:
     if not master_password_is_set():
-        return UiActionResult(
-            ok=False,
-            message=f"❌ 未设置环境变量 {MASTER_PASSWORD_ENV}，无法读取加密配置。",
-        )
+        return UiActionResult(ok=False, message=MISSING_MASTER_PASSWORD_READ_MESSAGE)
 
     provider_key = str(provider_key or "").strip() or "qq"
     effective = _build_effective_email_config_values(
@@ -244,7 +254,7 @@ def test_email_config_from_ui(
         return effective
 
     try:
-        ok, msg = EmailConfigService().test_connection(
+        ok, msg = _email_config_service().test_connection(
             provider_key=provider_key, values=effective
         )
         return UiActionResult(ok=bool(ok), message=("✅ " if ok else "❌ ") + str(msg))
@@ -255,7 +265,7 @@ def test_email_config_from_ui(
 def delete_email_config_from_ui(*, provider_key: str = "qq") -> UiActionResult:
     try:
         provider_key = str(provider_key or "").strip() or "qq"
-        ok = EmailConfigService().delete_config(provider_key=provider_key)
+        ok = _email_config_service().delete_config(provider_key=provider_key)
         return UiActionResult(
             ok=bool(ok), message="✅ 配置已删除" if ok else "❌ 删除失败"
         )
@@ -86,38 +86,42 @@ class _QQEmailConfigAdapter:
         return self._manager.delete_config()
 
 
+# Specs are immutable dataclasses: built once at import and shared by every service.
+_BUILTIN_PROVIDER_SPECS: dict[str, EmailProviderSpec] = {
+    "qq": EmailProviderSpec(
+        provider_key="qq",
+        display_name="QQ邮箱",
+        fields=(
+            EmailProviderFieldSpec(
+                key="email",
+                label="邮箱地址",
+                help="请输入您的 QQ 邮箱地址",
+                required=True,
+                secret=False,
+            ),
+            EmailProviderFieldSpec(
+                key="auth_code",
+                label="授权码",
+                help="请输入 QQ 邮箱的 IMAP 授权码（不是 QQ 密码）。",
+                required=True,
+                secret=True,
+                mask_head=2,
+                mask_tail=2,
+            ),
+        ),
+    )
+}
+
+
 def build_builtin_provider_specs() -> dict[str, EmailProviderSpec]:
     """
     Return builtin provider specs.
 
     Notes:
     - Returns a new dict each time to avoid runtime global mutation.
-    - Specs are immutable dataclasses and safe to share.
+    - Specs are immutable dataclasses built once at import, so only the dict is copied.
     """
-    return {
-        "qq": EmailProviderSpec(
-            provider_key="qq",
-            display_name="QQ邮箱",
-            fields=(
-                EmailProviderFieldSpec(
-                    key="email",
-                    label="邮箱地址",
-                    help="请输入您的 QQ 邮箱地址",
-                    required=True,
-                    secret=False,
-                ),
-                EmailProviderFieldSpec(
-                    key="auth_code",
-                    label="授权码",
-                    help="请输入 QQ 邮箱的 IMAP 授权码（不是 QQ 密码）。",
-                    required=True,
-                    secret=True,
-                    mask_head=2,
-                    mask_tail=2,
-                ),
-            ),
-        )
-    }
+    return dict(_BUILTIN_PROVIDER_SPECS)
 
 
 def build_builtin_provider_adapters() -> dict[str, EmailConfigProviderAdapter]:
@@ -2,6 +2,22 @@ from .source import TransactionSource
 
 
 class Transaction:
+    # 交易对象在解析/合并/排序中大量创建与访问，用 __slots__ 去掉每个实例的 __dict__。
+    __slots__ = (
+        "source",
+        "date",
+        "description",
+        "amount",
+        "payee",
+        "category",
+        "account",
+        "transfers",
+        "check_num",
+        "memo",
+        "tags",
+        "beancount_expenses_account",
+    )
+
     def __init__(
         self,
         source,
@@ -27,6 +43,7 @@ class Transaction:
         self.check_num = check_num.strip()
         self.memo = memo.strip()
         self.tags = tags.strip()
+        self.beancount_expenses_account = None  # 由消费账户关键词规则填充
 
     def to_dict(self):
         return {
@@ -45,6 +62,8 @@ class Transaction:
 
 
 class DigitalPaymentTransaction(Transaction):
+    __slots__ = ("card_source",)
+
     def __init__(self, source, date, description, amount, payment_method="", **kwargs):
         super().__init__(source, date, description, amount, **kwargs)
         self.card_source = None  # 用于存储关联的信用卡信息
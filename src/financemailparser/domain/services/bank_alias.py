@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Mapping, Optional, Sequence
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence
 
 from financemailparser.domain.models.source import TransactionSource
 
@@ -68,6 +68,38 @@ def find_bank_code_by_alias(
     return None
 
 
+def compile_bank_alias_matcher(
+    bank_alias_keywords: Mapping[str, Sequence[str]] | None,
+) -> Callable[[str], Optional[str]]:
+    """
+    预处理别名表，返回与 `find_bank_code_by_alias(text, bank_alias_keywords=...)`
+    结果一致的函数。
+
+    批量匹配（例如扫描全部本地账单）时使用：银行代码/别名的归一化只做一次，
+    每次匹配只剩按规则顺序的子串查找（第一个命中的银行生效）。
+    """
+    needles: list[tuple[str, str]] = []
+    for raw_code, aliases in (bank_alias_keywords or {}).items():
+        code = str(raw_code or "").strip().upper()
+        if not code:
+            continue
+        for alias in aliases or ():
+            alias_norm = str(alias or "").strip().lower()
+            if alias_norm:
+                needles.append((alias_norm, code))
+
+    def match(text: str) -> Optional[str]:
+        text_norm = str(text or "").lower()
+        if not text_norm:
+            return None
+        for alias_norm, code in needles:
+            if alias_norm in text_norm:
+                return code
+        return None
+
+    return match
+
+
 def find_transaction_source_by_alias(
     text: str,
     *,
@@ -6,8 +6,14 @@ AI 配置管理
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import hashlib
 import logging
+import re
+import threading
+import time
+from types import MappingProxyType
 from typing import Any, ClassVar, Mapping, Optional, Tuple
 
 from financemailparser.infrastructure.config.config_manager import (
@@ -19,6 +25,8 @@ from financemailparser.infrastructure.config.secrets import (
     SecretBox,
     SecretError,
     is_encrypted_value,
+    clear_decrypt_cache,
+    decrypt_cached,
 )
 from financemailparser.infrastructure.ai.providers import ensure_litellm_model_prefix
 
@@ -26,6 +34,9 @@ logger = logging.getLogger(__name__)
 
 
 def _norm_str(value: Any) -> str:
+    # 常见情况（已是 str）直接 strip，避免 str() 再包装一次
+    if isinstance(value, str):
+        return value.strip()
     if value is None:
         return ""
     return str(value).strip()
@@ -38,6 +49,115 @@ def _coerce_int(value: Any, default: int) -> int:
         return int(default)
 
 
+# 已提示过的 (字段, 原始值)：超限值每次加载都会被截断，但每个值只提示一次。
+_clamp_warned: set[tuple[str, int]] = set()
+
+
+def _warn_clamped_limits_once(section: Mapping[str, Any], config: "AIConfig") -> None:
+    for name in ("timeout", "max_retries"):
+        raw = _coerce_int(section.get(name), _INT_FIELD_DEFAULTS[name])
+        clamped = getattr(config, name)
+        if raw == clamped or (name, raw) in _clamp_warned:
+            continue
+        _clamp_warned.add((name, raw))
+        logger.warning(
+            "config.yaml 中 ai.%s=%s 超出上限，按 %s 处理；重新保存 AI 配置即可消除此提示",
+            name,
+            raw,
+            clamped,
+        )
+
+
+# 连接错误分类：每个类别一个可选的前瞻断言，一次 match 即可得到所有命中的类别；
+# 分组顺序即优先级（与原先 if/elif 链一致，而不是取字符串中最靠左的命中）。
+_CONNECTION_ERROR_RE = re.compile(
+    r"(?:(?=.*?(?P<auth>authentication|api key|unauthorized)))?"
+    r"(?:(?=.*?(?P<rate_limit>rate limit)))?"
+    r"(?:(?=.*?(?P<timeout>timeout)))?"
+    r"(?:(?=.*?(?P<model_not_found>model.*?not found|not found.*?model)))?",
+    re.IGNORECASE | re.DOTALL,
+)
+
+_CONNECTION_ERROR_HINTS: dict[str, str] = {
+    "auth": "API Key 错误，请检查是否正确复制",
+    "rate_limit": "API 速率限制，请稍后再试",
+    "timeout": "连接超时，请检查网络或增加超时时间",
+    "model_not_found": "模型不存在，请检查模型名称是否正确",
+}
+
+
+def _classify_connection_error(error: BaseException) -> tuple[Optional[str], str]:
+    """
+    Map an exception to (category, user-facing hint); category is None if unknown.
+    """
+    match = _CONNECTION_ERROR_RE.match(str(error))
+    if match is not None:
+        for category, hit in match.groupdict().items():
+            if hit is not None:
+                return category, _CONNECTION_ERROR_HINTS[category]
+    return None, ""
+
+
+# 最近连接测试成功的配置 -> 过期时间（time.monotonic）。
+# 只缓存成功结果：失败后用户修好网络/Key 再测，应当真正发请求。
+_CONNECTION_TEST_TTL_SECONDS = 300
+_CONNECTION_TEST_CACHE_SIZE = 32
+_recent_connection_tests: "OrderedDict[tuple[str, ...], float]" = OrderedDict()
+_recent_connection_tests_lock = threading.Lock()
+
+
+def _connection_test_key(config: "AIConfig") -> tuple[str, ...]:
+    api_key_digest = hashlib.blake2b(
+        config.api_key.encode("utf-8"), digest_size=16
+    ).hexdigest()
+    return (
+        config.provider,
+        config.litellm_model_name(),
+        config.base_url,
+        api_key_digest,
+    )
+
+
+def _connection_recently_verified(key: tuple[str, ...]) -> bool:
+    now = time.monotonic()
+    with _recent_connection_tests_lock:
+        expires_at = _recent_connection_tests.get(key)
+        if expires_at is None:
+            return False
+        if now >= expires_at:
+            del _recent_connection_tests[key]
+            return False
+        _recent_connection_tests.move_to_end(key)
+        return True
+
+
+def _remember_connection_verified(key: tuple[str, ...]) -> None:
+    with _recent_connection_tests_lock:
+        _recent_connection_tests[key] = time.monotonic() + _CONNECTION_TEST_TTL_SECONDS
+        _recent_connection_tests.move_to_end(key)
+        while len(_recent_connection_tests) > _CONNECTION_TEST_CACHE_SIZE:
+            _recent_connection_tests.popitem(last=False)
+
+
+def _forget_connection_tests() -> None:
+    with _recent_connection_tests_lock:
+        _recent_connection_tests.clear()
+
+
+# 数值型配置项及其默认值（只读）。AIConfig 的校验、读取与持久化都按此表遍历，
+# AIConfig / AIConfigManager 的 DEFAULT_* 常量也由此派生。
+_INT_FIELD_DEFAULTS: Mapping[str, int] = MappingProxyType(
+    {
+        "timeout": 600,
+        "max_retries": 3,
+        "retry_interval": 2,
+        "rpm": 0,  # 0 = 不做客户端限流
+        "tpm": 0,
+        "max_output_tokens": 0,  # 0 = 不传 max_tokens，由服务端按模型默认决定
+    }
+)
+
+
 @dataclass(frozen=True, slots=True)
 class AIConfig:
     """
@@ -48,9 +168,14 @@ class AIConfig:
     - Validation rules mirror UI/service expectations to fail fast on bad inputs.
     """
 
-    DEFAULT_TIMEOUT: ClassVar[int] = 600
-    DEFAULT_MAX_RETRIES: ClassVar[int] = 3
-    DEFAULT_RETRY_INTERVAL: ClassVar[int] = 2
+    DEFAULT_TIMEOUT: ClassVar[int] = _INT_FIELD_DEFAULTS["timeout"]
+    DEFAULT_MAX_RETRIES: ClassVar[int] = _INT_FIELD_DEFAULTS["max_retries"]
+    DEFAULT_RETRY_INTERVAL: ClassVar[int] = _INT_FIELD_DEFAULTS["retry_interval"]
+    DEFAULT_RPM: ClassVar[int] = _INT_FIELD_DEFAULTS["rpm"]
+    DEFAULT_TPM: ClassVar[int] = _INT_FIELD_DEFAULTS["tpm"]
+    DEFAULT_MAX_OUTPUT_TOKENS: ClassVar[int] = _INT_FIELD_DEFAULTS["max_output_tokens"]
+    MAX_TIMEOUT: ClassVar[int] = 1800
+    MAX_MAX_RETRIES: ClassVar[int] = 10
 
     provider: str
     model: str
@@ -59,6 +184,11 @@ class AIConfig:
     timeout: int = DEFAULT_TIMEOUT
     max_retries: int = DEFAULT_MAX_RETRIES
     retry_interval: int = DEFAULT_RETRY_INTERVAL
+    rpm: int = DEFAULT_RPM
+    tpm: int = DEFAULT_TPM
+    max_output_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS
+    # Provider-prefixed model name for litellm, computed once in __post_init__.
+    _litellm_model: str = field(init=False, repr=False, compare=False, default="")
 
     def __post_init__(self) -> None:
         provider = _norm_str(self.provider)
@@ -66,9 +196,12 @@ class AIConfig:
         api_key = _norm_str(self.api_key)
         base_url = _norm_str(self.base_url)
 
-        timeout = _coerce_int(self.timeout, self.DEFAULT_TIMEOUT)
-        max_retries = _coerce_int(self.max_retries, self.DEFAULT_MAX_RETRIES)
-        retry_interval = _coerce_int(self.retry_interval, self.DEFAULT_RETRY_INTERVAL)
+        ints = {
+            name: _coerce_int(getattr(self, name), default)
+            for name, default in _INT_FIELD_DEFAULTS.items()
+        }
+        timeout = ints["timeout"]
+        max_retries = ints["max_retries"]
 
         if not provider:
             raise ValueError("AI 提供商不能为空")
@@ -81,16 +214,30 @@ class AIConfig:
             raise ValueError("超时时间不能小于 10 秒")
         if max_retries < 0:
             raise ValueError("最大重试次数不能为负数")
-        if retry_interval < 1:
+        # 上限只在 UI 输入时拒绝；旧 config.yaml 里更大的值按上限截断，避免配置整体不可用。
+        # 这里不记日志（每次加载都会构造 AIConfig），由 load_config_strict 提示一次。
+        ints["timeout"] = min(timeout, self.MAX_TIMEOUT)
+        ints["max_retries"] = min(max_retries, self.MAX_MAX_RETRIES)
+        if ints["retry_interval"] < 1:
             raise ValueError("重试间隔不能小于 1 秒")
+        if ints["rpm"] < 0:
+            raise ValueError("每分钟请求数上限不能为负数")
+        if ints["tpm"] < 0:
+            raise ValueError("每分钟 Token 数上限不能为负数")
+        if ints["max_output_tokens"] < 0:
+            raise ValueError("最大输出 Token 数不能为负数")
 
         object.__setattr__(self, "provider", provider)
         object.__setattr__(self, "model", model)
         object.__setattr__(self, "api_key", api_key)
         object.__setattr__(self, "base_url", base_url)
-        object.__setattr__(self, "timeout", timeout)
-        object.__setattr__(self, "max_retries", max_retries)
-        object.__setattr__(self, "retry_interval", retry_interval)
+        for name, value in ints.items():
+            object.__setattr__(self, name, value)
+        object.__setattr__(
+            self,
+            "_litellm_model",
+            ensure_litellm_model_prefix(provider, model) or model,
+        )
 
     @classmethod
     def from_section_strict(
@@ -108,27 +255,18 @@ class AIConfig:
                 "检测到 AI API Key 以明文存储于 config.yaml。请删除配置后重新设置。"
             )
 
-        api_key = SecretBox.decrypt(api_key_enc, aad=api_key_aad)
-
-        timeout = _coerce_int(
-            section.get("timeout", cls.DEFAULT_TIMEOUT), cls.DEFAULT_TIMEOUT
-        )
-        max_retries = _coerce_int(
-            section.get("max_retries", cls.DEFAULT_MAX_RETRIES), cls.DEFAULT_MAX_RETRIES
-        )
-        retry_interval = _coerce_int(
-            section.get("retry_interval", cls.DEFAULT_RETRY_INTERVAL),
-            cls.DEFAULT_RETRY_INTERVAL,
-        )
+        api_key = decrypt_cached(api_key_enc, aad=api_key_aad)
 
+        # 数值字段原样传入，由 __post_init__ 统一做类型转换与校验
         return cls(
             provider=provider,
             model=model,
             api_key=api_key,
             base_url=_norm_str(section.get("base_url", "")),
-            timeout=timeout,
-            max_retries=max_retries,
-            retry_interval=retry_interval,
+            **{
+                name: section.get(name, default)
+                for name, default in _INT_FIELD_DEFAULTS.items()
+            },
         )
 
     def to_persisted_section(self, *, api_key_aad: str) -> dict[str, Any]:
@@ -139,16 +277,16 @@ class AIConfig:
             "model": self.model,
             "api_key": encrypted_api_key,
             "base_url": self.base_url,
-            "timeout": self.timeout,
-            "max_retries": self.max_retries,
-            "retry_interval": self.retry_interval,
+            **{name: getattr(self, name) for name in _INT_FIELD_DEFAULTS},
         }
 
     def litellm_model_name(self) -> str:
         """
         Build the correct model name for litellm (explicit provider prefix when needed).
+
+        The prefixed name is precomputed at construction time.
         """
-        return ensure_litellm_model_prefix(self.provider, self.model) or self.model
+        return self._litellm_model
 
     def to_litellm_completion_kwargs(
         self,
@@ -195,6 +333,9 @@ class AIConfigManager:
       timeout: 600
       max_retries: 3
       retry_interval: 2
+      rpm: 0   # 每分钟请求数上限（0 = 不限）
+      tpm: 0   # 每分钟 token 数上限（0 = 不限）
+      max_output_tokens: 0   # 输出 token 上限（0 = 按模型上限）
     """
 
     SECTION = "ai"
@@ -204,6 +345,9 @@ class AIConfigManager:
     DEFAULT_TIMEOUT = AIConfig.DEFAULT_TIMEOUT
     DEFAULT_MAX_RETRIES = AIConfig.DEFAULT_MAX_RETRIES
     DEFAULT_RETRY_INTERVAL = AIConfig.DEFAULT_RETRY_INTERVAL
+    DEFAULT_RPM = AIConfig.DEFAULT_RPM
+    DEFAULT_TPM = AIConfig.DEFAULT_TPM
+    DEFAULT_MAX_OUTPUT_TOKENS = AIConfig.DEFAULT_MAX_OUTPUT_TOKENS
 
     def __init__(self, config_manager: Optional[ConfigManager] = None):
         self._config_manager = config_manager or get_config_manager()
@@ -218,11 +362,13 @@ class AIConfigManager:
         if not isinstance(ai_config, dict):
             return False
 
-        provider = _norm_str(ai_config.get("provider", ""))
-        model = _norm_str(ai_config.get("model", ""))
-        api_key = _norm_str(ai_config.get("api_key"))
-
-        return bool(provider) and bool(model) and bool(api_key)
+        return all(
+            (
+                _norm_str(ai_config.get("provider")),
+                _norm_str(ai_config.get("model")),
+                _norm_str(ai_config.get("api_key")),
+            )
+        )
 
     def save_config(self, config: AIConfig) -> None:
         """
@@ -236,6 +382,8 @@ class AIConfigManager:
         """
         ai_config = config.to_persisted_section(api_key_aad=self._API_KEY_AAD)
         self._config_manager.set_section(self.SECTION, ai_config)
+        clear_decrypt_cache()
+        _forget_connection_tests()
         logger.info(f"AI 配置已保存：{config.provider} / {config.model}")
 
     def load_config_strict(self) -> AIConfig:
@@ -251,7 +399,9 @@ class AIConfigManager:
         if not isinstance(ai_config, dict):
             raise ValueError("未找到 AI 配置")
 
-        return AIConfig.from_section_strict(ai_config, api_key_aad=self._API_KEY_AAD)
+        config = AIConfig.from_section_strict(ai_config, api_key_aad=self._API_KEY_AAD)
+        _warn_clamped_limits_once(ai_config, config)
+        return config
 
     def load_config(self) -> Optional[AIConfig]:
         """
@@ -273,13 +423,16 @@ class AIConfigManager:
         Returns:
             是否删除成功
         """
+        clear_decrypt_cache()
+        _forget_connection_tests()
         return self._config_manager.delete_section(self.SECTION)
 
     def test_connection(self, config: AIConfig) -> Tuple[bool, str]:
         """
         测试 AI 连接
 
-        发送一个简单的 prompt 验证配置是否正确
+        发送一个简单的 prompt 验证配置是否正确。
+        同一配置（provider/model/base_url/API Key）5 分钟内测试成功过则不再重复请求。
 
         Args:
             config: 解密态配置对象（内存中包含明文 api_key）
@@ -287,9 +440,18 @@ class AIConfigManager:
         Returns:
             (是否成功, 消息)
         """
+        cache_key = _connection_test_key(config)
+        if _connection_recently_verified(cache_key):
+            return True, "连接成功！（5 分钟内已验证过相同配置）"
+
         try:
             import litellm
 
+            from financemailparser.infrastructure.ai.http_client import (
+                install_shared_http_client,
+            )
+
+            install_shared_http_client()
             # 构建请求参数（限制 token 数量以节省成本）
             kwargs = config.to_litellm_completion_kwargs(
                 messages=[{"role": "user", "content": "Hello"}],
@@ -300,30 +462,12 @@ class AIConfigManager:
             litellm.completion(**kwargs)
 
             logger.info("AI 连接测试成功")
+            _remember_connection_verified(cache_key)
             return True, "连接成功！"
 
         except Exception as e:
-            error_msg = str(e).lower()
-
-            # 根据不同的错误类型返回友好的提示
-            if (
-                "authentication" in error_msg
-                or "api key" in error_msg
-                or "unauthorized" in error_msg
-            ):
-                return False, f"API Key 错误，请检查是否正确复制\n\n详细错误：{str(e)}"
-            elif "rate limit" in error_msg:
-                return False, f"API 速率限制，请稍后再试\n\n详细错误：{str(e)}"
-            elif "timeout" in error_msg:
-                return (
-                    False,
-                    f"连接超时，请检查网络或增加超时时间\n\n详细错误：{str(e)}",
-                )
-            elif "not found" in error_msg and "model" in error_msg:
-                return (
-                    False,
-                    f"模型不存在，请检查模型名称是否正确\n\n详细错误：{str(e)}",
-                )
-            else:
+            category, hint = _classify_connection_error(e)
+            if category is None:
                 logger.error(f"测试连接时出错: {str(e)}", exc_info=True)
                 return False, f"连接失败：{str(e)}"
+            return False, f"{hint}\n\n详细错误：{str(e)}"
@@ -0,0 +1,56 @@
+"""
+litellm 的共享 HTTP 客户端
+
+litellm 的同步 OpenAI 兼容调用使用进程级的 `litellm.client_session`。本模块是项目中
+唯一设置它的地方：AIService 与 AIConfigManager.test_connection 在调用 litellm 前都先调用
+`install_shared_http_client()`，行为不依赖模块的导入顺序。
+"""
+
+from __future__ import annotations
+
+import os
+from functools import cache
+from typing import Any
+
+from financemailparser.infrastructure.ai.config import AIConfig
+from financemailparser.shared.constants import AI_HTTP2_ENV
+
+_HTTP_MAX_CONNECTIONS = 32
+_HTTP_MAX_KEEPALIVE_CONNECTIONS = 16
+
+
+def http2_enabled() -> bool:
+    return os.getenv(AI_HTTP2_ENV, "").strip().lower() in {"1", "true", "yes"}
+
+
+def build_shared_http_client() -> Any:
+    """
+    构建供 litellm 同步调用复用的 keep-alive 连接池（httpx.Client）。
+
+    HTTP/2 仅在设置了 FINANCEMAILPARSER_AI_HTTP2 时启用（需安装 h2）。客户端超时只是
+    兜底，单次请求的超时仍由 litellm 按 AIConfig.timeout 传入。
+    不共享异步连接池：httpx.AsyncClient 的连接绑定在创建它的事件循环上。
+    """
+    import httpx
+
+    return httpx.Client(
+        http2=http2_enabled(),
+        timeout=httpx.Timeout(float(AIConfig.MAX_TIMEOUT)),
+        limits=httpx.Limits(
+            max_connections=_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+    )
+
+
+@cache
+def install_shared_http_client() -> None:
+    """
+    把共享连接池设为 `litellm.client_session`（每个进程只设置一次）。
+
+    不覆盖调用方已设置的 client_session。
+    """
+    import litellm
+
+    if litellm.client_session is None:
+        litellm.client_session = build_shared_http_client()
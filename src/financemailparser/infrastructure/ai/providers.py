@@ -32,6 +32,11 @@ AI_PROVIDERS_WITH_PREFIX: set[str] = {
     AI_PROVIDER_AZURE,
 }
 
+# "{provider}/" prefix per provider, precomputed so callers do a single dict lookup.
+_PROVIDER_PREFIXES: dict[str, str] = {
+    provider: f"{provider}/" for provider in AI_PROVIDERS_WITH_PREFIX
+}
+
 
 def ensure_litellm_model_prefix(provider: str | None, model: str | None) -> str | None:
     """
@@ -49,11 +54,9 @@ def ensure_litellm_model_prefix(provider: str | None, model: str | None) -> str
     if not model:
         return model
 
-    provider = str(provider or "").strip()
-    if provider in AI_PROVIDERS_WITH_PREFIX:
-        prefix = f"{provider}/"
-        if not model.startswith(prefix):
-            return f"{prefix}{model}"
+    prefix = _PROVIDER_PREFIXES.get(str(provider or "").strip())
+    if prefix and not model.startswith(prefix):
+        return f"{prefix}{model}"
     return model
 
 
@@ -70,9 +73,7 @@ def strip_litellm_model_prefix(provider: str | None, model: str | None) -> str |
     if not model:
         return model
 
-    provider = str(provider or "").strip()
-    if provider in AI_PROVIDERS_WITH_PREFIX:
-        prefix = f"{provider}/"
-        if model.startswith(prefix):
-            return model[len(prefix) :]
+    prefix = _PROVIDER_PREFIXES.get(str(provider or "").strip())
+    if prefix and model.startswith(prefix):
+        return model[len(prefix) :]
     return model
@@ -0,0 +1,94 @@
+"""
+客户端限流（RPM + TPM）
+
+在请求发出前主动等待，而不是等服务端返回 RateLimitError 后再退避重试。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Callable
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter for requests-per-minute and tokens-per-minute.
+
+    Each bucket refills continuously up to one minute's budget. `reserve()` deducts
+    immediately (a bucket may go negative) and returns how long the caller must
+    wait, so concurrent callers queue up in arrival order instead of racing.
+    A limit of 0 disables that dimension.
+    """
+
+    def __init__(
+        self,
+        rpm: int = 0,
+        tpm: int = 0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._rpm = max(int(rpm), 0)
+        self._tpm = max(int(tpm), 0)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._requests_available = float(self._rpm)
+        self._tokens_available = float(self._tpm)
+        self._last_refill = clock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._rpm or self._tpm)
+
+    @property
+    def limits_tokens(self) -> bool:
+        return bool(self._tpm)
+
+    def reserve(self, tokens: int = 0) -> float:
+        """
+        Reserve capacity for one request of `tokens` tokens.
+
+        Returns:
+            Seconds the caller should wait before sending the request.
+        """
+        if not self.enabled:
+            return 0.0
+
+        with self._lock:
+            now = self._clock()
+            elapsed = max(now - self._last_refill, 0.0)
+            self._last_refill = now
+
+            wait = 0.0
+            if self._rpm:
+                self._requests_available = min(
+                    float(self._rpm),
+                    self._requests_available + elapsed * self._rpm / 60.0,
+                )
+                self._requests_available -= 1.0
+                if self._requests_available < 0:
+                    wait = max(wait, -self._requests_available * 60.0 / self._rpm)
+            if self._tpm:
+                # A single request larger than the whole budget waits at most one window.
+                cost = float(min(max(int(tokens), 0), self._tpm))
+                self._tokens_available = min(
+                    float(self._tpm),
+                    self._tokens_available + elapsed * self._tpm / 60.0,
+                )
+                self._tokens_available -= cost
+                if self._tokens_available < 0:
+                    wait = max(wait, -self._tokens_available * 60.0 / self._tpm)
+            return wait
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Block the current thread until the request may be sent."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int = 0) -> None:
+        """Async counterpart of `acquire` (does not block the event loop)."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
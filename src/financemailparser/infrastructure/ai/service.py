@@ -6,28 +6,182 @@ AI 服务层
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
 import time
-from dataclasses import dataclass
-from typing import Callable, Optional
+from dataclasses import dataclass, replace
+from functools import cache, lru_cache
+from types import ModuleType, SimpleNamespace
+from typing import Any, Callable, Iterable, Optional, Sequence
 
-import litellm
 from tenacity import (
-    retry,
+    AsyncRetrying,
+    Retrying,
     stop_after_attempt,
     wait_random_exponential,
     retry_if_exception_type,
     RetryCallState,
 )
 
-from financemailparser.infrastructure.ai.config import AIConfigManager
+from financemailparser.infrastructure.ai.config import AIConfig, AIConfigManager
+from financemailparser.infrastructure.ai.http_client import install_shared_http_client
+from financemailparser.infrastructure.ai.rate_limit import RateLimiter
+
+_orjson: Optional[ModuleType]
+try:  # 可选加速：orjson 解析多 KB 的 JSON 响应比标准库快数倍
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    _orjson = None
 
 logger = logging.getLogger(__name__)
 
+OnRetryCallback = Callable[[int, str], None]
+
+# 响应中没有 usage 时的占位值
+_ZERO_USAGE = SimpleNamespace(prompt_tokens=0, completion_tokens=0, total_tokens=0)
+
+
+@cache
+def _litellm() -> ModuleType:
+    """
+    Import litellm on first use.
+
+    litellm is slow to import and pulls in many provider SDKs; deferring it keeps
+    pages and scripts that never call the AI from paying that cost.
+    """
+    import litellm
+
+    return litellm
+
+
+def _completion_attempt(
+    kwargs: dict[str, Any], _on_retry: OnRetryCallback | None
+) -> Any:
+    """
+    Single litellm call executed under a shared `Retrying` controller.
+
+    `_on_retry` is passed positionally only so `before_sleep` can read the
+    per-call callback from `retry_state.args`.
+    """
+    install_shared_http_client()
+    return _litellm().completion(**kwargs)
+
+
+async def _acompletion_attempt(
+    kwargs: dict[str, Any], _on_retry: OnRetryCallback | None
+) -> Any:
+    """Async counterpart of `_completion_attempt` (litellm.acompletion)."""
+    return await _litellm().acompletion(**kwargs)
+
+
+# 单次请求合并的 prompt 数默认值：合并过多会拉长单次延迟、增加解析失败的影响面
+DEFAULT_PROMPT_BATCH_SIZE = 8
+
+_BATCH_PROMPT_HEADER = (
+    "You will receive {n} independent items, each starting with a line "
+    '"### ITEM <number>". Handle every item on its own, exactly as if it had '
+    "been sent alone.\n"
+    'Reply with ONLY a JSON object of the form {{"results": [...]}} where '
+    '"results" holds exactly {n} strings: the answer to each item, in item order.'
+)
+
+
+def _retries_so_far(retrying: Retrying | AsyncRetrying) -> int:
+    """
+    Retries performed by the most recent call of `retrying` in this thread.
+
+    tenacity keeps `statistics` per thread, so this is safe for a controller
+    shared across threads as long as it is read right after the call returns.
+    """
+    return max(int(retrying.statistics.get("attempt_number", 1)) - 1, 0)
+
+
+# 输入估算超出上下文窗口该倍数才在本地判定失败（token_counter 的估算并不精确）。
+_CONTEXT_OVERFLOW_MARGIN = 1.1
+
+
+@lru_cache(maxsize=32)
+def _model_token_limits(model: str) -> tuple[Optional[int], Optional[int]]:
+    """
+    (max_input_tokens, max_output_tokens) from litellm's model map; None if unknown.
+    """
+    try:
+        info = _litellm().get_model_info(model)
+    except Exception:
+        return None, None
+    return (
+        int(info.get("max_input_tokens") or 0) or None,
+        int(info.get("max_output_tokens") or 0) or None,
+    )
+
+
+@lru_cache(maxsize=32)
+def _supports_json_response(model: str) -> bool:
+    try:
+        params = _litellm().get_supported_openai_params(model=model) or []
+    except Exception:
+        return False
+    return "response_format" in params
+
+
+def _build_batched_prompt(prompts: Sequence[str]) -> str:
+    parts = [_BATCH_PROMPT_HEADER.format(n=len(prompts))]
+    for i, prompt in enumerate(prompts, start=1):
+        parts.append(f"### ITEM {i}\n{prompt}")
+    return "\n\n".join(parts)
+
+
+def _loads_json_response(content: Optional[str]) -> Any:
+    """
+    Parse a JSON model response (orjson when installed, stdlib json otherwise).
+
+    Raises:
+        ValueError: response is not valid JSON (both decoders raise a ValueError subclass)
+    """
+    text = (content or "").strip()
+    if text.startswith("```"):
+        # Tolerate models that wrap JSON in a markdown code fence.
+        text = text.strip("`").removeprefix("json").strip()
+    if _orjson is not None:
+        return _orjson.loads(text)
+    return json.loads(text)
+
+
+def _parse_batched_response(content: Optional[str], expected: int) -> list[str]:
+    """
+    Parse `{"results": [...]}` (or a bare JSON array) into `expected` answers.
 
-@dataclass
+    Raises:
+        ValueError: response is not valid JSON or the item count does not match
+    """
+    data = _loads_json_response(content)
+    if isinstance(data, dict):
+        data = data.get("results")
+    if not isinstance(data, list) or len(data) != expected:
+        got = len(data) if isinstance(data, list) else "非数组"
+        raise ValueError(f"批量响应条目数不匹配：期望 {expected}，实际 {got}")
+    return [
+        item if isinstance(item, str) else json.dumps(item, ensure_ascii=False)
+        for item in data
+    ]
+
+
+def _distribute(total: int, weights: Sequence[int]) -> list[int]:
+    """Split `total` across items proportionally to `weights` (sums to `total`)."""
+    weight_sum = sum(weights)
+    if weight_sum <= 0:
+        weights = [1] * len(weights)
+        weight_sum = len(weights)
+    shares = [total * w // weight_sum for w in weights]
+    if shares:
+        shares[-1] += total - sum(shares)
+    return shares
+
+
+@dataclass(frozen=True, slots=True)
 class CallStats:
-    """AI 调用统计信息"""
+    """AI 调用统计信息（不可变；批量场景下数量可能很多，使用 slots 节省内存）"""
 
     success: bool  # 是否成功
     response: Optional[str]  # AI 返回内容
@@ -40,6 +194,38 @@ class CallStats:
     total_tokens: int = 0  # 总 token 数
 
 
+def summarize_usage(results: Iterable[CallStats]) -> tuple[int, int, int]:
+    """
+    汇总多次调用的 token 用量
+
+    Returns:
+        (prompt_tokens, completion_tokens, total_tokens) 之和
+    """
+    prompt_sum = completion_sum = total_sum = 0
+    for stats in results:
+        prompt_sum += stats.prompt_tokens
+        completion_sum += stats.completion_tokens
+        total_sum += stats.total_tokens
+    return prompt_sum, completion_sum, total_sum
+
+
+def _log_batch_usage(label: str, results: Sequence[CallStats]) -> None:
+    prompt_sum, completion_sum, total_sum = summarize_usage(results)
+    logger.info(
+        f"{label}完成：{sum(r.success for r in results)}/{len(results)} 成功，"
+        f"输入 {prompt_sum} tokens，输出 {completion_sum} tokens，共 {total_sum} tokens"
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class _RequestContext:
+    """Request pieces derived from one AIConfig, reused until the config changes."""
+
+    config: AIConfig
+    # litellm kwargs without `messages` (model/api_key/timeout/base_url...)
+    base_kwargs: dict[str, Any]
+
+
 class AIService:
     """
     AI 服务
@@ -55,13 +241,191 @@ class AIService:
             config_manager: AI 配置管理器
         """
         self.config_manager = config_manager
-        self._retry_count = 0  # 用于跟踪重试次数
+        # 按 (max_retries, retry_interval) 缓存重试控制器，避免每次调用重建
+        self._retrying_cache: dict[tuple[int, int], Retrying] = {}
+        # 按 (rpm, tpm) 缓存限流器；同一配置下所有调用共享同一个令牌桶
+        self._rate_limiters: dict[tuple[int, int], RateLimiter] = {}
+        # 最近一次配置对应的请求上下文；配置不变时每次调用只需拼装 messages
+        self._request_ctx: Optional[_RequestContext] = None
+
+    def _get_retrying(self, max_retries: int, retry_interval: int) -> Retrying:
+        key = (max_retries, retry_interval)
+        retrying = self._retrying_cache.get(key)
+        if retrying is None:
+            retrying = Retrying(
+                stop=stop_after_attempt(max_retries + 1),  # +1 因为第一次不算重试
+                wait=wait_random_exponential(
+                    multiplier=retry_interval,
+                    min=retry_interval,
+                    max=60,
+                ),
+                retry=retry_if_exception_type(Exception),
+                reraise=True,
+                before_sleep=self._log_retry,
+            )
+            self._retrying_cache[key] = retrying
+        return retrying
+
+    def _get_rate_limiter(self, config: AIConfig) -> RateLimiter:
+        key = (config.rpm, config.tpm)
+        limiter = self._rate_limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(rpm=config.rpm, tpm=config.tpm)
+            self._rate_limiters[key] = limiter
+        return limiter
+
+    @staticmethod
+    def _estimate_input_tokens(
+        config: AIConfig, kwargs: dict[str, Any]
+    ) -> Optional[int]:
+        try:
+            return int(
+                _litellm().token_counter(
+                    model=config.litellm_model_name(), messages=kwargs["messages"]
+                )
+            )
+        except Exception:
+            logger.debug("估算输入 token 失败", exc_info=True)
+            return None
+
+    def _prepare_call(
+        self, config: AIConfig, kwargs: dict[str, Any]
+    ) -> tuple[RateLimiter, int]:
+        """
+        发请求前的预检：用户配置了输出上限时写入 kwargs["max_tokens"]，
+        并在输入明显超出模型上下文时直接失败，避免白白消耗一次网络往返。
+
+        token_counter 的估算与服务端计数可能有出入，因此只有超出上下文窗口
+        _CONTEXT_OVERFLOW_MARGIN 倍时才判定失败；临界情况交给服务端裁决。
+
+        Returns:
+            (限流器, 估算的输入 token 数)
+
+        Raises:
+            ValueError: 输入（加上输出上限）明显超出模型上下文窗口
+        """
+        limiter = self._get_rate_limiter(config)
+        context_limit, model_output_limit = _model_token_limits(
+            config.litellm_model_name()
+        )
+
+        input_tokens: Optional[int] = None
+        if context_limit is not None or limiter.limits_tokens:
+            input_tokens = self._estimate_input_tokens(config, kwargs)
+
+        explicit_limit = config.max_output_tokens
+        if context_limit is not None and input_tokens is not None:
+            needed = input_tokens + explicit_limit
+            if needed > context_limit * _CONTEXT_OVERFLOW_MARGIN:
+                detail = f"输入约 {input_tokens} tokens"
+                if explicit_limit:
+                    detail += f" + 输出上限 {explicit_limit} tokens"
+                raise ValueError(
+                    f"{detail}，超出模型上下文窗口 {context_limit} tokens，"
+                    "请缩减输入内容或调低输出上限"
+                )
+
+        # 未配置（0）时不传 max_tokens，由服务端按模型默认决定输出长度。
+        if explicit_limit:
+            if model_output_limit is not None:
+                explicit_limit = min(explicit_limit, model_output_limit)
+            kwargs["max_tokens"] = int(explicit_limit)
+        return limiter, input_tokens or 0
+
+    def _build_async_retrying(
+        self, max_retries: int, retry_interval: int
+    ) -> AsyncRetrying:
+        # AsyncRetrying keeps its iteration state per thread, so concurrent tasks
+        # on one event loop must not share an instance: build one per call.
+        return AsyncRetrying(
+            stop=stop_after_attempt(max_retries + 1),
+            wait=wait_random_exponential(
+                multiplier=retry_interval,
+                min=retry_interval,
+                max=60,
+            ),
+            retry=retry_if_exception_type(Exception),
+            reraise=True,
+            before_sleep=self._log_retry,
+        )
+
+    def _build_request(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        *,
+        json_response: bool = False,
+    ) -> tuple[AIConfig, dict[str, Any]]:
+        config = self.config_manager.load_config_strict()
+
+        ctx = self._request_ctx
+        if ctx is None or ctx.config != config:
+            base_kwargs = config.to_litellm_completion_kwargs(messages=[])
+            base_kwargs.pop("messages", None)
+            ctx = _RequestContext(config=config, base_kwargs=base_kwargs)
+            self._request_ctx = ctx
+
+        # 构建消息
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        kwargs = {**ctx.base_kwargs, "messages": messages}
+        if json_response and _supports_json_response(config.litellm_model_name()):
+            kwargs["response_format"] = {"type": "json_object"}
+        return config, kwargs
+
+    @staticmethod
+    def _success_stats(
+        config: AIConfig, response: Any, start_time: float, retry_count: int
+    ) -> CallStats:
+        # 提取响应内容
+        content = response.choices[0].message.content
+
+        # 提取 usage 信息（缺失时按 0 计）
+        usage = getattr(response, "usage", None) or _ZERO_USAGE
+        prompt_tokens = usage.prompt_tokens
+        completion_tokens = usage.completion_tokens
+        total_tokens = usage.total_tokens
+
+        total_time = time.time() - start_time
+
+        logger.info(
+            f"AI 调用成功：{config.provider}/{config.model}，"
+            f"耗时 {total_time:.2f}s，"
+            f"重试 {retry_count} 次，"
+            f"tokens {total_tokens}"
+        )
+
+        return CallStats(
+            success=True,
+            response=content,
+            total_time=total_time,
+            retry_count=retry_count,
+            error_message=None,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=total_tokens,
+        )
+
+    @staticmethod
+    def _failure_stats(
+        error: BaseException, start_time: float, retry_count: int
+    ) -> CallStats:
+        return CallStats(
+            success=False,
+            response=None,
+            total_time=time.time() - start_time,
+            retry_count=retry_count,
+            error_message=str(error),
+        )
 
     def call_completion(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
-        on_retry: Callable[[int, str], None] | None = None,
+        on_retry: OnRetryCallback | None = None,
     ) -> CallStats:
         """
         调用 AI 完成任务
@@ -74,117 +438,215 @@ class AIService:
         Returns:
             CallStats: 调用统计信息
         """
+        return self._complete(prompt, system_prompt, on_retry)
+
+    def _complete(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        on_retry: OnRetryCallback | None,
+        *,
+        json_response: bool = False,
+    ) -> CallStats:
         start_time = time.time()
-        self._retry_count = 0
 
         try:
-            config = self.config_manager.load_config_strict()
-        except Exception as e:
-            return CallStats(
-                success=False,
-                response=None,
-                total_time=time.time() - start_time,
-                retry_count=0,
-                error_message=str(e),
+            config, kwargs = self._build_request(
+                prompt, system_prompt, json_response=json_response
             )
+            limiter, tokens = self._prepare_call(config, kwargs)
+        except Exception as e:
+            return self._failure_stats(e, start_time, 0)
 
-        provider = config.provider
-        model = config.model
-        max_retries = config.max_retries
-        retry_interval = config.retry_interval
-
-        # 构建消息
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
+        retrying = self._get_retrying(config.max_retries, config.retry_interval)
 
         try:
-            kwargs = config.to_litellm_completion_kwargs(messages=messages)
-        except Exception as e:
-            return CallStats(
-                success=False,
-                response=None,
-                total_time=time.time() - start_time,
-                retry_count=0,
-                error_message=str(e),
+            # 发请求前先按 RPM/TPM 限流，避免触发服务端 RateLimitError 后再退避
+            limiter.acquire(tokens)
+            # 调用 AI（带重试）
+            response = retrying(_completion_attempt, kwargs, on_retry)
+            return self._success_stats(
+                config, response, start_time, _retries_so_far(retrying)
             )
+        except Exception as e:
+            logger.error(f"AI 调用失败：{str(e)}", exc_info=True)
+            return self._failure_stats(e, start_time, _retries_so_far(retrying))
 
-        # 定义重试装饰器
-        @retry(
-            stop=stop_after_attempt(max_retries + 1),  # +1 因为第一次不算重试
-            wait=wait_random_exponential(
-                multiplier=retry_interval,
-                min=retry_interval,
-                max=60,
-            ),
-            retry=retry_if_exception_type(Exception),
-            reraise=True,
-            before_sleep=lambda retry_state: self._log_retry(retry_state, on_retry),
-        )
-        def _call_with_retry():
-            return litellm.completion(**kwargs)
+    def call_completion_json(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        on_retry: OnRetryCallback | None = None,
+    ) -> tuple[CallStats, Any]:
+        """
+        调用 AI 并将响应解析为 JSON（模型支持时请求 JSON 模式输出）
 
+        Returns:
+            (CallStats, 解析后的对象)；调用失败或响应不是合法 JSON 时对象为 None，
+            且 CallStats.success 为 False
+        """
+        stats = self._complete(prompt, system_prompt, on_retry, json_response=True)
+        if not stats.success:
+            return stats, None
         try:
-            # 调用 AI（带重试）
-            response = _call_with_retry()
-
-            # 提取响应内容
-            content = response.choices[0].message.content
+            return stats, _loads_json_response(stats.response)
+        except ValueError as e:
+            return (
+                replace(
+                    stats, success=False, error_message=f"JSON 响应解析失败：{str(e)}"
+                ),
+                None,
+            )
 
-            # 提取 usage 信息
-            usage = response.usage if hasattr(response, "usage") else None
-            prompt_tokens = usage.prompt_tokens if usage else 0
-            completion_tokens = usage.completion_tokens if usage else 0
-            total_tokens = usage.total_tokens if usage else 0
+    def call_completion_batched(
+        self,
+        prompts: Sequence[str],
+        system_prompt: Optional[str] = None,
+        batch_size: int = DEFAULT_PROMPT_BATCH_SIZE,
+        on_retry: OnRetryCallback | None = None,
+    ) -> list[CallStats]:
+        """
+        将多个相互独立的小 prompt 合并进同一次请求，减少请求数（适合受 RPM 限制的场景）
 
-            total_time = time.time() - start_time
+        每 `batch_size` 个 prompt 合并为一次请求，要求模型返回 JSON 数组，再拆回逐条结果。
+        Token 用量按各条 prompt / 回答的长度比例分摊；整批失败或解析失败时，
+        该批所有条目都标记为失败。
 
-            logger.info(
-                f"AI 调用成功：{provider}/{model}，"
-                f"耗时 {total_time:.2f}s，"
-                f"重试 {self._retry_count} 次，"
-                f"tokens {total_tokens}"
+        Returns:
+            与 prompts 一一对应的 CallStats 列表
+        """
+        size = max(1, int(batch_size))
+        results: list[CallStats] = []
+        for offset in range(0, len(prompts), size):
+            chunk = list(prompts[offset : offset + size])
+            batch_stats = self._complete(
+                _build_batched_prompt(chunk),
+                system_prompt,
+                on_retry,
+                json_response=True,
             )
-
-            return CallStats(
+            results.extend(self._split_batch_stats(batch_stats, chunk))
+        _log_batch_usage("批量合并调用", results)
+        return results
+
+    @staticmethod
+    def _split_batch_stats(batch: CallStats, prompts: list[str]) -> list[CallStats]:
+        n = len(prompts)
+        per_item_time = batch.total_time / n
+        answers: list[str] | None = None
+        error_message = batch.error_message
+        if batch.success:
+            try:
+                answers = _parse_batched_response(batch.response, n)
+            except ValueError as e:  # json.JSONDecodeError is a ValueError
+                error_message = f"批量响应解析失败：{str(e)}"
+
+        if answers is None:
+            return [
+                CallStats(
+                    success=False,
+                    response=None,
+                    total_time=per_item_time,
+                    retry_count=batch.retry_count,
+                    error_message=error_message,
+                )
+                for _ in prompts
+            ]
+
+        prompt_tokens = _distribute(batch.prompt_tokens, [len(p) for p in prompts])
+        completion_tokens = _distribute(
+            batch.completion_tokens, [len(a) for a in answers]
+        )
+        return [
+            CallStats(
                 success=True,
-                response=content,
-                total_time=total_time,
-                retry_count=self._retry_count,
+                response=answer,
+                total_time=per_item_time,
+                retry_count=batch.retry_count,
                 error_message=None,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                total_tokens=total_tokens,
+                prompt_tokens=p_tokens,
+                completion_tokens=c_tokens,
+                total_tokens=p_tokens + c_tokens,
+            )
+            for answer, p_tokens, c_tokens in zip(
+                answers, prompt_tokens, completion_tokens
             )
+        ]
+
+    async def acall_completion(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        on_retry: OnRetryCallback | None = None,
+    ) -> CallStats:
+        """
+        异步调用 AI（litellm.acompletion），语义与 `call_completion` 一致
+
+        适合在事件循环中并发发起多个请求（见 `batch_completion`）。
+        """
+        start_time = time.time()
 
+        try:
+            config, kwargs = self._build_request(prompt, system_prompt)
+            limiter, tokens = self._prepare_call(config, kwargs)
         except Exception as e:
-            total_time = time.time() - start_time
-            error_msg = str(e)
+            return self._failure_stats(e, start_time, 0)
 
-            logger.error(f"AI 调用失败：{error_msg}", exc_info=True)
+        retrying = self._build_async_retrying(config.max_retries, config.retry_interval)
 
-            return CallStats(
-                success=False,
-                response=None,
-                total_time=total_time,
-                retry_count=self._retry_count,
-                error_message=error_msg,
+        try:
+            await limiter.acquire_async(tokens)
+            response: Any = await retrying(_acompletion_attempt, kwargs, on_retry)
+            return self._success_stats(
+                config, response, start_time, _retries_so_far(retrying)
             )
+        except Exception as e:
+            logger.error(f"AI 调用失败：{str(e)}", exc_info=True)
+            return self._failure_stats(e, start_time, _retries_so_far(retrying))
 
-    def _log_retry(
+    async def batch_completion(
         self,
-        retry_state: RetryCallState,
-        on_retry: Callable[[int, str], None] | None = None,
-    ) -> None:
+        prompts: Sequence[str],
+        system_prompt: Optional[str] = None,
+        max_concurrency: int = 10,
+    ) -> list[CallStats]:
+        """
+        并发调用 AI 处理多个 prompt
+
+        Args:
+            prompts: 用户 prompt 列表
+            system_prompt: 所有请求共用的系统 prompt（可选）
+            max_concurrency: 同时在途的最大请求数
+
+        Returns:
+            与 prompts 一一对应的 CallStats 列表（单个失败不影响其他结果）
+        """
+        semaphore = asyncio.Semaphore(max(1, int(max_concurrency)))
+
+        async def _run(prompt: str) -> CallStats:
+            async with semaphore:
+                return await self.acall_completion(prompt, system_prompt)
+
+        start_time = time.time()
+        results = await asyncio.gather(
+            *(_run(p) for p in prompts), return_exceptions=True
+        )
+        stats = [
+            r if isinstance(r, CallStats) else self._failure_stats(r, start_time, 0)
+            for r in results
+        ]
+        _log_batch_usage("并发批量调用", stats)
+        return stats
+
+    def _log_retry(self, retry_state: RetryCallState) -> None:
         """
         记录重试日志
 
         Args:
-            retry_state: 重试状态
-            on_retry: 可选回调
+            retry_state: 重试状态（args 为 `_completion_attempt` 的参数，第二个为可选回调）
         """
-        self._retry_count += 1
+        on_retry = retry_state.args[1] if len(retry_state.args) > 1 else None
+        # attempt_number == retries so far; per-call, so safe for concurrent async calls.
         attempt_number = retry_state.attempt_number
         exception = retry_state.outcome.exception() if retry_state.outcome else None
 
@@ -199,7 +661,7 @@ class AIService:
         exc_msg = str(exception).strip() if exception is not None else ""
         summary = f"{exc_type}: {exc_msg}" if exc_msg else exc_type
         try:
-            on_retry(self._retry_count, summary)
+            on_retry(attempt_number, summary)
         except Exception:
             # Best-effort: never let UI callback break the retry loop.
             logger.debug("on_retry callback failed", exc_info=True)
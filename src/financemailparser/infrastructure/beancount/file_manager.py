@@ -9,6 +9,7 @@ Beancount 文件管理工具（ui_plan.md 2.7.1）
 from __future__ import annotations
 
 from dataclasses import dataclass
+from operator import attrgetter
 from pathlib import Path
 import re
 from typing import Optional
@@ -79,7 +80,7 @@ def scan_beancount_files(dir: Path) -> list[BeancountFileInfo]:
             # stat 失败等情况：跳过，不中断流程
             continue
 
-    return sorted(infos, key=lambda x: x.name, reverse=True)
+    return sorted(infos, key=attrgetter("name"), reverse=True)
 
 
 def read_beancount_file(path: Path) -> Optional[str]:
@@ -4,11 +4,12 @@
 负责项目配置的 CRUD 操作，支持分层配置结构
 """
 
+import copy
 import logging
 import os
 from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 import yaml
 
@@ -52,6 +53,10 @@ class ConfigManager:
         else:
             self.config_path = config_path
 
+        # 解析结果缓存：((st_mtime_ns, st_size), config_data)。
+        # 文件未变化时直接复用，避免每次读取配置都重新解析 YAML。
+        self._cache: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
+
     # ==================== 通用配置方法 ====================
 
     def _load_all_config(self) -> Dict[str, Any]:
@@ -61,26 +66,38 @@ class ConfigManager:
         Returns:
             完整的配置字典，如果文件不存在返回空字典
 
+        Note:
+            文件 mtime/size 未变化时返回缓存结果的深拷贝（调用方可以放心修改）。
+
         Raises:
             yaml.YAMLError: YAML 文件格式错误
         """
-        if not self.config_path.exists():
+        try:
+            stat = self.config_path.stat()
+        except FileNotFoundError:
             logger.debug(f"配置文件不存在: {self.config_path}")
+            self._cache = None
             return {}
 
+        cache_key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._cache
+        if cached is not None and cached[0] == cache_key:
+            return copy.deepcopy(cached[1])
+
         try:
             with open(self.config_path, "r", encoding="utf-8") as f:
                 config_data = yaml.safe_load(f)
 
             # 允许空配置（首次使用时 config.yaml 可能为空或为 {}）
             if config_data is None:
-                return {}
+                config_data = {}
 
             if not isinstance(config_data, dict):
                 logger.warning("配置文件格式错误：不是有效的字典")
                 return {}
 
-            return config_data
+            self._cache = (cache_key, config_data)
+            return copy.deepcopy(config_data)
 
         except yaml.YAMLError as e:
             logger.error(f"YAML 文件格式错误: {str(e)}")
@@ -99,6 +116,8 @@ class ConfigManager:
         Raises:
             Exception: 保存失败
         """
+        # 无论写入成功与否都作废缓存，下次读取以磁盘内容为准
+        self._cache = None
         try:
             with open(self.config_path, "w", encoding="utf-8") as f:
                 yaml.dump(config_data, f, default_flow_style=False, allow_unicode=True)
@@ -263,7 +282,7 @@ class ConfigManager:
         获取 AI 配置
 
         Returns:
-            AI 配置字典，如果不存在返回空字典
+            AI 配置字典；不存在、文件读取或 YAML 解析失败时返回空字典（不抛异常）
         """
         ai_config = self.get_section("ai")
         if not isinstance(ai_config, dict):
@@ -13,6 +13,7 @@ import base64
 import hashlib
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
@@ -59,6 +60,16 @@ def _get_master_password_bytes() -> bytes:
     return raw.encode("utf-8")
 
 
+def master_password_fingerprint() -> str:
+    """
+    Return a SHA-256 hex digest of the current master password.
+
+    Used as a cache key component so cached plaintext is never served after the
+    master password changes. Raises MasterPasswordNotSetError when unset.
+    """
+    return hashlib.sha256(_get_master_password_bytes()).hexdigest()
+
+
 def _b64e(data: bytes) -> str:
     return base64.urlsafe_b64encode(data).decode("ascii")
 
@@ -172,3 +183,27 @@ class SecretBox:
             return plaintext_bytes.decode("utf-8")
         except Exception as e:
             raise SecretDecryptionError("解密结果不是有效的 UTF-8 字符串") from e
+
+
+@lru_cache(maxsize=8)
+def _decrypt_memo(value: str, aad: str, _master_fingerprint: str) -> str:
+    return SecretBox.decrypt(value, aad=aad)
+
+
+def decrypt_cached(value: str, *, aad: str) -> str:
+    """
+    Memoized `SecretBox.decrypt` (the scrypt KDF makes each decrypt tens of ms).
+
+    Settings pages and every AI call / download re-read the same ciphertexts, so
+    this is the one decrypt cache shared by all config managers:
+    - the master password fingerprint is part of the key, so a changed password
+      misses the cache and goes through a real decrypt (which may then fail);
+    - ciphertexts get a fresh salt/nonce on every save, so re-saved values miss too;
+    - failures are never cached because lru_cache does not store exceptions.
+    """
+    return _decrypt_memo(value, aad, master_password_fingerprint())
+
+
+def clear_decrypt_cache() -> None:
+    """Drop cached plaintexts (called after a secret is saved or deleted)."""
+    _decrypt_memo.cache_clear()
@@ -9,7 +9,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Sequence, TypedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypedDict
 import re
 
 from financemailparser.domain.beancount_constants import BEANCOUNT_TODO_TOKEN
@@ -196,6 +196,48 @@ def match_expenses_account(
     return None
 
 
+def _keywords_alternation(keywords: Sequence[str]) -> "re.Pattern[str]":
+    """把一组字面量关键词编译成单个正则（一次扫描判断是否命中任意关键词）。"""
+    return re.compile("|".join(re.escape(k) for k in keywords))
+
+
+def compile_expenses_account_matcher(
+    rules: List[Dict[str, Any]],
+) -> Callable[[str], Optional[str]]:
+    """
+    预编译规则，返回与 `match_expenses_account(description, rules)` 结果一致的函数。
+
+    批量匹配大量交易时使用：未命中任何关键词的描述只需一次正则扫描。
+    """
+    compiled: List[tuple["re.Pattern[str]", str]] = []
+    for rule in rules or []:
+        account = rule.get("account")
+        keywords = rule.get("keywords") or []
+        if not isinstance(account, str) or not isinstance(keywords, list):
+            continue
+        if keywords:
+            compiled.append(
+                (_keywords_alternation([str(k) for k in keywords]), account)
+            )
+
+    if not compiled:
+        return lambda _description: None
+
+    any_keyword = re.compile("|".join(f"(?:{p.pattern})" for p, _ in compiled))
+
+    def match(description: str) -> Optional[str]:
+        desc = str(description or "")
+        if not any_keyword.search(desc):
+            return None
+        # 命中后再按规则顺序确认（保持「第一个命中的规则生效」）。
+        for pattern, account in compiled:
+            if pattern.search(desc):
+                return account
+        return None
+
+    return match
+
+
 def _normalize_amount_ranges(
     ranges: object, *, label: str, allow_empty: bool = False
 ) -> List[AmountRange]:
@@ -340,6 +382,33 @@ def match_skip_keyword(description: str, skip_keywords: Sequence[str]) -> Option
     return None
 
 
+def compile_skip_keyword_matcher(
+    skip_keywords: Sequence[str],
+) -> Callable[[str], Optional[str]]:
+    """
+    预编译关键词，返回与 `match_skip_keyword(description, skip_keywords)` 结果一致的函数。
+
+    批量过滤大量交易时使用：未命中的描述只需一次正则扫描。
+    """
+    keywords = [str(k) for k in skip_keywords or [] if str(k)]
+    if not keywords:
+        return lambda _description: None
+
+    any_keyword = _keywords_alternation(keywords)
+
+    def match(description: str) -> Optional[str]:
+        desc = str(description or "")
+        if not any_keyword.search(desc):
+            return None
+        # 返回列表中第一个命中的关键词（与 match_skip_keyword 一致）。
+        for keyword in keywords:
+            if keyword in desc:
+                return keyword
+        return None
+
+    return match
+
+
 def amount_in_ranges(amount: float, ranges: Sequence[AmountRange]) -> bool:
     try:
         value = float(amount)
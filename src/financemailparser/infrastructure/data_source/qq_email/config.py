@@ -19,6 +19,8 @@ from financemailparser.infrastructure.config.secrets import (
     SecretBox,
     SecretError,
     is_encrypted_value,
+    clear_decrypt_cache,
+    decrypt_cached,
 )
 from financemailparser.infrastructure.data_source.qq_email.exceptions import LoginError
 from financemailparser.infrastructure.data_source.qq_email.parser import QQEmailParser
@@ -83,6 +85,7 @@ class QQEmailConfigManager:
         )
         qq_config = {"email": email.strip(), "auth_code": encrypted_auth_code}
         self._config_manager.set_value(self.SECTION, self.PROVIDER_KEY, qq_config)
+        clear_decrypt_cache()
 
     def load_config_strict(self) -> Dict[str, str]:
         """
@@ -109,7 +112,7 @@ class QQEmailConfigManager:
                 "检测到 QQ 邮箱授权码以明文存储于 config.yaml。请删除配置后重新设置。"
             )
 
-        auth_code = SecretBox.decrypt(auth_code_enc, aad=self._AUTH_CODE_AAD)
+        auth_code = decrypt_cached(auth_code_enc, aad=self._AUTH_CODE_AAD)
         return {"email": email, "auth_code": auth_code}
 
     def load_config(self) -> Optional[Dict[str, str]]:
@@ -129,6 +132,7 @@ class QQEmailConfigManager:
         """
         删除 config.yaml 中的 QQ 邮箱配置
         """
+        clear_decrypt_cache()
         return self._config_manager.delete_value(self.SECTION, self.PROVIDER_KEY)
 
     def test_connection(self, email: str, auth_code: str) -> Tuple[bool, str]:
@@ -9,9 +9,6 @@ from pathlib import Path
 from typing import List, Dict, Optional, Any, Iterable
 from urllib.parse import urlsplit
 
-import requests
-from bs4 import BeautifulSoup
-
 from financemailparser.shared.constants import (
     DATETIME_FMT_COMPACT,
     DEFAULT_DOWNLOAD_TIMEOUT_SECONDS,
@@ -20,6 +17,9 @@ from financemailparser.shared.constants import (
 from .exceptions import LoginError, ParseError
 from .utils import decode_email_header
 
+# 下载文件名只保留字母数字（含中文）、空格、-、_、. 和括号
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r"[^\w .()\-]")
+
 
 class QQEmailParser:
     def __init__(self, email_address: str, password: str):
@@ -342,6 +342,8 @@ class QQEmailParser:
                 self.logger.warning("未找到HTML内容")
                 return []
 
+            from bs4 import BeautifulSoup
+
             soup = BeautifulSoup(html_content, "lxml")
             anchors = soup.find_all("a", href=True)
             if not anchors:
@@ -422,6 +424,10 @@ class QQEmailParser:
 
         约束：只允许 https。
         """
+        # requests（含 urllib3/certifi）导入约 100ms，只有微信账单下载用到；
+        # 延迟导入，避免邮箱设置页/信用卡下载仅为连接 IMAP 而付出该成本。
+        import requests
+
         try:
             save_dir.mkdir(parents=True, exist_ok=True)
             self.logger.info("开始下载微信账单文件...")
@@ -509,11 +515,7 @@ class QQEmailParser:
                         else:
                             filename = f"微信账单_{datetime.now().strftime(DATETIME_FMT_COMPACT)}.zip"
 
-                        filename = "".join(
-                            c
-                            for c in filename
-                            if c.isalnum() or c in (" ", "-", "_", ".", "(", ")")
-                        )
+                        filename = _UNSAFE_FILENAME_CHARS_RE.sub("", filename)
                         if not filename.lower().endswith(".zip"):
                             filename = f"{filename}.zip"
 
@@ -3,6 +3,7 @@ from pathlib import Path
 from email.message import Message
 from typing import Dict, Optional
 import logging
+import re
 
 from financemailparser.shared.constants import (
     EMAIL_HTML_FILENAME,
@@ -14,6 +15,9 @@ from financemailparser.shared.constants import (
 
 logger = logging.getLogger(__name__)
 
+# 附件文件名只保留字母数字（含中文）、空格、-、_ 和 .
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r"[^\w .\-]")
+
 
 def save_email_content(
     email_folder: Path,
@@ -118,9 +122,7 @@ def _save_attachment(part: Message, email_folder: Path) -> None:
     """保存附件"""
     filename = part.get_filename()
     if filename:
-        safe_filename = "".join(
-            c for c in filename if c.isalnum() or c in (" ", "-", "_", ".")
-        )
+        safe_filename = _UNSAFE_FILENAME_CHARS_RE.sub("", filename)
         if safe_filename:
             attachments_dir = email_folder / "attachments"
             attachments_dir.mkdir(exist_ok=True)
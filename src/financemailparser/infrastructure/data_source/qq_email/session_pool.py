@@ -0,0 +1,104 @@
+"""
+QQ 邮箱 IMAP 会话复用
+
+同一进程内（例如 UI 里先下载信用卡账单、再下载支付宝/微信账单）重复的 TLS 握手 + LOGIN
+往往要几百毫秒。这里按 (服务器, 邮箱, 授权码摘要) 缓存一个已登录的 QQEmailParser，
+借出期间独占使用，归还后供下一次调用复用。
+
+连接可能在任何时候被服务端/网络断开（NAT 超时、切换网络等），因此每次复用前都先发
+NOOP 探活（一次往返，远比重新登录便宜），失效则关闭并重新登录。
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from financemailparser.shared.constants import DEFAULT_IMAP_SERVER
+
+from .parser import QQEmailParser
+
+logger = logging.getLogger(__name__)
+
+# key -> 已登录、当前空闲的 parser
+_idle_sessions: dict[tuple[str, str, str], QQEmailParser] = {}
+_idle_sessions_lock = threading.Lock()
+
+
+def _session_key(email: str, password: str) -> tuple[str, str, str]:
+    password_digest = hashlib.blake2b(
+        password.encode("utf-8"), digest_size=16
+    ).hexdigest()
+    return DEFAULT_IMAP_SERVER, email, password_digest
+
+
+def _is_alive(parser: QQEmailParser) -> bool:
+    if parser.conn is None:
+        return False
+    try:
+        status, _ = parser.conn.noop()
+    except Exception as e:
+        logger.info("复用的邮箱连接已失效，将重新登录：%s", str(e))
+        return False
+    return status == "OK"
+
+
+def _take_idle_session(key: tuple[str, str, str]) -> QQEmailParser | None:
+    with _idle_sessions_lock:
+        parser = _idle_sessions.pop(key, None)
+    if parser is None:
+        return None
+
+    if not _is_alive(parser):
+        parser.close()
+        return None
+    logger.info("复用已登录的邮箱连接")
+    return parser
+
+
+def _return_session(key: tuple[str, str, str], parser: QQEmailParser) -> None:
+    with _idle_sessions_lock:
+        displaced = _idle_sessions.get(key)
+        _idle_sessions[key] = parser
+    if displaced is not None:
+        # 并发借出时会多建一个连接；每个 key 只保留最近归还的那个。
+        displaced.close()
+
+
+@contextmanager
+def checkout_parser(email: str, password: str) -> Iterator[QQEmailParser]:
+    """
+    借出一个已登录的 QQEmailParser（必要时新建并登录）。
+
+    - 正常退出：连接归还到池中，供后续调用复用；
+    - 发生异常：连接状态不可信，直接关闭而不归还。
+
+    Raises:
+        LoginError: 新建连接时登录失败
+    """
+    key = _session_key(email, password)
+    parser = _take_idle_session(key)
+    if parser is None:
+        parser = QQEmailParser(email, password)
+        parser.login()
+
+    try:
+        yield parser
+    except BaseException:
+        parser.close()
+        raise
+    _return_session(key, parser)
+
+
+@atexit.register
+def close_pooled_sessions() -> None:
+    """关闭池中所有空闲连接（进程退出时自动调用）。"""
+    with _idle_sessions_lock:
+        pooled = list(_idle_sessions.values())
+        _idle_sessions.clear()
+    for parser in pooled:
+        parser.close()
@@ -1,7 +1,43 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import Iterator, Optional, Sequence
+
+
+def _normalize_suffixes(suffixes: Sequence[str]) -> frozenset[str]:
+    return frozenset(str(s).lower() for s in suffixes if str(s))
+
+
+def _scandir_files(
+    directory: Path | str, suffixes: frozenset[str]
+) -> Iterator[os.DirEntry[str]]:
+    """
+    Recursively yield file entries whose suffix (case-insensitive) is in `suffixes`.
+
+    与 `Path.rglob("*")` 的遍历顺序一致（先当前目录的文件，再深度优先进入子目录），
+    但直接复用 `os.scandir` 的 DirEntry 类型信息，避免每个条目额外的 is_file/stat 系统调用。
+    不跟随目录符号链接；不可读的目录/条目会被跳过。
+    """
+    subdirs: list[str] = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif (
+                        os.path.splitext(entry.name)[1].lower() in suffixes
+                        and entry.is_file()
+                    ):
+                        yield entry
+                except OSError:
+                    continue
+    except OSError:
+        return
+
+    for subdir in subdirs:
+        yield from _scandir_files(subdir, suffixes)
 
 
 def find_file_by_suffixes(directory: Path, suffixes: Sequence[str]) -> Optional[Path]:
@@ -9,16 +45,12 @@ def find_file_by_suffixes(directory: Path, suffixes: Sequence[str]) -> Optional[
     Recursively find the first file whose suffix matches any of `suffixes`
     (case-insensitive).
     """
-    normalized_suffixes = {str(s).lower() for s in suffixes if str(s)}
+    normalized_suffixes = _normalize_suffixes(suffixes)
     if not normalized_suffixes:
         return None
 
-    for item in directory.rglob("*"):
-        try:
-            if item.is_file() and item.suffix.lower() in normalized_suffixes:
-                return item
-        except OSError:
-            continue
+    for entry in _scandir_files(directory, normalized_suffixes):
+        return Path(entry.path)
     return None
 
 
@@ -29,22 +61,20 @@ def find_latest_file_by_suffixes(
     Recursively find the latest (by mtime) file whose suffix matches any of
     `suffixes` (case-insensitive).
     """
-    normalized_suffixes = {str(s).lower() for s in suffixes if str(s)}
+    normalized_suffixes = _normalize_suffixes(suffixes)
     if not normalized_suffixes:
         return None
 
-    latest: Optional[Path] = None
-    latest_mtime: Optional[float] = None
+    latest_path: Optional[str] = None
+    latest_mtime = 0.0
 
-    for item in directory.rglob("*"):
+    for entry in _scandir_files(directory, normalized_suffixes):
         try:
-            if not (item.is_file() and item.suffix.lower() in normalized_suffixes):
-                continue
-            mtime = item.stat().st_mtime
-            if latest is None or latest_mtime is None or mtime > latest_mtime:
-                latest = item
-                latest_mtime = mtime
+            mtime = entry.stat().st_mtime
         except OSError:
             continue
+        if latest_path is None or mtime > latest_mtime:
+            latest_path = entry.path
+            latest_mtime = mtime
 
-    return latest
+    return Path(latest_path) if latest_path is not None else None
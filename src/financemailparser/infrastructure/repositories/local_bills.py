@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import json
+import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
+from types import ModuleType
 from typing import Any, Callable, Optional
 
 from financemailparser.shared.constants import (
@@ -9,29 +13,52 @@ from financemailparser.shared.constants import (
     EMAIL_METADATA_FILENAME,
 )
 
+_orjson: Optional[ModuleType]
+try:  # 可选加速：首次扫描（或 metadata 变更后）解析大量 metadata.json 时更快
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    _orjson = None
+
+_NON_CREDIT_CARD_FOLDER_NAMES = frozenset({"alipay", "wechat", ".DS_Store"})
+_BILL_SENTINEL_FILENAMES = frozenset({EMAIL_METADATA_FILENAME, EMAIL_HTML_FILENAME})
+
+# 账单列表每次刷新都会读取全部 metadata.json；文件未变（mtime/大小相同）时复用上次解析结果。
+_METADATA_CACHE_SIZE = 4096
+_metadata_cache: "OrderedDict[str, tuple[int, int, dict[str, Any]]]" = OrderedDict()
+_metadata_cache_lock = threading.Lock()
+
+
+def _has_bill_sentinel_files(folder: str) -> bool:
+    """一次 scandir 判断目录下是否同时存在元数据与 HTML 文件（代替两次 exists()）。"""
+    missing = set(_BILL_SENTINEL_FILENAMES)
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                missing.discard(entry.name)
+                if not missing:
+                    return True
+    except OSError:
+        return False
+    return False
+
 
 def scan_credit_card_bill_folders(
     *,
     emails_dir: Path,
 ) -> list[Path]:
-    if not emails_dir.exists():
+    try:
+        with os.scandir(emails_dir) as it:
+            candidates = [
+                entry
+                for entry in it
+                if entry.name not in _NON_CREDIT_CARD_FOLDER_NAMES and entry.is_dir()
+            ]
+    except OSError:
         return []
 
-    folders: list[Path] = []
-    for folder in emails_dir.iterdir():
-        if not folder.is_dir():
-            continue
-        if folder.name in ("alipay", "wechat", ".DS_Store"):
-            continue
-
-        metadata_path = folder / EMAIL_METADATA_FILENAME
-        html_path = folder / EMAIL_HTML_FILENAME
-        if not metadata_path.exists() or not html_path.exists():
-            continue
-
-        folders.append(folder)
-
-    return folders
+    return [
+        Path(entry.path) for entry in candidates if _has_bill_sentinel_files(entry.path)
+    ]
 
 
 def read_bill_metadata_json(
@@ -39,8 +66,25 @@ def read_bill_metadata_json(
     metadata_path: Path,
     on_warning: Optional[Callable[[str], None]] = None,
 ) -> Optional[dict[str, Any]]:
+    key = os.fspath(metadata_path)
     try:
-        return json.loads(metadata_path.read_text(encoding="utf-8"))
+        st = os.stat(key)
+        with _metadata_cache_lock:
+            cached = _metadata_cache.get(key)
+            if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+                _metadata_cache.move_to_end(key)
+                # 返回副本，避免调用方修改缓存内容。
+                return dict(cached[2])
+
+        raw = metadata_path.read_bytes()
+        metadata = _orjson.loads(raw) if _orjson is not None else json.loads(raw)
+        if isinstance(metadata, dict):
+            with _metadata_cache_lock:
+                _metadata_cache[key] = (st.st_mtime_ns, st.st_size, dict(metadata))
+                _metadata_cache.move_to_end(key)
+                while len(_metadata_cache) > _METADATA_CACHE_SIZE:
+                    _metadata_cache.popitem(last=False)
+        return metadata
     except Exception as e:
         if on_warning:
             on_warning(f"读取账单元数据失败：{metadata_path}（{str(e)}）")
@@ -53,7 +97,8 @@ def read_bill_html_text(
     on_warning: Optional[Callable[[str], None]] = None,
 ) -> Optional[str]:
     try:
-        return html_path.read_text(encoding="utf-8")
+        # 只用于原样展示：跳过文本模式的换行转换（邮件 HTML 多为 CRLF，多 MB 时转换开销明显）。
+        return html_path.read_bytes().decode("utf-8")
     except Exception as e:
         if on_warning:
             on_warning(f"读取账单 HTML 失败：{html_path}（{str(e)}）")
@@ -65,6 +65,9 @@ TRANSACTIONS_CSV = get_path_from_env(
     "FINANCEMAILPARSER_TRANSACTIONS_CSV", PROJECT_ROOT / "transactions.csv"
 )
 
+# AI 请求是否启用 HTTP/2（需安装 h2；值为 1/true/yes 时启用，默认关闭）
+AI_HTTP2_ENV = "FINANCEMAILPARSER_AI_HTTP2"
+
 # ==================== 内部约定字符串（跨模块共享） ====================
 
 # 邮件落盘文件名（emails/ 下每个账单目录的标准文件名）
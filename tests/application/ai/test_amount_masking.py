@@ -1,5 +1,10 @@
+import re
+
+import pytest
+
 from financemailparser.application.ai.amount_masking import (
     AmountMasker,
+    _find_amount,
     restore_beancount_amounts,
 )
 
@@ -60,3 +65,48 @@ def test_masks_scientific_notation_when_lexer_marks_exponent_error():
 
     restored, _rep = restore_beancount_amounts(masked, masker.mapping)
     assert restored == text
+
+
+def test_mask_amounts_for_ai_process_matches_per_file_masking():
+    from financemailparser.application.ai.process_beancount import (
+        mask_amounts_for_ai_process,
+    )
+
+    latest = '2026-01-05 * "A"\n  Expenses:TODO  35.00 CNY\n  Assets:Cash'
+    references = [
+        ("a.bean", '2025-12-01 * "B"\n  Expenses:Food  32.00 CNY\n'),
+        ("empty.bean", ""),
+        ("c.bean", '2025-12-03 * "C"\n  Expenses:Taxi  -1,021.30 USD\n\n'),
+    ]
+
+    result = mask_amounts_for_ai_process(
+        run_id="r", latest_content=latest, reference_files=references
+    )
+
+    expected = AmountMasker(run_id="r")
+    assert result.masked_latest_content == expected.mask_text(latest)
+    assert result.masked_reference_files == [
+        (name, expected.mask_text(content)) for name, content in references
+    ]
+    assert result.mapping == expected.mapping
+    assert result.stats.tokens_total == 3
+
+
+@pytest.mark.parametrize(
+    ("line", "number", "currency", "start"),
+    [
+        ("  Expenses:Food  -12.34 USD\n", "12.34", "USD", 0),
+        ("  A  12.34USD 12.34  USD\n", "12.34", "USD", 0),
+        ("  A  1 EUR @ 1 USD\n", "1", "USD", 0),
+        ("  A  1 USD @ 1 USD\n", "1", "USD", 7),
+        ("  A  112.5\tCNY\n", "12.5", "CNY", 0),
+        ("  A  12.5 CN\n", "12.5", "CNY", 0),
+    ],
+)
+def test_find_amount_matches_regex_search(line, number, currency, start):
+    pattern = re.compile(re.escape(number) + r"\s+" + re.escape(currency))
+    match = pattern.search(line, pos=start)
+
+    assert _find_amount(line, number, currency, start) == (
+        match.start() if match else -1
+    )
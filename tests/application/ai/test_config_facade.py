@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+import pytest
+
+import financemailparser.infrastructure.ai.config as ai_config_module
+from financemailparser.application.ai import config_facade
+from financemailparser.infrastructure.config import config_manager as cm
+from financemailparser.infrastructure.config.config_manager import get_config_manager
+from financemailparser.infrastructure.config.secrets import (
+    MASTER_PASSWORD_ENV,
+    SecretBox,
+    clear_decrypt_cache,
+)
+
+
+@pytest.fixture
+def config_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "config.yaml"
+    monkeypatch.setattr(cm, "CONFIG_FILE", path)
+    monkeypatch.setenv(MASTER_PASSWORD_ENV, "pw-1")
+    get_config_manager.cache_clear()
+    return path
+
+
+def _save(api_key: str) -> None:
+    result = config_facade.save_ai_config_from_ui(
+        provider="openai",
+        model="gpt-4o",
+        api_key_input=api_key,
+        api_key_masked_placeholder="",
+        base_url="",
+        timeout=60,
+        max_retries=1,
+        retry_interval=1,
+    )
+    assert result.ok, result.message
+
+
+def test_snapshot_rerenders_do_not_decrypt_again(
+    config_file: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _save("sk-test-123456")
+    calls = {"n": 0}
+    real_decrypt = SecretBox.decrypt
+
+    def counting_decrypt(value: str, *, aad: str | None = None) -> str:
+        calls["n"] += 1
+        return real_decrypt(value, aad=aad)
+
+    monkeypatch.setattr(ai_config_module.SecretBox, "decrypt", counting_decrypt)
+
+    first = config_facade.get_ai_config_ui_snapshot()
+    second = config_facade.get_ai_config_ui_snapshot()
+
+    assert first == second
+    assert first.state == "ok"
+    assert calls["n"] == 1
+
+
+def test_ai_config_manager_follows_global_config_manager(config_file: Path) -> None:
+    first = config_facade._ai_config_manager()
+    assert config_facade._ai_config_manager() is first
+
+    get_config_manager.cache_clear()
+    assert config_facade._ai_config_manager() is not first
+
+
+def test_snapshot_reflects_saved_key_after_resave(config_file: Path) -> None:
+    _save("sk-first-aaaa")
+    assert config_facade.get_ai_config_ui_snapshot().api_key_masked.endswith("aaaa")
+
+    _save("sk-second-bbbb")
+    assert config_facade.get_ai_config_ui_snapshot().api_key_masked.endswith("bbbb")
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, 7),
+        ("", 7),
+        (0, 7),
+        (True, 7),
+        (30, 30),
+        (" 45 ", 45),
+        ("-3", -3),
+        ("abc", 7),
+        ("²", 7),
+        (12.9, 12),
+        (float("inf"), 7),
+        ([1], 7),
+    ],
+)
+def test_int_or_default(value: object, expected: int) -> None:
+    assert config_facade._int_or_default(value, 7) == expected
+
+
+def test_snapshot_keeps_valid_numeric_fields_when_one_is_invalid(
+    config_file: Path,
+) -> None:
+    config_file.write_text(
+        "ai:\n  timeout: abc\n  max_retries: 5\n  rpm: '60'\n", encoding="utf-8"
+    )
+
+    snapshot = config_facade.get_ai_config_ui_snapshot()
+
+    assert snapshot.timeout_default == config_facade.AIConfigManager.DEFAULT_TIMEOUT
+    assert snapshot.max_retries_default == 5
+    assert snapshot.rpm_default == 60
+
+
+def test_estimate_prompt_tokens_uses_unprefixed_model(
+    config_file: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _save("sk-test-123456")
+    seen: list[str] = []
+
+    def fake_counter(*, model: str, messages: list[dict[str, str]]) -> int:
+        seen.append(model)
+        return len(messages[0]["content"])
+
+    monkeypatch.setattr(config_facade, "_litellm_token_counter", lambda: fake_counter)
+
+    assert config_facade.estimate_prompt_tokens_from_ui("hello") == 5
+    assert seen == ["gpt-4o"]
+
+
+def test_estimate_prompt_tokens_returns_none_without_config(
+    config_file: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    with caplog.at_level(logging.ERROR):
+        assert config_facade.estimate_prompt_tokens_from_ui("hello") is None
+
+    assert caplog.records == []
+
+
+def test_snapshot_falls_back_to_defaults_for_unparsable_config(
+    config_file: Path,
+) -> None:
+    config_file.write_text("ai: [unclosed\n", encoding="utf-8")
+
+    snapshot = config_facade.get_ai_config_ui_snapshot()
+
+    assert snapshot.state == "not_present"
+    assert snapshot.provider_default == "openai"
+    assert snapshot.timeout_default == config_facade.AIConfigManager.DEFAULT_TIMEOUT
+
+
+def test_snapshot_is_slotted_and_picklable(config_file: Path) -> None:
+    import pickle
+
+    snapshot = config_facade.get_ai_config_ui_snapshot()
+
+    assert not hasattr(snapshot, "__dict__")
+    assert pickle.loads(pickle.dumps(snapshot)) == snapshot
+
+
+def test_save_with_new_key_does_not_decrypt_saved_key(
+    config_file: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _save("sk-first-aaaa")
+    clear_decrypt_cache()
+    calls = {"n": 0}
+
+    def counting_decrypt(value: str, *, aad: str | None = None) -> str:
+        calls["n"] += 1
+        return ""
+
+    monkeypatch.setattr(ai_config_module.SecretBox, "decrypt", counting_decrypt)
+    result = config_facade.save_ai_config_from_ui(
+        provider="openai",
+        model="gpt-4o",
+        api_key_input="sk-second-bbbb",
+        api_key_masked_placeholder="sk-f****aaaa",
+        base_url="",
+        timeout=60,
+        max_retries=1,
+        retry_interval=1,
+    )
+
+    assert result.ok
+    assert calls["n"] == 0
+
+
+def test_save_with_placeholder_keeps_saved_key(config_file: Path) -> None:
+    _save("sk-first-aaaa")
+    placeholder = config_facade.get_ai_config_ui_snapshot().api_key_masked
+
+    result = config_facade.save_ai_config_from_ui(
+        provider="openai",
+        model="gpt-4o-mini",
+        api_key_input=placeholder,
+        api_key_masked_placeholder=placeholder,
+        base_url="",
+        timeout=60,
+        max_retries=1,
+        retry_interval=1,
+    )
+
+    assert result.ok
+    snapshot = config_facade.get_ai_config_ui_snapshot()
+    assert snapshot.model == "gpt-4o-mini"
+    assert snapshot.api_key_masked == placeholder
+
+
+@pytest.mark.parametrize(
+    ("value", "default", "expected"),
+    [
+        ("  gemini ", "openai", "gemini"),
+        ("   ", "openai", "openai"),
+        (None, "openai", "openai"),
+        (None, "", ""),
+        (42, "", "42"),
+    ],
+)
+def test_str_or_default(value: object, default: str, expected: str) -> None:
+    assert config_facade._str_or_default(value, default) == expected
+
+
+def test_saved_out_of_range_limits_load_clamped_but_ui_input_is_rejected(
+    config_file: Path,
+) -> None:
+    _save("sk-test-123456")
+    mgr = get_config_manager()
+    mgr.set_value("ai", "timeout", 3600)
+    mgr.set_value("ai", "max_retries", 20)
+
+    snapshot = config_facade.get_ai_config_ui_snapshot()
+    assert snapshot.state == "ok"
+    assert snapshot.timeout_default == config_facade.AIConfig.MAX_TIMEOUT
+    assert snapshot.max_retries_default == config_facade.AIConfig.MAX_MAX_RETRIES
+
+    result = config_facade.save_ai_config_from_ui(
+        provider="openai",
+        model="gpt-4o",
+        api_key_input=snapshot.api_key_masked,
+        api_key_masked_placeholder=snapshot.api_key_masked,
+        base_url="",
+        timeout=3600,
+        max_retries=1,
+        retry_interval=1,
+    )
+    assert result.ok is False
+    assert "超时时间不能大于" in result.message
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from financemailparser.application.ai import process_beancount as pb
+from financemailparser.application.ai.process_beancount import (
+    prepare_ai_process_prompts,
+)
+from financemailparser.application.ai.prompt_builder_v2 import build_smart_ai_prompt
+
+_LATEST = (
+    '2026-01-05 * "星巴克 咖啡"\n'
+    "  Liabilities:CreditCard:CMB  -35.00 CNY\n"
+    "  Expenses:TODO  35.00 CNY\n"
+    "\n"
+    '2026-01-06 * "滴滴 出行"\n'
+    "  Liabilities:CreditCard:CMB  -18.50 CNY\n"
+    "  Expenses:TODO  18.50 CNY\n"
+)
+
+_REFERENCE = (
+    '2025-12-01 * "星巴克 咖啡 拿铁"\n'
+    "  Liabilities:CreditCard:CMB  -32.00 CNY\n"
+    "  Expenses:Food:Coffee  32.00 CNY\n"
+    "\n"
+    '2025-12-03 * "滴滴 快车"\n'
+    "  Liabilities:CreditCard:CMB  -21.30 CNY\n"
+    "  Expenses:Transport:Taxi  21.30 CNY\n"
+)
+
+
+@pytest.fixture(autouse=True)
+def _empty_prompt_cache() -> None:
+    pb._prompt_cache.clear()
+
+
+def _prepare(tmp_path: Path, **overrides: Any) -> pb.PromptPreparationResult:
+    kwargs: dict[str, Any] = dict(
+        latest_name="latest.bean",
+        latest_content=_LATEST,
+        latest_fingerprint="fp-latest",
+        reference_files=[("ref.bean", _REFERENCE)],
+        reference_fingerprints=["fp-ref"],
+        examples_per_transaction=2,
+        account_definition_content=None,
+        extra_prompt=None,
+        persist_map=False,
+        mask_map_dir=tmp_path,
+    )
+    kwargs.update(overrides)
+    return prepare_ai_process_prompts(**kwargs)
+
+
+def _count_prompt_builds(monkeypatch: pytest.MonkeyPatch) -> dict[str, int]:
+    calls = {"n": 0}
+    real_build = pb.build_smart_ai_prompt
+
+    def counting_build(**kwargs: Any) -> Any:
+        calls["n"] += 1
+        return real_build(**kwargs)
+
+    monkeypatch.setattr(pb, "build_smart_ai_prompt", counting_build)
+    return calls
+
+
+def test_prompt_real_matches_prompt_built_from_raw_content(tmp_path: Path) -> None:
+    prep = prepare_ai_process_prompts(
+        latest_name="latest.bean",
+        latest_content=_LATEST,
+        latest_fingerprint="fp-latest",
+        reference_files=[("ref.bean", _REFERENCE)],
+        reference_fingerprints=["fp-ref"],
+        examples_per_transaction=2,
+        account_definition_content=None,
+        extra_prompt="  优先使用已有账户  ",
+        persist_map=False,
+        mask_map_dir=tmp_path,
+    )
+
+    expected_real, expected_stats = build_smart_ai_prompt(
+        latest_file_name="latest.bean",
+        latest_file_content=_LATEST,
+        reference_files=[("ref.bean", _REFERENCE)],
+        examples_per_transaction=2,
+        extra_prompt="优先使用已有账户",
+    )
+
+    assert "35.00" not in prep.prompt_masked
+    assert prep.prompt_real == expected_real
+    assert prep.prompt_stats_v2 == expected_stats
+
+
+def test_unchanged_inputs_reuse_prepared_prompts(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls = _count_prompt_builds(monkeypatch)
+
+    first = _prepare(tmp_path)
+    second = _prepare(tmp_path)
+    assert calls["n"] == 1
+    assert second == first
+
+    _prepare(tmp_path, latest_fingerprint="fp-latest-2")
+    _prepare(tmp_path, examples_per_transaction=3)
+    assert calls["n"] == 3
+
+
+def test_cached_result_is_isolated_from_caller_mutation(tmp_path: Path) -> None:
+    first = _prepare(tmp_path)
+    first.amount_masking["mapping"].clear()
+
+    assert _prepare(tmp_path).amount_masking["mapping"]
+
+
+def test_deleted_mask_map_is_persisted_again(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls = _count_prompt_builds(monkeypatch)
+
+    saved_path = _prepare(tmp_path, persist_map=True).amount_masking["saved_path"]
+    assert saved_path is not None
+    Path(saved_path).unlink()
+
+    again = _prepare(tmp_path, persist_map=True)
+    assert calls["n"] == 2
+    assert again.amount_masking["saved_path"] == saved_path
+    assert Path(saved_path).is_file()
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_persist_mask_map_json_writes_readable_utf8_atomically(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, use_orjson: bool
+) -> None:
+    if not use_orjson:
+        monkeypatch.setattr(pb, "_orjson", None)
+    mapping = {"__AMT_r_000001__": "1,234.50", "__AMT_r_000002__": "金额"}
+
+    result = pb.persist_mask_map_json(
+        run_id="r", mapping=mapping, mask_map_dir=tmp_path
+    )
+
+    assert result.error_message is None
+    saved = Path(result.saved_path or "")
+    assert saved.read_text(encoding="utf-8") == json.dumps(
+        {"run_id": "r", "mapping": mapping}, ensure_ascii=False, indent=2
+    )
+    assert [p.name for p in tmp_path.iterdir()] == ["r.json"]
+
+
+def test_persist_mask_map_json_reports_write_errors(tmp_path: Path) -> None:
+    not_a_dir = tmp_path / "file"
+    not_a_dir.write_text("x", encoding="utf-8")
+
+    result = pb.persist_mask_map_json(
+        run_id="r", mapping={"k": "v"}, mask_map_dir=not_a_dir
+    )
+
+    assert result.saved_path is None
+    assert result.error_message
+
+
+def test_run_id_is_stable_short_hex_and_ignores_reference_order() -> None:
+    run_id = pb.compute_ai_process_run_id(
+        latest_name="latest.bean",
+        latest_fingerprint="fp",
+        reference_fingerprints=["b", "a"],
+    )
+
+    assert len(run_id) == 10
+    assert int(run_id, 16) >= 0
+    assert run_id == pb.compute_ai_process_run_id(
+        latest_name="latest.bean",
+        latest_fingerprint="fp",
+        reference_fingerprints=["a", "b"],
+    )
+    assert run_id != pb.compute_ai_process_run_id(
+        latest_name="latest.bea",
+        latest_fingerprint="nfp",
+        reference_fingerprints=["a", "b"],
+    )
+
+
+def test_restore_amounts_accepts_session_state_mapping(tmp_path: Path) -> None:
+    prep = _prepare(tmp_path)
+
+    restored, _report = pb.restore_amounts_and_reconcile_accounts(
+        amount_masking=prep.amount_masking,
+        masked_ai_response=prep.masked_latest_content,
+        original_beancount_text=_LATEST,
+    )
+
+    assert restored == _LATEST
+
+
+@pytest.mark.parametrize("mapping", [None, ["x"], {1: "x"}, {"k": 2}])
+def test_restore_amounts_rejects_malformed_mapping(mapping: Any) -> None:
+    with pytest.raises(ValueError, match="脱敏映射"):
+        pb.restore_amounts_and_reconcile_accounts(
+            amount_masking={
+                "run_id": "r",
+                "tokens_total": 1,
+                "mapping": mapping,
+                "saved_path": None,
+            },
+            masked_ai_response="",
+            original_beancount_text="",
+        )
+
+
+def test_prompt_without_amounts_shares_masked_prompt(tmp_path: Path) -> None:
+    no_amounts = '2026-01-05 open Assets:Cash\n2026-01-05 * "X"\n  Expenses:TODO\n'
+
+    prep = _prepare(
+        tmp_path,
+        latest_content=no_amounts,
+        reference_files=[],
+        reference_fingerprints=[],
+        persist_map=True,
+    )
+
+    assert prep.amount_masking["tokens_total"] == 0
+    assert prep.amount_masking["saved_path"] is None
+    assert prep.prompt_real is prep.prompt_masked
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from financemailparser.application.ai.transaction_matcher import TransactionMatcher
+from financemailparser.infrastructure.beancount.validator import BeancountTransaction
+
+
+def _txn(description: str, account: str) -> BeancountTransaction:
+    return BeancountTransaction(
+        header_line_index=0,
+        date="2024-01-01",
+        description=description,
+        amounts=("-10.00", "10.00"),
+        accounts=("Liabilities:CreditCard", account),
+    )
+
+
+def test_importing_process_beancount_does_not_import_sklearn() -> None:
+    src_dir = Path(__file__).resolve().parents[3] / "src"
+    code = (
+        "import sys\n"
+        "import financemailparser.application.ai.process_beancount\n"
+        "print('sklearn' in sys.modules)\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": str(src_dir)},
+    )
+    assert out.stdout.strip() == "False"
+
+
+def test_find_similar_transactions_ranks_closest_history_first() -> None:
+    target = _txn("星巴克 咖啡", "Expenses:TODO")
+    history = [
+        _txn("滴滴 出行", "Expenses:Transport"),
+        _txn("星巴克 咖啡 拿铁", "Expenses:Food:Coffee"),
+    ]
+
+    (result,) = TransactionMatcher(top_k=1).find_similar_transactions([target], history)
+
+    assert result.similar_transactions == [history[1]]
+    assert result.similarity_scores[0] > 0
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import financemailparser.application.billing.bill_queries as bq
+from financemailparser.shared.constants import (
+    EMAIL_HTML_FILENAME,
+    EMAIL_METADATA_FILENAME,
+)
+
+
+def _write_bill(emails_dir: Path, folder_name: str, subject: str) -> None:
+    folder = emails_dir / folder_name
+    folder.mkdir(parents=True)
+    (folder / EMAIL_METADATA_FILENAME).write_text(
+        json.dumps({"subject": subject, "size": 12}), encoding="utf-8"
+    )
+    (folder / EMAIL_HTML_FILENAME).write_text("<html></html>", encoding="utf-8")
+
+
+@pytest.fixture
+def alias_rules(monkeypatch: pytest.MonkeyPatch) -> dict[str, Any]:
+    rules: dict[str, Any] = {
+        "CMB": {"display_name": "招商银行", "aliases": ["招商银行"]},
+        "CCB": {"display_name": "建设银行", "aliases": ["建设银行", "CCB"]},
+    }
+    monkeypatch.setattr(bq, "get_bank_alias_keywords", lambda: rules)
+    monkeypatch.setattr(bq, "_bank_alias_tables", None)
+    return rules
+
+
+@pytest.mark.usefixtures("alias_rules")
+def test_scan_credit_card_bills_resolves_banks_and_sorts_newest_first(
+    tmp_path: Path,
+) -> None:
+    _write_bill(tmp_path, "20260105_cmb", "招商银行信用卡电子账单")
+    _write_bill(tmp_path, "20260210_ccb", "中国建设银行信用卡对账单")
+    _write_bill(tmp_path, "20251230_other", "某银行账单")
+
+    bills = bq.scan_credit_card_bills(emails_dir=tmp_path)
+
+    assert [(b.folder_name, b.bank) for b in bills] == [
+        ("20260210_ccb", "建设银行"),
+        ("20260105_cmb", "招商银行"),
+        ("20251230_other", "其他银行"),
+    ]
+    assert bills[0].size == 12
+
+
+@pytest.mark.usefixtures("alias_rules")
+def test_bank_alias_tables_are_rebuilt_only_when_rules_reload(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    first = bq._load_bank_alias_tables()
+    assert bq._load_bank_alias_tables()[0] is first[0]
+
+    reloaded = {"ABC": {"display_name": "农业银行", "aliases": ["农业银行"]}}
+    monkeypatch.setattr(bq, "get_bank_alias_keywords", lambda: reloaded)
+
+    match_bank_code, display_names = bq._load_bank_alias_tables()
+    assert match_bank_code("中国农业银行账单") == "ABC"
+    assert match_bank_code("招商银行账单") is None
+    assert display_names == {"ABC": "农业银行"}
+
+
+@pytest.mark.usefixtures("alias_rules")
+def test_scan_credit_card_bills_warns_on_invalid_folder_date(
+    tmp_path: Path,
+) -> None:
+    _write_bill(tmp_path, "20260132_cmb", "招商银行信用卡电子账单")
+    _write_bill(tmp_path, "2026O105_cmb", "招商银行信用卡电子账单")
+    _write_bill(tmp_path, "20260229_cmb", "招商银行信用卡电子账单")
+    _write_bill(tmp_path, "20240229_cmb", "招商银行信用卡电子账单")
+    warnings: list[str] = []
+
+    bills = bq.scan_credit_card_bills(emails_dir=tmp_path, on_warning=warnings.append)
+
+    assert [b.folder_name for b in bills] == ["20240229_cmb"]
+    assert len(warnings) == 3
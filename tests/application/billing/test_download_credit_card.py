@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from financemailparser.application.billing.download_credit_card import (
+    _normalize_subject_keywords,
+    _subject_contains_any_keyword,
+)
+
+
+def test_subject_keyword_match_is_case_insensitive_and_ignores_blanks() -> None:
+    keywords = _normalize_subject_keywords([" Statement ", "", "  ", "信用卡"])
+
+    assert keywords == ("statement", "信用卡")
+    assert _subject_contains_any_keyword("Your STATEMENT is ready", keywords)
+    assert _subject_contains_any_keyword("招商银行信用卡电子账单", keywords)
+    assert not _subject_contains_any_keyword("Weekly newsletter", keywords)
+    assert not _subject_contains_any_keyword("anything", ())
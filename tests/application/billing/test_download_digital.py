@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+import financemailparser.application.billing.download_digital as dd
+import financemailparser.infrastructure.data_source.qq_email.session_pool as pool
+from financemailparser.domain.models.digital_bill_status import (
+    DIGITAL_BILL_STATUS_EXTRACTED_EXISTING_ZIP,
+    DIGITAL_BILL_STATUS_FAILED_EXTRACT_EXISTING_ZIP,
+    DIGITAL_BILL_STATUS_MISSING_PASSWORD,
+)
+
+
+class _FakeParser:
+    extracted: list[str] = []
+    conn = None
+
+    def __init__(self, _email: str, _password: str) -> None:
+        pass
+
+    def login(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+    def extract_zip_file(
+        self, zip_path: str, extract_dir: Path, password: Optional[str] = None
+    ) -> bool:
+        _FakeParser.extracted.append(threading.current_thread().name)
+        if password == "bad":
+            return False
+        suffix = ".xlsx" if "wechat" in zip_path else ".csv"
+        (extract_dir / f"bill{suffix}").write_text("x", encoding="utf-8")
+        return True
+
+
+class _FakeConfigManager:
+    def get_email_config(self) -> tuple[str, str]:
+        return "me@qq.com", "secret"
+
+
+@pytest.fixture
+def email_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    _FakeParser.extracted = []
+    monkeypatch.setattr(dd, "create_storage_structure", lambda: tmp_path)
+    monkeypatch.setattr(dd, "QQEmailConfigManager", _FakeConfigManager)
+    monkeypatch.setattr(pool, "QQEmailParser", _FakeParser)
+    pool.close_pooled_sessions()
+    for bill_type in ("alipay", "wechat"):
+        (tmp_path / bill_type).mkdir()
+        (tmp_path / bill_type / f"{bill_type}.zip").write_bytes(b"zip")
+    return tmp_path
+
+
+def test_existing_zips_are_extracted_without_downloading(email_dir: Path) -> None:
+    result = dd.download_digital_payment_emails(alipay_pwd="a", wechat_pwd="bad")
+
+    assert result["alipay_status"] == DIGITAL_BILL_STATUS_EXTRACTED_EXISTING_ZIP
+    assert result["alipay_csv"] == str(email_dir / "alipay" / "alipay" / "bill.csv")
+    assert result["wechat_status"] == DIGITAL_BILL_STATUS_FAILED_EXTRACT_EXISTING_ZIP
+    assert result["wechat_csv"] is None
+    assert len(_FakeParser.extracted) == 2
+    assert threading.current_thread().name not in _FakeParser.extracted
+
+
+def test_existing_zip_without_password_is_skipped(email_dir: Path) -> None:
+    result = dd.download_digital_payment_emails(alipay_pwd="a")
+
+    assert result["alipay_status"] == DIGITAL_BILL_STATUS_EXTRACTED_EXISTING_ZIP
+    assert result["wechat_status"] == DIGITAL_BILL_STATUS_MISSING_PASSWORD
+    assert len(_FakeParser.extracted) == 1
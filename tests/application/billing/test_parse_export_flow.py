@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 from datetime import datetime
 from pathlib import Path
 
@@ -8,6 +9,10 @@ import pytest
 from financemailparser.application.billing import parse_export as mod
 from financemailparser.application.billing.parse_export import ParsedBillsResult
 from financemailparser.domain.models.source import TransactionSource
+from financemailparser.shared.constants import (
+    EMAIL_HTML_FILENAME,
+    EMAIL_METADATA_FILENAME,
+)
 from financemailparser.domain.models.txn import DigitalPaymentTransaction, Transaction
 from financemailparser.application.billing.transactions_postprocess import (
     TransactionFilterStats,
@@ -288,3 +293,96 @@ def test_parse_downloaded_bills_to_beancount_sorts_transactions_when_dedup_enabl
 
     assert result["beancount_text"] == "BEAN"
     assert captured_dates == ["2026-01-01", "2026-01-02"]
+
+
+def _stub_parse_statement_email(
+    folder: Path, *_a: object, **_kw: object
+) -> list[Transaction]:
+    logging.getLogger("stub_parser").info("parsed %s", folder.name)
+    source = (
+        TransactionSource.ALIPAY if folder.name == "alipay" else TransactionSource.CCB
+    )
+    return [_txn("2026-01-05", folder.name, 1.0, source)]
+
+
+def test_parse_all_bills_keeps_folder_order_sequentially(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    emails_dir = tmp_path / "emails"
+    for name in ("c", "a", "b", "d"):
+        (emails_dir / name).mkdir(parents=True)
+        (emails_dir / name / EMAIL_METADATA_FILENAME).write_text("{}", "utf-8")
+        (emails_dir / name / EMAIL_HTML_FILENAME).write_text("", "utf-8")
+    (emails_dir / "alipay").mkdir()
+
+    monkeypatch.setattr(mod, "EMAILS_DIR", emails_dir)
+    monkeypatch.setattr(mod, "load_transaction_filters_safe", lambda: ([], []))
+    monkeypatch.setattr(mod, "get_bank_alias_keywords", lambda: {})
+    monkeypatch.setattr(mod, "parse_statement_email", _stub_parse_statement_email)
+    caplog.set_level(logging.INFO)
+
+    result = mod.parse_all_bills(datetime(2026, 1, 1), datetime(2026, 1, 31))
+
+    assert [t.description for t in result.credit_card_transactions] == [
+        "a",
+        "b",
+        "c",
+        "d",
+    ]
+    assert [t.description for t in result.digital_transactions] == ["alipay"]
+    assert result.folders_parsed == result.folders_total == 5
+    assert "parsed alipay" in caplog.text
+
+
+def _ccb_statement_html(desc: str) -> str:
+    cells = ["2026-01-05", "c1", "c2", desc, "CNY", "¥12.34", "c6", "c7"]
+    row = (
+        '<tr style="font-size:12px;">'
+        + "".join(f"<td>{c}</td>" for c in cells)
+        + "</tr>"
+    )
+    return f"<html><body><table>{row}</table></body></html>"
+
+
+def test_parse_all_bills_in_spawned_workers_keeps_order_and_logs(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    emails_dir = tmp_path / "emails"
+    for name in ("c", "a", "b", "d"):
+        folder = emails_dir / name
+        folder.mkdir(parents=True)
+        (folder / EMAIL_METADATA_FILENAME).write_text(
+            '{"subject": "中国建设银行信用卡电子账单"}', "utf-8"
+        )
+        (folder / EMAIL_HTML_FILENAME).write_text(_ccb_statement_html(name), "utf-8")
+
+    monkeypatch.setattr(mod, "EMAILS_DIR", emails_dir)
+    monkeypatch.setattr(mod, "load_transaction_filters_safe", lambda: ([], []))
+    monkeypatch.setattr(
+        mod,
+        "get_bank_alias_keywords",
+        lambda: {"CCB": {"display_name": "建设银行", "aliases": ["建设银行"]}},
+    )
+    monkeypatch.setattr(mod, "_PARALLEL_PARSE_MIN_FOLDERS", 1)
+    monkeypatch.setattr(mod.os, "cpu_count", lambda: 2)
+    caplog.set_level(logging.INFO)
+
+    result = mod.parse_all_bills(datetime(2026, 1, 1), datetime(2026, 1, 31))
+
+    assert mod._PARSE_MP_CONTEXT.get_start_method() == "spawn"
+    assert "多进程解析不可用" not in caplog.text
+    assert [t.description for t in result.credit_card_transactions] == [
+        "a",
+        "b",
+        "c",
+        "d",
+    ]
+    assert result.folders_parsed == result.folders_total == 4
+    # 子进程里解析器的日志经队列转发回主进程。
+    worker_logs = [r for r in caplog.records if r.getMessage() == "解析CCB账单"]
+    assert len(worker_logs) == 4
+    assert all(r.processName != "MainProcess" for r in worker_logs)
@@ -5,6 +5,7 @@ from financemailparser.domain.models.txn import DigitalPaymentTransaction, Trans
 from financemailparser.application.billing.transactions_postprocess import (
     apply_expenses_account_rules,
     filter_transactions_by_rules,
+    find_cc_digital_matches,
     merge_transaction_descriptions,
 )
 
@@ -112,6 +113,49 @@ def test_merge_transaction_descriptions_prefers_merchant_over_platform_noise() -
     assert dp_match not in out
 
 
+def test_find_cc_digital_matches_pairs_duplicate_keys_in_order() -> None:
+    ccs = [_cc("2026-01-01", f"cc{i}", 9.9, TransactionSource.CMB) for i in range(3)]
+    dps: list[Transaction] = [
+        _dp("2026-01-01", f"dp{i}", 9.9, card_source=TransactionSource.CMB)
+        for i in range(2)
+    ]
+
+    matches = find_cc_digital_matches(ccs, dps)
+
+    assert [(m.cc_txn, m.dp_txn) for m in matches] == [
+        (ccs[0], dps[0]),
+        (ccs[1], dps[1]),
+    ]
+
+
+def test_find_cc_digital_matches_normalizes_date_format_and_amount_noise() -> None:
+    cc = _cc("2026/01/05", "cc", 0.3, TransactionSource.CMB)
+    dp = _dp("2026-01-05", "dp", 0.1, card_source=TransactionSource.CMB)
+    dp.amount = 0.1 + 0.2
+    other_day = _dp("2026-01-06", "dp", 0.3, card_source=TransactionSource.CMB)
+
+    matches = find_cc_digital_matches([cc], [other_day, dp])
+
+    assert [(m.cc_txn, m.dp_txn) for m in matches] == [(cc, dp)]
+
+
+def test_merge_transaction_descriptions_drops_only_matched_positions() -> None:
+    ccs = [
+        _cc("2026-01-01", "短", 9.9, TransactionSource.CMB),
+        _cc("2026-01-02", "未匹配", 5.0, TransactionSource.CMB),
+    ]
+    dps: list[Transaction] = [
+        _dp("2026-01-01", "余额支付", 9.9),
+        _dp("2026-01-01", "更长的商户描述", 9.9, card_source=TransactionSource.CMB),
+    ]
+
+    matches = find_cc_digital_matches(ccs, dps)
+    out = merge_transaction_descriptions(ccs, dps)
+
+    assert [(m.cc_index, m.dp_index) for m in matches] == [(0, 1)]
+    assert out == [ccs[1], dps[0], dps[1]]
+
+
 def test_filter_transactions_by_rules_counts_stats_and_applies_priority() -> None:
     txns = [
         _cc("2026-01-01", "含关键字-跳过", 1.0, TransactionSource.CCB),
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from financemailparser.application.common.facade_common import (
+    MISSING_MASTER_PASSWORD_READ_MESSAGE,
+    MISSING_MASTER_PASSWORD_SAVE_MESSAGE,
+    UiActionResult,
+)
+from financemailparser.application.settings import email_facade
+from financemailparser.infrastructure.config import config_manager as cm
+from financemailparser.infrastructure.config.config_manager import get_config_manager
+from financemailparser.infrastructure.config.secrets import MASTER_PASSWORD_ENV
+
+
+@pytest.fixture
+def config_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "config.yaml"
+    monkeypatch.setattr(cm, "CONFIG_FILE", path)
+    monkeypatch.setenv(MASTER_PASSWORD_ENV, "pw-1")
+    get_config_manager.cache_clear()
+    return path
+
+
+def test_email_config_service_follows_global_config_manager(
+    config_file: Path,
+) -> None:
+    first = email_facade._email_config_service()
+    assert email_facade._email_config_service() is first
+
+    get_config_manager.cache_clear()
+    assert email_facade._email_config_service() is not first
+
+
+def test_save_then_snapshot_masks_auth_code_and_keeps_placeholder(
+    config_file: Path,
+) -> None:
+    assert email_facade.get_email_config_ui_snapshot().state == "not_present"
+
+    saved = email_facade.save_email_config_from_ui(
+        values={"email": " a@qq.com ", "auth_code": "abcdef123456"},
+        masked_placeholders={},
+    )
+    assert saved.ok, saved.message
+
+    snapshot = email_facade.get_email_config_ui_snapshot()
+    assert snapshot.state == "ok"
+    assert snapshot.email == "a@qq.com"
+    assert snapshot.secret_masked is not None
+    placeholder = snapshot.secret_masked["auth_code"]
+    assert placeholder != "abcdef123456"
+
+    resaved = email_facade.save_email_config_from_ui(
+        values={"email": "b@qq.com", "auth_code": placeholder},
+        masked_placeholders={"auth_code": placeholder},
+    )
+    assert resaved.ok, resaved.message
+    loaded = email_facade._email_config_service().load_config_strict(provider_key="qq")
+    assert loaded == {"email": "b@qq.com", "auth_code": "abcdef123456"}
+
+
+def test_save_reports_missing_required_fields(config_file: Path) -> None:
+    result = email_facade.save_email_config_from_ui(
+        values={"email": "a@qq.com", "auth_code": "  "},
+        masked_placeholders={},
+    )
+
+    assert result.ok is False
+    assert "授权码" in result.message
+
+
+def test_save_with_new_secret_does_not_decrypt_saved_one(
+    config_file: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    first = email_facade.save_email_config_from_ui(
+        values={"email": "a@qq.com", "auth_code": "abcdef123456"},
+        masked_placeholders={},
+    )
+    assert first.ok, first.message
+
+    def fail_load(*, provider_key: str) -> dict[str, str]:
+        raise AssertionError("saved secret should not be decrypted")
+
+    monkeypatch.setattr(
+        email_facade._email_config_service(), "load_config_strict", fail_load
+    )
+    result = email_facade.save_email_config_from_ui(
+        values={"email": "a@qq.com", "auth_code": "new-code-7890"},
+        masked_placeholders={"auth_code": "ab****56"},
+    )
+
+    assert result.ok, result.message
+
+
+def test_placeholder_save_reports_unreadable_saved_secret(
+    config_file: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    first = email_facade.save_email_config_from_ui(
+        values={"email": "a@qq.com", "auth_code": "abcdef123456"},
+        masked_placeholders={},
+    )
+    assert first.ok, first.message
+
+    monkeypatch.setenv(MASTER_PASSWORD_ENV, "pw-2")
+    result = email_facade.save_email_config_from_ui(
+        values={"email": "a@qq.com", "auth_code": "ab****56"},
+        masked_placeholders={"auth_code": "ab****56"},
+    )
+
+    assert result.ok is False
+    assert "无法读取已保存的密钥字段" in result.message
+
+
+def test_snapshot_is_slotted_and_picklable(config_file: Path) -> None:
+    import pickle
+
+    snapshot = email_facade.get_email_config_ui_snapshot()
+
+    assert not hasattr(snapshot, "__dict__")
+    assert pickle.loads(pickle.dumps(snapshot)) == snapshot
+
+
+def test_actions_require_master_password(
+    config_file: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv(MASTER_PASSWORD_ENV)
+    values = {"email": "a@qq.com", "auth_code": "abcdef123456"}
+
+    saved = email_facade.save_email_config_from_ui(
+        values=values, masked_placeholders={}
+    )
+    tested = email_facade.test_email_config_from_ui(
+        values=values, masked_placeholders={}
+    )
+
+    assert saved == UiActionResult(
+        ok=False, message=MISSING_MASTER_PASSWORD_SAVE_MESSAGE
+    )
+    assert tested == UiActionResult(
+        ok=False, message=MISSING_MASTER_PASSWORD_READ_MESSAGE
+    )
+    assert MASTER_PASSWORD_ENV in saved.message
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 import sys
 from pathlib import Path
 
@@ -8,8 +9,12 @@ def pytest_configure() -> None:
     """
     Ensure `src/` is importable when running pytest in a src-layout project.
 
+    Also keep litellm on its bundled model cost map so tests never fetch it over
+    the network (the background refresh thread can race with lazy imports).
+
     This only affects the test environment.
     """
+    os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
     project_root = Path(__file__).resolve().parents[1]
     src_dir = project_root / "src"
     if str(src_dir) not in sys.path:
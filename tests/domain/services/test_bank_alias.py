@@ -6,6 +6,7 @@ from financemailparser.domain.models.source import TransactionSource
 from financemailparser.domain.services.bank_alias import (
     build_bank_alias_keywords,
     build_bank_display_names,
+    compile_bank_alias_matcher,
     find_bank_code_by_alias,
     find_transaction_source_by_alias,
 )
@@ -49,6 +50,17 @@ def test_find_bank_code_by_alias_is_case_insensitive_substring_match() -> None:
     assert find_bank_code_by_alias("完全不相关", bank_alias_keywords=keywords) is None
 
 
+def test_compile_bank_alias_matcher_agrees_with_find_bank_code_by_alias() -> None:
+    keywords = {" ccb ": [" 建行 ", "", "CCB"], "CMB": ["招行", "ccb 招行"], "": ["x"]}
+    match = compile_bank_alias_matcher(keywords)
+    for text in ["招行CCB账单", "这是招行账单", "X", "", "建 行"]:
+        assert match(text) == find_bank_code_by_alias(
+            text, bank_alias_keywords=keywords
+        )
+    assert match("招行CCB账单") == "CCB"
+    assert compile_bank_alias_matcher(None)("建行") is None
+
+
 def test_find_transaction_source_by_alias_returns_none_for_unknown_code() -> None:
     keywords = {"CCB": ["建行"], "NOT_IN_ENUM": ["not-in-enum"]}
     assert (
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import financemailparser.infrastructure.ai.config as ai_config_module
+from financemailparser.infrastructure.ai.config import AIConfig, AIConfigManager
+from financemailparser.infrastructure.config.config_manager import ConfigManager
+from financemailparser.infrastructure.config.secrets import (
+    MASTER_PASSWORD_ENV,
+    SecretBox,
+    SecretDecryptionError,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_connection_test_cache() -> None:
+    ai_config_module._forget_connection_tests()
+
+
+def _make_manager(tmp_path: Path) -> AIConfigManager:
+    return AIConfigManager(ConfigManager(config_path=tmp_path / "config.yaml"))
+
+
+def _count_decrypts(monkeypatch: pytest.MonkeyPatch) -> dict[str, int]:
+    calls = {"n": 0}
+    real_decrypt = SecretBox.decrypt
+
+    def counting_decrypt(value: str, *, aad: str | None = None) -> str:
+        calls["n"] += 1
+        return real_decrypt(value, aad=aad)
+
+    monkeypatch.setattr(ai_config_module.SecretBox, "decrypt", counting_decrypt)
+    return calls
+
+
+def test_load_config_strict_decrypts_api_key_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(MASTER_PASSWORD_ENV, "pw-1")
+    mgr = _make_manager(tmp_path)
+    mgr.save_config(AIConfig(provider="openai", model="gpt-4o", api_key="sk-1"))
+    calls = _count_decrypts(monkeypatch)
+
+    assert mgr.load_config_strict().api_key == "sk-1"
+    assert mgr.load_config_strict().api_key == "sk-1"
+    assert calls["n"] == 1
+
+
+def test_save_config_invalidates_cached_api_key(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(MASTER_PASSWORD_ENV, "pw-1")
+    mgr = _make_manager(tmp_path)
+    mgr.save_config(AIConfig(provider="openai", model="gpt-4o", api_key="sk-1"))
+    assert mgr.load_config_strict().api_key == "sk-1"
+
+    mgr.save_config(AIConfig(provider="openai", model="gpt-4o", api_key="sk-2"))
+    assert mgr.load_config_strict().api_key == "sk-2"
+
+
+def test_cached_api_key_not_served_after_master_password_change(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(MASTER_PASSWORD_ENV, "pw-1")
+    mgr = _make_manager(tmp_path)
+    mgr.save_config(AIConfig(provider="openai", model="gpt-4o", api_key="sk-1"))
+    assert mgr.load_config_strict().api_key == "sk-1"
+
+    monkeypatch.setenv(MASTER_PASSWORD_ENV, "pw-2")
+    with pytest.raises(SecretDecryptionError):
+        mgr.load_config_strict()
+
+
+@pytest.mark.parametrize(
+    ("provider", "model", "expected"),
+    [
+        ("openai", "gpt-4o", "openai/gpt-4o"),
+        ("openai", "openai/gpt-4o", "openai/gpt-4o"),
+        ("gemini", "gemini-1.5-pro", "gemini/gemini-1.5-pro"),
+        ("custom", "org/model", "org/model"),
+    ],
+)
+def test_litellm_model_name_is_prefixed_once(
+    provider: str, model: str, expected: str
+) -> None:
+    cfg = AIConfig(provider=provider, model=model, api_key="sk-1")
+    assert cfg.litellm_model_name() == expected
+    assert cfg.to_litellm_completion_kwargs(messages=[])["model"] == expected
+
+
+def test_ai_config_rejects_negative_output_limit() -> None:
+    with pytest.raises(ValueError, match="最大输出 Token 数不能为负数"):
+        AIConfig(
+            provider="openai", model="gpt-4o", api_key="sk-1", max_output_tokens=-1
+        )
+
+
+def test_load_config_strict_clamps_out_of_range_limits_and_warns_once(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    monkeypatch.setenv(MASTER_PASSWORD_ENV, "pw-1")
+    monkeypatch.setattr(ai_config_module, "_clamp_warned", set())
+    mgr = _make_manager(tmp_path)
+    mgr.save_config(AIConfig(provider="openai", model="gpt-4o", api_key="sk-1"))
+    # 模拟引入上限之前保存的 config.yaml。
+    mgr._config_manager.set_value("ai", "timeout", 3600)
+    mgr._config_manager.set_value("ai", "max_retries", 20)
+
+    with caplog.at_level(logging.WARNING):
+        cfg = mgr.load_config_strict()
+        mgr.load_config_strict()
+        AIConfig(provider="openai", model="gpt-4o", api_key="sk-1", timeout=3600)
+
+    assert cfg.timeout == AIConfig.MAX_TIMEOUT
+    assert cfg.max_retries == AIConfig.MAX_MAX_RETRIES
+    warnings = [
+        r
+        for r in caplog.records
+        if r.name == ai_config_module.__name__ and r.levelno == logging.WARNING
+    ]
+    assert [r.getMessage().split(" 超出")[0] for r in warnings] == [
+        "config.yaml 中 ai.timeout=3600",
+        "config.yaml 中 ai.max_retries=20",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("error", "expected_prefix"),
+    [
+        ("Invalid API key provided", "API Key 错误"),
+        ("Request timeout, authentication failed", "API Key 错误"),
+        ("Rate limit reached", "API 速率限制"),
+        ("Read timeout", "连接超时"),
+        ("The model `gpt-x` was not found", "模型不存在"),
+        ("boom", "连接失败：boom"),
+    ],
+)
+def test_test_connection_maps_common_errors(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    error: str,
+    expected_prefix: str,
+) -> None:
+    import litellm
+
+    def fake_completion(**_kwargs: Any) -> None:
+        raise RuntimeError(error)
+
+    monkeypatch.setattr(litellm, "completion", fake_completion)
+
+    ok, msg = _make_manager(tmp_path).test_connection(
+        AIConfig(provider="openai", model="gpt-4o", api_key="sk-1")
+    )
+
+    assert ok is False
+    assert msg.startswith(expected_prefix)
+    assert error in msg
+
+
+def test_save_and_load_roundtrip_keeps_numeric_fields(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(MASTER_PASSWORD_ENV, "pw-1")
+    mgr = _make_manager(tmp_path)
+    saved = AIConfig(
+        provider="openai",
+        model="gpt-4o",
+        api_key="sk-1",
+        timeout=30,
+        max_retries=1,
+        retry_interval=5,
+        rpm=60,
+        tpm=1000,
+        max_output_tokens=512,
+    )
+    mgr.save_config(saved)
+
+    assert mgr.load_config_strict() == saved
+
+
+def test_test_connection_skips_request_for_recently_verified_config(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import litellm
+
+    calls = {"n": 0}
+
+    def fake_completion(**_kwargs: Any) -> None:
+        calls["n"] += 1
+
+    monkeypatch.setattr(litellm, "completion", fake_completion)
+    monkeypatch.setenv(MASTER_PASSWORD_ENV, "pw-1")
+    mgr = _make_manager(tmp_path)
+    cfg = AIConfig(provider="openai", model="gpt-4o", api_key="sk-cache-1")
+
+    assert mgr.test_connection(cfg)[0] is True
+    assert mgr.test_connection(cfg)[0] is True
+    assert calls["n"] == 1
+
+    # A different key is a different config.
+    other = AIConfig(provider="openai", model="gpt-4o", api_key="sk-cache-2")
+    assert mgr.test_connection(other)[0] is True
+    assert calls["n"] == 2
+
+    # Saving config invalidates previously verified results.
+    mgr.save_config(cfg)
+    assert mgr.test_connection(cfg)[0] is True
+    assert calls["n"] == 3
+
+
+def test_test_connection_does_not_cache_failures(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import litellm
+
+    outcomes = [RuntimeError("boom"), None]
+
+    def fake_completion(**_kwargs: Any) -> None:
+        outcome = outcomes.pop(0)
+        if outcome is not None:
+            raise outcome
+
+    monkeypatch.setattr(litellm, "completion", fake_completion)
+    mgr = _make_manager(tmp_path)
+    cfg = AIConfig(provider="openai", model="gpt-4o", api_key="sk-cache-fail")
+
+    assert mgr.test_connection(cfg)[0] is False
+    assert mgr.test_connection(cfg)[0] is True
+
+
+@pytest.mark.parametrize(
+    ("section", "expected"),
+    [
+        ({"provider": " openai ", "model": "gpt-4o", "api_key": "enc"}, True),
+        ({"provider": "openai", "model": "  ", "api_key": "enc"}, False),
+        ({"provider": "openai", "model": 4, "api_key": "enc"}, True),
+        ({"provider": "openai", "model": "gpt-4o", "api_key": None}, False),
+    ],
+)
+def test_config_present_requires_non_blank_fields(
+    tmp_path: Path, section: dict[str, Any], expected: bool
+) -> None:
+    config_manager = ConfigManager(config_path=tmp_path / "config.yaml")
+    config_manager.set_section(AIConfigManager.SECTION, section)
+
+    assert AIConfigManager(config_manager).config_present() is expected
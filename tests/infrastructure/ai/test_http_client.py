@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import financemailparser.infrastructure.ai.config as ai_config_module
+from financemailparser.infrastructure.ai import http_client
+from financemailparser.infrastructure.ai.config import AIConfig, AIConfigManager
+from financemailparser.infrastructure.config.config_manager import ConfigManager
+from financemailparser.shared.constants import AI_HTTP2_ENV
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [(None, False), ("", False), ("0", False), ("1", True), (" True ", True)],
+)
+def test_http2_is_enabled_only_by_setting(
+    monkeypatch: pytest.MonkeyPatch, value: str | None, expected: bool
+) -> None:
+    if value is None:
+        monkeypatch.delenv(AI_HTTP2_ENV, raising=False)
+    else:
+        monkeypatch.setenv(AI_HTTP2_ENV, value)
+
+    assert http_client.http2_enabled() is expected
+
+
+def test_build_shared_http_client_passes_http2_setting(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import httpx
+
+    seen: dict[str, Any] = {}
+
+    def fake_client(**kwargs: Any) -> object:
+        seen.update(kwargs)
+        return object()
+
+    monkeypatch.setattr(httpx, "Client", fake_client)
+    monkeypatch.delenv(AI_HTTP2_ENV, raising=False)
+
+    http_client.build_shared_http_client()
+
+    assert seen["http2"] is False
+
+
+def test_connection_test_installs_the_shared_client(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import litellm
+
+    monkeypatch.setattr(litellm, "client_session", None)
+    monkeypatch.setattr(litellm, "completion", lambda **_kwargs: None)
+    http_client.install_shared_http_client.cache_clear()
+    mgr = AIConfigManager(ConfigManager(config_path=tmp_path / "config.yaml"))
+
+    ok, _msg = mgr.test_connection(
+        AIConfig(provider="openai", model="gpt-4o", api_key="sk-1")
+    )
+
+    assert ok is True
+    assert litellm.client_session is not None
+    http_client.install_shared_http_client.cache_clear()
+    ai_config_module._forget_connection_tests()
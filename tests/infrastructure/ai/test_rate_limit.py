@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import pytest
+
+from financemailparser.infrastructure.ai.rate_limit import RateLimiter
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_disabled_limiter_never_waits() -> None:
+    limiter = RateLimiter()
+    assert limiter.enabled is False
+    assert [limiter.reserve(10_000) for _ in range(100)] == [0.0] * 100
+
+
+def test_rpm_bucket_queues_requests_beyond_budget() -> None:
+    clock = _FakeClock()
+    limiter = RateLimiter(rpm=60, clock=clock)
+
+    waits = [limiter.reserve() for _ in range(62)]
+
+    assert waits[:60] == [0.0] * 60
+    assert waits[60] == pytest.approx(1.0)
+    assert waits[61] == pytest.approx(2.0)
+
+
+def test_rpm_bucket_refills_over_time() -> None:
+    clock = _FakeClock()
+    limiter = RateLimiter(rpm=60, clock=clock)
+    for _ in range(60):
+        limiter.reserve()
+
+    clock.now = 5.0
+    assert [limiter.reserve() for _ in range(5)] == [0.0] * 5
+    assert limiter.reserve() == pytest.approx(1.0)
+
+
+def test_tpm_bucket_waits_for_token_budget() -> None:
+    clock = _FakeClock()
+    limiter = RateLimiter(tpm=600, clock=clock)
+
+    assert limiter.limits_tokens is True
+    assert limiter.reserve(500) == 0.0
+    # 100 tokens left, 300 requested -> 200 tokens short at 10 tokens/s.
+    assert limiter.reserve(300) == pytest.approx(20.0)
+
+
+def test_tpm_oversized_request_waits_at_most_one_window() -> None:
+    clock = _FakeClock()
+    limiter = RateLimiter(tpm=600, clock=clock)
+    limiter.reserve(600)
+
+    assert limiter.reserve(10_000) == pytest.approx(60.0)
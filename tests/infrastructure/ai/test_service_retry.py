@@ -1,13 +1,31 @@
 from __future__ import annotations
 
+import asyncio
+import dataclasses
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from types import SimpleNamespace
 
+import pytest
 import tenacity.nap
 
 import financemailparser.infrastructure.ai.service as service_module
 from financemailparser.infrastructure.ai.service import AIService
 
 
+@pytest.fixture(autouse=True)
+def _no_model_map_lookup(monkeypatch):
+    # Keep tests hermetic: litellm's model map lookup may trigger background
+    # network refreshes. Tests that need limits patch this again.
+    monkeypatch.setattr(service_module, "_model_token_limits", lambda m: (None, None))
+
+
 def _make_dummy_response(content: str) -> SimpleNamespace:
     message = SimpleNamespace(content=content)
     choice = SimpleNamespace(message=message)
@@ -21,8 +39,16 @@ class _FakeAiConfig:
         self.model = "gpt-4o-mini"
         self.max_retries = int(max_retries)
         self.retry_interval = int(retry_interval)
+        self.rpm = 0
+        self.tpm = 0
+        self.max_output_tokens = 0
+        self.kwargs_builds = 0
+
+    def litellm_model_name(self) -> str:
+        return f"{self.provider}/{self.model}"
 
     def to_litellm_completion_kwargs(self, *, messages: list[dict], **extra):
+        self.kwargs_builds += 1
         # Only fields needed by our mocked `litellm.completion` in tests.
         return {"messages": messages, **extra}
 
@@ -49,7 +75,7 @@ def test_call_completion_retries_on_any_exception(monkeypatch):
             raise ValueError("boom")
         return _make_dummy_response("ok")
 
-    monkeypatch.setattr(service_module.litellm, "completion", fake_completion)
+    monkeypatch.setattr(service_module._litellm(), "completion", fake_completion)
 
     service = AIService(_FakeConfigManager(max_retries=2, retry_interval=1))
     stats = service.call_completion("hello")
@@ -69,7 +95,7 @@ def test_call_completion_stops_after_max_retries(monkeypatch):
         calls["n"] += 1
         raise RuntimeError("nope")
 
-    monkeypatch.setattr(service_module.litellm, "completion", fake_completion)
+    monkeypatch.setattr(service_module._litellm(), "completion", fake_completion)
 
     service = AIService(_FakeConfigManager(max_retries=2, retry_interval=1))
     stats = service.call_completion("hello")
@@ -78,3 +104,344 @@ def test_call_completion_stops_after_max_retries(monkeypatch):
     assert stats.retry_count == 2
     assert calls["n"] == 3
     assert "nope" in (stats.error_message or "")
+
+
+def test_call_completion_reuses_retry_controller_and_per_call_callback(monkeypatch):
+    monkeypatch.setattr(tenacity.nap.time, "sleep", lambda _seconds: None)
+
+    calls: dict[str, int] = {"n": 0}
+
+    def fake_completion(**_kwargs):
+        calls["n"] += 1
+        if calls["n"] % 2 == 1:
+            raise ValueError("flaky")
+        return _make_dummy_response("ok")
+
+    monkeypatch.setattr(service_module._litellm(), "completion", fake_completion)
+
+    service = AIService(_FakeConfigManager(max_retries=1, retry_interval=1))
+    first: list[tuple[int, str]] = []
+    second: list[tuple[int, str]] = []
+
+    assert service.call_completion("a", on_retry=lambda *a: first.append(a)).success
+    assert service.call_completion("b", on_retry=lambda *a: second.append(a)).success
+
+    assert len(service._retrying_cache) == 1
+    assert first == [(1, "ValueError: flaky")]
+    assert second == [(1, "ValueError: flaky")]
+
+
+def test_batch_completion_runs_concurrently_and_keeps_order(monkeypatch):
+    monkeypatch.setattr(tenacity.nap.time, "sleep", lambda _seconds: None)
+
+    in_flight = {"now": 0, "peak": 0}
+
+    async def fake_acompletion(**kwargs):
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        prompt = kwargs["messages"][-1]["content"]
+        if prompt == "bad":
+            raise RuntimeError("nope")
+        return _make_dummy_response(prompt.upper())
+
+    monkeypatch.setattr(service_module._litellm(), "acompletion", fake_acompletion)
+
+    service = AIService(_FakeConfigManager(max_retries=0, retry_interval=1))
+    results = asyncio.run(
+        service.batch_completion(["a", "bad", "c", "d"], max_concurrency=2)
+    )
+
+    assert [r.response for r in results] == ["A", None, "C", "D"]
+    assert [r.success for r in results] == [True, False, True, True]
+    assert "nope" in (results[1].error_message or "")
+    assert in_flight["peak"] == 2
+
+
+def test_call_completion_batched_splits_answers_and_tokens(monkeypatch):
+    sent: list[dict] = []
+
+    def fake_completion(**kwargs):
+        sent.append(kwargs)
+        prompt = kwargs["messages"][-1]["content"]
+        n = len(re.findall(r"^### ITEM \d+$", prompt, flags=re.MULTILINE))
+        answers = [f"answer-{i}" for i in range(1, n + 1)]
+        response = _make_dummy_response(json.dumps({"results": answers}))
+        response.usage = SimpleNamespace(
+            prompt_tokens=10 * n, completion_tokens=4 * n, total_tokens=14 * n
+        )
+        return response
+
+    monkeypatch.setattr(service_module._litellm(), "completion", fake_completion)
+    monkeypatch.setattr(
+        service_module._litellm(),
+        "get_supported_openai_params",
+        lambda model: ["response_format"],
+    )
+    service_module._supports_json_response.cache_clear()
+
+    service = AIService(_FakeConfigManager(max_retries=0, retry_interval=1))
+    results = service.call_completion_batched(["p1", "p2", "p3"], batch_size=2)
+
+    assert len(sent) == 2
+    assert sent[0]["response_format"] == {"type": "json_object"}
+    assert [r.response for r in results] == ["answer-1", "answer-2", "answer-1"]
+    assert all(r.success for r in results)
+    assert sum(r.prompt_tokens for r in results[:2]) == 20
+    assert sum(r.completion_tokens for r in results[:2]) == 8
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_call_completion_json_parses_fenced_response(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(service_module, "_orjson", None)
+    monkeypatch.setattr(
+        service_module._litellm(),
+        "completion",
+        lambda **_kwargs: _make_dummy_response('```json\n{"a": [1, "二"]}\n```'),
+    )
+    monkeypatch.setattr(
+        service_module._litellm(), "get_supported_openai_params", lambda model: []
+    )
+    service_module._supports_json_response.cache_clear()
+
+    service = AIService(_FakeConfigManager(max_retries=0, retry_interval=1))
+    stats, parsed = service.call_completion_json("p")
+
+    assert stats.success is True
+    assert parsed == {"a": [1, "二"]}
+
+
+def test_call_completion_json_reports_invalid_json_as_failure(monkeypatch):
+    monkeypatch.setattr(
+        service_module._litellm(),
+        "completion",
+        lambda **_kwargs: _make_dummy_response("not json"),
+    )
+    monkeypatch.setattr(
+        service_module._litellm(), "get_supported_openai_params", lambda model: []
+    )
+    service_module._supports_json_response.cache_clear()
+
+    service = AIService(_FakeConfigManager(max_retries=0, retry_interval=1))
+    stats, parsed = service.call_completion_json("p")
+
+    assert parsed is None
+    assert stats.success is False
+    assert stats.response == "not json"
+    assert "JSON 响应解析失败" in (stats.error_message or "")
+
+
+def test_call_completion_batched_marks_whole_batch_failed_on_bad_json(monkeypatch):
+    monkeypatch.setattr(
+        service_module._litellm(),
+        "completion",
+        lambda **_kwargs: _make_dummy_response('{"results": ["only-one"]}'),
+    )
+    monkeypatch.setattr(
+        service_module._litellm(), "get_supported_openai_params", lambda model: []
+    )
+    service_module._supports_json_response.cache_clear()
+
+    service = AIService(_FakeConfigManager(max_retries=0, retry_interval=1))
+    results = service.call_completion_batched(["p1", "p2"])
+
+    assert [r.success for r in results] == [False, False]
+    assert "期望 2" in (results[0].error_message or "")
+
+
+def test_call_completion_fails_fast_when_input_exceeds_context(monkeypatch):
+    calls: dict[str, int] = {"n": 0}
+
+    def fake_completion(**_kwargs):
+        calls["n"] += 1
+        return _make_dummy_response("ok")
+
+    monkeypatch.setattr(service_module._litellm(), "completion", fake_completion)
+    monkeypatch.setattr(service_module, "_model_token_limits", lambda m: (100, 50))
+    monkeypatch.setattr(
+        service_module._litellm(), "token_counter", lambda model, messages: 120
+    )
+
+    service = AIService(_FakeConfigManager(max_retries=2, retry_interval=1))
+    stats = service.call_completion("huge")
+
+    assert stats.success is False
+    assert stats.retry_count == 0
+    assert "上下文窗口 100" in (stats.error_message or "")
+    assert calls["n"] == 0
+
+
+def _capture_completions(monkeypatch, *, input_tokens: int) -> list[dict]:
+    sent: list[dict] = []
+
+    def fake_completion(**kwargs):
+        sent.append(kwargs)
+        return _make_dummy_response("ok")
+
+    monkeypatch.setattr(service_module._litellm(), "completion", fake_completion)
+    monkeypatch.setattr(service_module, "_model_token_limits", lambda m: (100, 50))
+    monkeypatch.setattr(
+        service_module._litellm(),
+        "token_counter",
+        lambda model, messages: input_tokens,
+    )
+    return sent
+
+
+def test_call_completion_omits_max_tokens_when_not_configured(monkeypatch):
+    sent = _capture_completions(monkeypatch, input_tokens=70)
+
+    service = AIService(_FakeConfigManager(max_retries=0, retry_interval=1))
+    assert service.call_completion("hello").success is True
+    assert "max_tokens" not in sent[0]
+
+
+def test_call_completion_sends_configured_max_tokens_capped_to_model(monkeypatch):
+    sent = _capture_completions(monkeypatch, input_tokens=10)
+    manager = _FakeConfigManager(max_retries=0, retry_interval=1)
+    service = AIService(manager)
+
+    manager._cfg.max_output_tokens = 40
+    assert service.call_completion("hello").success is True
+    manager._cfg.max_output_tokens = 80
+    assert service.call_completion("hello").success is True
+
+    assert [kw["max_tokens"] for kw in sent] == [40, 50]
+
+
+def test_call_completion_tolerates_slightly_over_estimate(monkeypatch):
+    # token_counter 的估算略超上下文时不在本地拦截，交给服务端裁决。
+    sent = _capture_completions(monkeypatch, input_tokens=105)
+
+    service = AIService(_FakeConfigManager(max_retries=0, retry_interval=1))
+    assert service.call_completion("hello").success is True
+    assert len(sent) == 1
+
+
+def test_importing_service_does_not_import_litellm():
+    src_dir = Path(__file__).resolve().parents[3] / "src"
+    code = (
+        "import sys\n"
+        "import financemailparser.infrastructure.ai.service\n"
+        "print('litellm' in sys.modules)\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": str(src_dir)},
+    )
+    assert out.stdout.strip() == "False"
+
+
+def test_call_completion_reuses_request_context_while_config_unchanged(monkeypatch):
+    sent: list[dict] = []
+
+    def fake_completion(**kwargs):
+        sent.append(kwargs)
+        return _make_dummy_response("ok")
+
+    monkeypatch.setattr(service_module._litellm(), "completion", fake_completion)
+
+    manager = _FakeConfigManager(max_retries=0, retry_interval=1)
+    service = AIService(manager)
+    service.call_completion("a", system_prompt="sys")
+    service.call_completion("b")
+
+    assert manager._cfg.kwargs_builds == 1
+    assert [m["content"] for m in sent[0]["messages"]] == ["sys", "a"]
+    assert [m["content"] for m in sent[1]["messages"]] == ["b"]
+
+
+def test_retry_count_is_per_call_when_service_is_shared_across_threads(monkeypatch):
+    monkeypatch.setattr(tenacity.nap.time, "sleep", lambda _seconds: None)
+
+    attempts: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def fake_completion(**kwargs):
+        prompt = kwargs["messages"][-1]["content"]
+        with lock:
+            attempts[prompt] = attempts.get(prompt, 0) + 1
+            n = attempts[prompt]
+        if prompt == "flaky" and n <= 2:
+            raise ValueError("boom")
+        return _make_dummy_response(prompt)
+
+    monkeypatch.setattr(service_module._litellm(), "completion", fake_completion)
+
+    service = AIService(_FakeConfigManager(max_retries=3, retry_interval=1))
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        flaky = pool.submit(service.call_completion, "flaky")
+        steady = pool.submit(service.call_completion, "steady")
+
+    assert flaky.result().retry_count == 2
+    assert steady.result().retry_count == 0
+
+
+def test_call_stats_is_immutable_and_slotted():
+    stats = service_module.CallStats(
+        success=True, response="ok", total_time=0.1, retry_count=0, error_message=None
+    )
+    assert not hasattr(stats, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        stats.response = "changed"  # type: ignore[misc]
+
+
+def test_call_completion_counts_zero_tokens_when_usage_missing(monkeypatch):
+    response = _make_dummy_response("ok")
+    response.usage = None
+    monkeypatch.setattr(
+        service_module._litellm(), "completion", lambda **_kwargs: response
+    )
+
+    service = AIService(_FakeConfigManager(max_retries=0, retry_interval=1))
+    stats = service.call_completion("hello")
+
+    assert stats.success is True
+    assert (stats.prompt_tokens, stats.completion_tokens, stats.total_tokens) == (
+        0,
+        0,
+        0,
+    )
+
+
+def test_shared_http_client_is_installed_by_calls_not_by_import(monkeypatch):
+    import httpx
+
+    litellm = service_module._litellm()
+    monkeypatch.setattr(litellm, "client_session", None)
+    service_module.install_shared_http_client.cache_clear()
+    monkeypatch.setattr(
+        litellm, "completion", lambda **_kwargs: _make_dummy_response("ok")
+    )
+
+    service_module._litellm()
+    assert litellm.client_session is None
+
+    service = AIService(_FakeConfigManager(max_retries=0, retry_interval=1))
+    assert service.call_completion("hello").success is True
+    assert isinstance(litellm.client_session, httpx.Client)
+    service_module.install_shared_http_client.cache_clear()
+
+
+def test_summarize_usage_sums_each_token_column():
+    results = [
+        service_module.CallStats(
+            success=True,
+            response="a",
+            total_time=0.0,
+            retry_count=0,
+            error_message=None,
+            prompt_tokens=p,
+            completion_tokens=c,
+            total_tokens=p + c,
+        )
+        for p, c in [(3, 1), (5, 2), (0, 0)]
+    ]
+
+    assert service_module.summarize_usage(results) == (8, 3, 11)
+    assert service_module.summarize_usage([]) == (0, 0, 0)
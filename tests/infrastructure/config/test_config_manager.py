@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from financemailparser.infrastructure.config import config_manager as cm
+from financemailparser.infrastructure.config.config_manager import ConfigManager
+
+
+def _count_yaml_loads(monkeypatch: pytest.MonkeyPatch) -> dict[str, int]:
+    calls = {"n": 0}
+    real_safe_load = cm.yaml.safe_load
+
+    def counting_safe_load(stream: Any) -> Any:
+        calls["n"] += 1
+        return real_safe_load(stream)
+
+    monkeypatch.setattr(cm.yaml, "safe_load", counting_safe_load)
+    return calls
+
+
+def test_get_section_parses_yaml_once_while_file_unchanged(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("ai:\n  provider: openai\n", encoding="utf-8")
+    calls = _count_yaml_loads(monkeypatch)
+    mgr = ConfigManager(config_path=config_file)
+
+    assert mgr.get_section("ai") == {"provider": "openai"}
+    assert mgr.get_section("ai") == {"provider": "openai"}
+    assert calls["n"] == 1
+
+
+def test_get_section_picks_up_external_edits(tmp_path: Path) -> None:
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("ai:\n  provider: openai\n", encoding="utf-8")
+    mgr = ConfigManager(config_path=config_file)
+    assert mgr.get_section("ai") == {"provider": "openai"}
+
+    config_file.write_text("ai:\n  provider: gemini\n", encoding="utf-8")
+    st = config_file.stat()
+    os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert mgr.get_section("ai") == {"provider": "gemini"}
+
+
+def test_cached_config_is_not_mutated_through_returned_dicts(tmp_path: Path) -> None:
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("ai:\n  provider: openai\n", encoding="utf-8")
+    mgr = ConfigManager(config_path=config_file)
+
+    section = mgr.get_section("ai")
+    assert section is not None
+    section["provider"] = "mutated"
+
+    assert mgr.get_section("ai") == {"provider": "openai"}
+
+
+def test_set_section_is_visible_to_next_read(tmp_path: Path) -> None:
+    mgr = ConfigManager(config_path=tmp_path / "config.yaml")
+    assert mgr.get_section("ai") is None
+
+    mgr.set_section("ai", {"provider": "openai"})
+    assert mgr.get_section("ai") == {"provider": "openai"}
+
+    assert mgr.delete_section("ai") is True
+    assert mgr.get_section("ai") is None
@@ -13,6 +13,8 @@ from financemailparser.infrastructure.config.secrets import (
     MasterPasswordNotSetError,
     SecretBox,
     SecretDecryptionError,
+    clear_decrypt_cache,
+    decrypt_cached,
     is_encrypted_value,
     master_password_is_set,
     parse_encrypted_value,
@@ -81,3 +83,33 @@ def test_parse_encrypted_value_validates_nonce_length() -> None:
     )
     with pytest.raises(InvalidEncryptedSecretError):
         parse_encrypted_value(value)
+
+
+def test_decrypt_cached_memoizes_per_master_password(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv(MASTER_PASSWORD_ENV, "pw-1")
+    value = SecretBox.encrypt("hello", aad="a")
+    clear_decrypt_cache()
+    calls = {"n": 0}
+    real_decrypt = SecretBox.decrypt
+
+    def counting_decrypt(value: str, *, aad: str | None = None) -> str:
+        calls["n"] += 1
+        return real_decrypt(value, aad=aad)
+
+    monkeypatch.setattr(SecretBox, "decrypt", counting_decrypt)
+
+    assert decrypt_cached(value, aad="a") == "hello"
+    assert decrypt_cached(value, aad="a") == "hello"
+    assert calls["n"] == 1
+
+    monkeypatch.setenv(MASTER_PASSWORD_ENV, "pw-2")
+    with pytest.raises(SecretDecryptionError):
+        decrypt_cached(value, aad="a")
+    assert calls["n"] == 2
+
+    monkeypatch.setenv(MASTER_PASSWORD_ENV, "pw-1")
+    clear_decrypt_cache()
+    assert decrypt_cached(value, aad="a") == "hello"
+    assert calls["n"] == 3
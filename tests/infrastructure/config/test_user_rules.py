@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from typing import cast
+from typing import Any, cast
 
 import pytest
 import yaml
@@ -14,9 +14,12 @@ from financemailparser.infrastructure.config.user_rules import (
     AmountRange,
     UserRulesError,
     amount_in_ranges,
+    compile_expenses_account_matcher,
+    compile_skip_keyword_matcher,
     get_expenses_account_rules,
     get_transaction_filters,
     match_expenses_account,
+    match_skip_keyword,
     save_expenses_account_rules,
     save_transaction_filters,
 )
@@ -118,6 +121,27 @@ def test_match_expenses_account_first_match_wins() -> None:
     assert match_expenses_account("今天去星巴克", rules) == "Expenses:Food"
 
 
+@pytest.mark.parametrize(
+    "description",
+    ["今天去星巴克", "ABC星", "a.b(c)", "abc", "美团外卖", "", "TAXI"],
+)
+def test_compiled_matchers_agree_with_plain_matchers(description: str) -> None:
+    rules: list[dict[str, Any]] = [
+        {"account": "Expenses:Bad", "keywords": "not-a-list"},
+        {"account": "Expenses:Food", "keywords": ["星巴克", "美团"]},
+        {"account": "Expenses:Other", "keywords": ["星", "a.b(c)"]},
+        {"account": "Expenses:Empty", "keywords": []},
+    ]
+    skip_keywords = ["", "星", "巴克", "(c)", "taxi"]
+
+    assert compile_expenses_account_matcher(rules)(description) == (
+        match_expenses_account(description, rules)
+    )
+    assert compile_skip_keyword_matcher(skip_keywords)(description) == (
+        match_skip_keyword(description, skip_keywords)
+    )
+
+
 def test_get_transaction_filters_uses_defaults_and_allows_partial_override(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
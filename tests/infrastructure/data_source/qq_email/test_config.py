@@ -8,6 +8,8 @@ import yaml
 from financemailparser.infrastructure.config.config_manager import ConfigManager
 from financemailparser.infrastructure.config.secrets import (
     MASTER_PASSWORD_ENV,
+    SecretBox,
+    SecretDecryptionError,
     is_encrypted_value,
 )
 from financemailparser.infrastructure.data_source.qq_email.config import (
@@ -34,6 +36,37 @@ def test_save_and_load_config_strict_roundtrip(
     assert is_encrypted_value(saved["auth_code"]) is True
 
 
+def test_load_config_strict_decrypts_once_until_config_or_password_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(MASTER_PASSWORD_ENV, "pw-1")
+    mgr = QQEmailConfigManager(
+        config_manager=ConfigManager(config_path=tmp_path / "config.yaml")
+    )
+    mgr.save_config("a@qq.com", "auth-1")
+
+    calls = {"n": 0}
+    real_decrypt = SecretBox.decrypt
+
+    def counting_decrypt(value: str, *, aad: str | None = None) -> str:
+        calls["n"] += 1
+        return real_decrypt(value, aad=aad)
+
+    monkeypatch.setattr(SecretBox, "decrypt", counting_decrypt)
+
+    assert mgr.load_config_strict()["auth_code"] == "auth-1"
+    assert mgr.load_config_strict()["auth_code"] == "auth-1"
+    assert calls["n"] == 1
+
+    mgr.save_config("a@qq.com", "auth-2")
+    assert mgr.load_config_strict()["auth_code"] == "auth-2"
+    assert calls["n"] == 2
+
+    monkeypatch.setenv(MASTER_PASSWORD_ENV, "pw-other")
+    with pytest.raises(SecretDecryptionError):
+        mgr.load_config_strict()
+
+
 def test_config_present_vs_exists_semantics(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import imaplib
+from typing import Any
+
+import pytest
+
+import financemailparser.infrastructure.data_source.qq_email.session_pool as pool
+
+
+class _FakeConn:
+    def __init__(self, noop_status: str = "OK") -> None:
+        self.noop_status = noop_status
+        self.noop_error: Exception | None = None
+
+    def noop(self) -> tuple[str, list[Any]]:
+        if self.noop_error is not None:
+            raise self.noop_error
+        return self.noop_status, []
+
+
+class _FakeParser:
+    created: list["_FakeParser"] = []
+
+    def __init__(self, email: str, password: str) -> None:
+        self.email = email
+        self.password = password
+        self.conn: _FakeConn | None = None
+        self.closed = False
+        _FakeParser.created.append(self)
+
+    def login(self) -> bool:
+        self.conn = _FakeConn()
+        return True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def _fake_parser(monkeypatch: pytest.MonkeyPatch) -> None:
+    pool.close_pooled_sessions()
+    _FakeParser.created = []
+    monkeypatch.setattr(pool, "QQEmailParser", _FakeParser)
+
+
+def test_checkout_reuses_logged_in_session_per_credentials() -> None:
+    with pool.checkout_parser("a@qq.com", "pw") as first:
+        pass
+    with pool.checkout_parser("a@qq.com", "pw") as second:
+        pass
+    with pool.checkout_parser("a@qq.com", "other") as third:
+        pass
+
+    assert second is first
+    assert third is not first
+    assert len(_FakeParser.created) == 2
+
+
+def test_session_is_closed_and_not_reused_after_error() -> None:
+    with pytest.raises(RuntimeError):
+        with pool.checkout_parser("a@qq.com", "pw") as first:
+            raise RuntimeError("boom")
+
+    with pool.checkout_parser("a@qq.com", "pw") as second:
+        pass
+
+    assert _FakeParser.created[0].closed is True
+    assert second is not first
+
+
+@pytest.mark.parametrize("failure", ["bye", "abort"])
+def test_recently_returned_dead_session_is_replaced(failure: str) -> None:
+    with pool.checkout_parser("a@qq.com", "pw") as first:
+        pass
+    conn = _FakeParser.created[0].conn
+    assert conn is not None
+    # 刚归还就被服务端/网络断开：复用前的 NOOP 探活应发现并重新登录。
+    if failure == "bye":
+        conn.noop_status = "BYE"
+    else:
+        conn.noop_error = imaplib.IMAP4.abort("socket error: EOF")
+
+    with pool.checkout_parser("a@qq.com", "pw") as second:
+        pass
+
+    assert _FakeParser.created[0].closed is True
+    assert second is not first
+    assert second.conn is not None and second.conn.noop_status == "OK"
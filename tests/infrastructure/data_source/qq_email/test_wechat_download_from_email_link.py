@@ -3,8 +3,9 @@ from __future__ import annotations
 from email.message import EmailMessage
 from pathlib import Path
 
+import requests
+
 from financemailparser.infrastructure.data_source.qq_email.parser import QQEmailParser
-from financemailparser.infrastructure.data_source.qq_email import parser as parser_mod
 
 
 class _ResponseStub:
@@ -79,7 +80,7 @@ def test_download_wechat_bill_candidates_requires_zip_magic(
             )
         raise AssertionError(f"unexpected url: {url}")
 
-    monkeypatch.setattr(parser_mod.requests, "get", fake_get)
+    monkeypatch.setattr(requests, "get", fake_get)
 
     saved = parser.download_wechat_bill_candidates([bad_url, good_url], save_dir)
     assert saved is not None
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from financemailparser.infrastructure.repositories.file_scan import (
+    find_file_by_suffixes,
+    find_latest_file_by_suffixes,
+)
+
+
+def _touch(path: Path, mtime: float | None = None) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("x", encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_find_latest_file_by_suffixes_picks_newest_nested_match(
+    tmp_path: Path,
+) -> None:
+    _touch(tmp_path / "old.zip", mtime=1_000)
+    newest = _touch(tmp_path / "a" / "b" / "NEW.ZIP", mtime=3_000)
+    _touch(tmp_path / "a" / "mid.zip", mtime=2_000)
+    _touch(tmp_path / "a" / "b" / "newer.csv", mtime=4_000)
+
+    assert find_latest_file_by_suffixes(tmp_path, [".zip"]) == newest
+
+
+def test_find_latest_file_by_suffixes_handles_no_match(tmp_path: Path) -> None:
+    _touch(tmp_path / "a" / "bill.csv")
+
+    assert find_latest_file_by_suffixes(tmp_path, [".zip"]) is None
+    assert find_latest_file_by_suffixes(tmp_path, []) is None
+    assert find_latest_file_by_suffixes(tmp_path / "missing", [".zip"]) is None
+
+
+def test_find_file_by_suffixes_prefers_top_level_files(tmp_path: Path) -> None:
+    _touch(tmp_path / "sub" / "nested.csv")
+    top = _touch(tmp_path / "top.CSV")
+    (tmp_path / "dir.csv").mkdir()
+
+    assert find_file_by_suffixes(tmp_path, [".csv"]) == top
+    assert find_file_by_suffixes(tmp_path, [".xlsx"]) is None
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
+import pytest
+
+import financemailparser.infrastructure.repositories.local_bills as local_bills
 from financemailparser.infrastructure.repositories.local_bills import (
     read_bill_html_text,
     read_bill_metadata_json,
@@ -43,9 +47,25 @@ def test_scan_credit_card_bill_folders_includes_only_valid_folders(
     assert out == [valid]
 
 
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_read_bill_metadata_json_decodes_utf8_with_either_parser(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, use_orjson: bool
+) -> None:
+    if not use_orjson:
+        monkeypatch.setattr(local_bills, "_orjson", None)
+    meta = tmp_path / EMAIL_METADATA_FILENAME
+    _touch(meta, '{"subject":"招商银行信用卡电子账单","size":12}')
+
+    out = read_bill_metadata_json(metadata_path=meta)
+    assert out == {"subject": "招商银行信用卡电子账单", "size": 12}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
 def test_read_bill_metadata_json_warns_and_returns_none_on_invalid_json(
-    tmp_path: Path,
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, use_orjson: bool
 ) -> None:
+    if not use_orjson:
+        monkeypatch.setattr(local_bills, "_orjson", None)
     meta = tmp_path / EMAIL_METADATA_FILENAME
     _touch(meta, "{invalid-json")
 
@@ -56,6 +76,24 @@ def test_read_bill_metadata_json_warns_and_returns_none_on_invalid_json(
     assert str(meta) in warnings[0]
 
 
+def test_read_bill_metadata_json_reuses_parse_until_file_changes(
+    tmp_path: Path,
+) -> None:
+    meta = tmp_path / EMAIL_METADATA_FILENAME
+    _touch(meta, '{"subject":"a"}')
+    os.utime(meta, ns=(1_000_000_000, 1_000_000_000))
+
+    first = read_bill_metadata_json(metadata_path=meta)
+    assert first == {"subject": "a"}
+    assert first is not None
+    first["subject"] = "mutated by caller"
+    assert read_bill_metadata_json(metadata_path=meta) == {"subject": "a"}
+
+    _touch(meta, '{"subject":"b"}')
+    os.utime(meta, ns=(2_000_000_000, 2_000_000_000))
+    assert read_bill_metadata_json(metadata_path=meta) == {"subject": "b"}
+
+
 def test_read_bill_html_text_warns_and_returns_none_on_missing_file(
     tmp_path: Path,
 ) -> None:
@@ -59,6 +59,9 @@ existing_base_url = snap.base_url_default or ""
 existing_timeout = int(snap.timeout_default)
 existing_max_retries = int(snap.max_retries_default)
 existing_retry_interval = int(snap.retry_interval_default)
+existing_rpm = int(snap.rpm_default)
+existing_tpm = int(snap.tpm_default)
+existing_max_output_tokens = int(snap.max_output_tokens_default)
 
 with st.form("ai_config_form"):
     # 提供商选择
@@ -129,6 +132,29 @@ with st.form("ai_config_form"):
                 ),
             )
 
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            rpm = st.number_input(
+                "每分钟请求数上限（RPM）",
+                min_value=0,
+                value=existing_rpm,
+                help="发请求前在本地主动限流，避免触发服务端速率限制。0 表示不限制。",
+            )
+        with col2:
+            tpm = st.number_input(
+                "每分钟 Token 数上限（TPM）",
+                min_value=0,
+                value=existing_tpm,
+                help="按估算的输入 token 数在本地限流。0 表示不限制。",
+            )
+        with col3:
+            max_output_tokens = st.number_input(
+                "最大输出 Token 数",
+                min_value=0,
+                value=existing_max_output_tokens,
+                help="单次回复的 token 上限。0 表示不限制，由服务端按模型默认决定。",
+            )
+
     # 操作按钮（三列布局）
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -154,6 +180,9 @@ if save_button:
             timeout=int(timeout),
             max_retries=int(max_retries),
             retry_interval=int(retry_interval),
+            rpm=int(rpm),
+            tpm=int(tpm),
+            max_output_tokens=int(max_output_tokens),
         )
         if result.ok:
             st.success("✅ 配置保存成功！")